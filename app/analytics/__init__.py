@@ -0,0 +1,5 @@
+from app.analytics.views import router_v0
+
+__all__ = [
+    "router_v0",
+]
@@ -0,0 +1,7 @@
+from app.analytics.adapters.sql import AnalyticsSqlAdapter
+from app.analytics.adapters.sql_async import AnalyticsAsyncSqlAdapter
+
+__all__ = [
+    "AnalyticsSqlAdapter",
+    "AnalyticsAsyncSqlAdapter",
+]
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.adapters.sql import AnalyticsSqlAdapter
+from app.analytics.domain.models import DailySales
+from app.analytics.domain.port import AsyncAnalyticsPort
+
+
+@dataclass
+class AnalyticsAsyncSqlAdapter(AsyncAnalyticsPort):
+    """
+    asyncio adapter for analytics that runs the AnalyticsSqlAdapter logic
+    through `AsyncSession.run_sync`
+    """
+
+    db: AsyncSession
+
+    async def fetch_daily_sales(
+        self,
+        start: date,
+        end: date,
+        product_variant_id: UUID | None = None,
+        user_id: UUID | None = None,
+    ) -> list[DailySales]:
+        return await self.db.run_sync(
+            lambda db: AnalyticsSqlAdapter(db).fetch_daily_sales(
+                start, end, product_variant_id=product_variant_id, user_id=user_id
+            )
+        )
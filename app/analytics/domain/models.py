@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+# the currency the sales rollups add up billed and paid amounts in; amounts
+# billed in other currencies are left out of them
+SALES_CURRENCY = "INR"
+
+
+def sales_day(timestamp: datetime) -> date:
+    """
+    Returns the (utc) day an order placed at `timestamp` is rolled up into.
+    """
+    # naive timestamps are utc, as sqlite returns them
+    if timestamp.tzinfo is None:
+        return timestamp.date()
+    return timestamp.astimezone(timezone.utc).date()
+
+
+class DailySales(BaseModel):
+    """
+    Rolled up sales of one day: the orders placed that day, including the
+    ones cancelled since, with their bills and payments
+    """
+
+    day: date
+    order_count: int = 0
+    units: int = 0
+    # in SALES_CURRENCY; None for product variants, bills are issued per order
+    billed_amount: float | None = None
+    paid_amount: float | None = None
+
+
+class SalesQuery(BaseModel):
+    """
+    Period and subject of a sales report. Without a product variant or a
+    customer the report covers all sales.
+    """
+
+    start: date
+    end: date
+    product_variant_id: UUID | None = None
+    user_id: UUID | None = None
+    # days in the trailing moving averages
+    window: int = Field(default=7, ge=1, le=90)
+
+    @model_validator(mode="after")
+    def check_period(self) -> SalesQuery:
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        if (self.end - self.start).days >= 366:
+            raise ValueError("the period must not exceed 366 days")
+        if self.product_variant_id is not None and self.user_id is not None:
+            raise ValueError("filter by a product variant or a customer, not both")
+        return self
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    @property
+    def previous_start(self) -> date:
+        """
+        First day of the period of the same length just before this one
+        """
+        return self.start - timedelta(days=self.days)
+
+
+class SalesDay(DailySales):
+    """
+    Sales of one day of a report with their trailing moving averages
+    """
+
+    units_moving_average: float
+    billed_amount_moving_average: float | None = None
+
+
+class SalesTotals(BaseModel):
+    order_count: int = 0
+    units: int = 0
+    billed_amount: float | None = None
+    paid_amount: float | None = None
+
+
+class SalesChange(BaseModel):
+    """
+    Relative change from the previous period, None when it had no sales
+    """
+
+    order_count: float | None = None
+    units: float | None = None
+    billed_amount: float | None = None
+    paid_amount: float | None = None
+
+
+class SalesReport(BaseModel):
+    """
+    Daily sales of a period, its totals and how they compare to the previous
+    period of the same length.
+
+    Sales are the orders placed, not the ones fulfilled: orders cancelled
+    after they were placed still count.
+    """
+
+    start: date
+    end: date
+    window: int
+    days: list[SalesDay]
+    totals: SalesTotals
+    previous_totals: SalesTotals
+    change: SalesChange
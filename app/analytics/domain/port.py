@@ -0,0 +1,51 @@
+from datetime import date
+from typing import Protocol
+from uuid import UUID
+
+from app.analytics.domain.models import DailySales
+
+
+class AnalyticsPort(Protocol):
+    """
+    Port that reads the daily sales rollups
+    """
+
+    def fetch_daily_sales(
+        self,
+        start: date,
+        end: date,
+        product_variant_id: UUID | None = None,
+        user_id: UUID | None = None,
+    ) -> list[DailySales]:
+        """
+        Fetches the rolled up sales of the days between start and end.
+
+        Args:
+            start (date): The first day, inclusive.
+            end (date): The last day, inclusive.
+            product_variant_id (UUID | None): Only the sales of this variant.
+            user_id (UUID | None): Only the sales to this customer.
+
+        Returns:
+            list[DailySales]: The days with sales, in ascending order. Days
+            without sales are left out.
+        """
+        ...
+
+
+class AsyncAnalyticsPort(Protocol):
+    """
+    asyncio counterpart of the AnalyticsPort
+    """
+
+    async def fetch_daily_sales(
+        self,
+        start: date,
+        end: date,
+        product_variant_id: UUID | None = None,
+        user_id: UUID | None = None,
+    ) -> list[DailySales]:
+        """
+        Fetches the rolled up sales of the days between start and end.
+        """
+        ...
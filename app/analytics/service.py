@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.analytics.domain.models import (
+    DailySales,
+    SalesChange,
+    SalesDay,
+    SalesQuery,
+    SalesReport,
+    SalesTotals,
+)
+from app.analytics.domain.port import AnalyticsPort, AsyncAnalyticsPort
+
+METRICS = ("order_count", "units", "billed_amount", "paid_amount")
+
+
+def first_day_needed(query: SalesQuery) -> date:
+    """
+    Returns the first day a report reads: the moving averages of the first
+    days and the comparison with the previous period reach back before start.
+    """
+    return min(query.previous_start, query.start - timedelta(days=query.window - 1))
+
+
+def build_sales_report(query: SalesQuery, sales: list[DailySales]) -> SalesReport:
+    """
+    Builds a sales report from the rolled up days, from `first_day_needed`
+    up to the end of the query.
+
+    The days are laid out in a dense (metric x day) array, with zeros for
+    days without sales, so the moving averages and period totals are
+    computed with vectorized operations rather than per-day loops.
+
+    Args:
+        query (SalesQuery): The period and subject of the report.
+        sales (list[DailySales]): The days with sales.
+
+    Returns:
+        SalesReport: The report of the query's period.
+    """
+    first = first_day_needed(query)
+    length = (query.end - first).days + 1
+    start = (query.start - first).days
+    previous_start = (query.previous_start - first).days
+    # product variants have no amounts, bills are issued per order
+    has_amounts = query.product_variant_id is None
+
+    series = np.zeros((len(METRICS), length))
+    if sales:
+        offsets = np.array([(day.day - first).days for day in sales])
+        series[:, offsets] = np.array(
+            [[getattr(day, metric) or 0 for metric in METRICS] for day in sales]
+        ).T
+
+    # trailing moving averages, the value of day i averages days i-window+1..i
+    kernel = np.ones(query.window) / query.window
+    averages = np.array(
+        [np.convolve(row, kernel, mode="valid") for row in series[1:3]]
+    )[:, start - query.window + 1 :]
+
+    totals = series[:, start:].sum(axis=1)
+    previous = series[:, previous_start:start].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.where(previous != 0, (totals - previous) / previous, np.nan)
+
+    def as_totals(values: np.ndarray) -> SalesTotals:
+        return SalesTotals(
+            order_count=int(values[0]),
+            units=int(values[1]),
+            billed_amount=float(values[2]) if has_amounts else None,
+            paid_amount=float(values[3]) if has_amounts else None,
+        )
+
+    days = [
+        SalesDay(
+            day=query.start + timedelta(days=i),
+            order_count=int(order_count),
+            units=int(units),
+            billed_amount=billed_amount if has_amounts else None,
+            paid_amount=paid_amount if has_amounts else None,
+            units_moving_average=units_average,
+            billed_amount_moving_average=billed_average if has_amounts else None,
+        )
+        for i, (
+            order_count,
+            units,
+            billed_amount,
+            paid_amount,
+            units_average,
+            billed_average,
+        ) in enumerate(zip(*series[:, start:].tolist(), *averages.tolist()))
+    ]
+
+    return SalesReport(
+        start=query.start,
+        end=query.end,
+        window=query.window,
+        days=days,
+        totals=as_totals(totals),
+        previous_totals=as_totals(previous),
+        change=SalesChange(
+            **{
+                metric: None if np.isnan(value) else float(value)
+                for metric, value in zip(METRICS, change)
+                if has_amounts or metric in ("order_count", "units")
+            }
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class AnalyticsService:
+    """
+    Service layer for sales reports
+    """
+
+    port: AnalyticsPort
+
+    @classmethod
+    def instance(cls, port: AnalyticsPort) -> "AnalyticsService":
+        return cls(port=port)
+
+    def get_sales_report(self, query: SalesQuery) -> SalesReport:
+        """
+        Reports the daily sales of a period from the rollup tables.
+        """
+        sales = self.port.fetch_daily_sales(
+            first_day_needed(query),
+            query.end,
+            product_variant_id=query.product_variant_id,
+            user_id=query.user_id,
+        )
+        return build_sales_report(query, sales)
+
+
+@dataclass(frozen=True)
+class AsyncAnalyticsService:
+    """
+    asyncio service layer for sales reports
+    """
+
+    port: AsyncAnalyticsPort
+
+    @classmethod
+    def instance(cls, port: AsyncAnalyticsPort) -> "AsyncAnalyticsService":
+        return cls(port=port)
+
+    async def get_sales_report(self, query: SalesQuery) -> SalesReport:
+        """
+        Reports the daily sales of a period from the rollup tables.
+        """
+        sales = await self.port.fetch_daily_sales(
+            first_day_needed(query),
+            query.end,
+            product_variant_id=query.product_variant_id,
+            user_id=query.user_id,
+        )
+        return build_sales_report(query, sales)
@@ -0,0 +1,59 @@
+from typing import Annotated, AsyncIterator, Iterator, cast
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.analytics.adapters import AnalyticsAsyncSqlAdapter, AnalyticsSqlAdapter
+from app.analytics.domain.models import SalesQuery, SalesReport
+from app.analytics.service import AnalyticsService, AsyncAnalyticsService
+from app.config import config
+from app.core.service import ThreadedService
+from app.db import get_async_read_db, get_read_db
+
+router_v0 = APIRouter(prefix="/v0")
+
+
+def get_sync_analytics_read_service(
+    db: Session = Depends(get_read_db),
+) -> Iterator[AsyncAnalyticsService]:
+    """
+    Gets an instance of the AnalyticsService for read-only operations, bound
+    to a read replica session when replicas are configured, whose methods
+    run in the threadpool
+    """
+    service = AnalyticsService.instance(AnalyticsSqlAdapter(db))
+    yield cast(AsyncAnalyticsService, ThreadedService(service))
+
+
+async def get_async_analytics_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncIterator[AsyncAnalyticsService]:
+    """
+    Gets an instance of the AsyncAnalyticsService for read-only operations
+    """
+    yield AsyncAnalyticsService.instance(AnalyticsAsyncSqlAdapter(db))
+
+
+# the routes only see the asyncio interface; with DB_ASYNC disabled it is the
+# blocking service run in the threadpool
+if config.DB_ASYNC:
+    get_analytics_read_service = get_async_analytics_read_service
+else:
+    get_analytics_read_service = get_sync_analytics_read_service
+
+
+@router_v0.get("/analytics/sales")
+async def get_sales_report(
+    query: Annotated[SalesQuery, Query()],
+    service: AsyncAnalyticsService = Depends(get_analytics_read_service),
+) -> SalesReport:
+    """
+    Reports the daily sales of a period, overall or of one product variant or
+    customer, with moving averages and a comparison to the previous period.
+
+    The report counts the orders placed in the period, including the ones
+    cancelled since. Amounts only add up the bills issued in SALES_CURRENCY
+    and their payments.
+    """
+    return await service.get_sales_report(query)
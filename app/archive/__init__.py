@@ -0,0 +1,6 @@
+from app.archive.segments import CorruptSegmentError, SegmentStore
+
+__all__ = [
+    "CorruptSegmentError",
+    "SegmentStore",
+]
@@ -0,0 +1,218 @@
+import fcntl
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Iterator
+from uuid import UUID
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+LOCK_SUFFIX = ".lock"
+
+# index entries: record key, offset and length in the segment, crc32 of the
+# compressed record
+INDEX_ENTRY = struct.Struct(">16sQII")
+
+
+class CorruptSegmentError(ValueError):
+    """
+    Raised when a record read from a segment does not match its index entry.
+    """
+
+
+class SegmentStore:
+    """
+    Append-only store of compressed records in segment files on local disk.
+
+    Every `write_segment` call creates a new, immutable segment: a file of
+    zlib compressed records and an index file of fixed-size entries sorted
+    by key, so a record is found with a binary search over each index and
+    read with a single seek. The index is written last and atomically
+    renamed into place, so a segment only becomes visible once complete.
+    Indexes are cached in memory; segments written by other processes are
+    picked up on the next lookup that misses the known ones.
+    """
+
+    def __init__(self, directory: str | os.PathLike, prefix: str = "segment") -> None:
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self._indexes: dict[int, bytes] = {}
+        self._lock = Lock()
+
+    def write_segment(self, records: list[tuple[UUID, bytes]]) -> Path:
+        """
+        Writes records to a new segment.
+
+        Args:
+            records (list[tuple[UUID, bytes]]): The key and content of each
+                record. Keys must be unique within the segment.
+
+        Returns:
+            Path: The path of the new segment file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            # numbered after every segment file, including incomplete ones
+            number = max(self._segment_numbers(SEGMENT_SUFFIX), default=0) + 1
+            segment = self._path(number, SEGMENT_SUFFIX)
+
+            entries: list[bytes] = []
+            offset = 0
+            with open(segment, "xb") as file:
+                for key, content in records:
+                    compressed = zlib.compress(content)
+                    file.write(compressed)
+                    entries.append(
+                        INDEX_ENTRY.pack(
+                            key.bytes, offset, len(compressed), zlib.crc32(compressed)
+                        )
+                    )
+                    offset += len(compressed)
+                file.flush()
+                os.fsync(file.fileno())
+
+            index = b"".join(sorted(entries))
+            partial = self._path(number, INDEX_SUFFIX + ".tmp")
+            with open(partial, "wb") as file:
+                file.write(index)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(partial, self._path(number, INDEX_SUFFIX))
+
+            self._indexes[number] = index
+
+        logger.info(f"Wrote {len(records)} records to {segment}")
+
+        return segment
+
+    @contextmanager
+    def exclusive(self) -> Iterator[bool]:
+        """
+        Holds the lock file of the store for the duration of the block, so one
+        writer at a time fills it, across processes.
+
+        Yields:
+            bool: True if the lock is held, False without waiting if another
+            writer holds it.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with open(self.directory / f"{self.prefix}{LOCK_SUFFIX}", "ab") as file:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def is_empty(self) -> bool:
+        """
+        Whether no complete segment was written yet, by any process.
+        """
+        return not self._segment_numbers()
+
+    def read(self, key: UUID) -> bytes | None:
+        """
+        Reads a record, searching the newest segments first.
+
+        Args:
+            key (UUID): The key of the record.
+
+        Returns:
+            bytes | None: The record content, or None if no segment has it.
+
+        Raises:
+            CorruptSegmentError: If the stored record fails its checksum.
+        """
+        found = self._find(key, self._known_indexes())
+
+        if found is None:
+            # look for segments written since the indexes were loaded
+            found = self._find(key, self._load_new_indexes())
+
+        if found is None:
+            return None
+
+        number, offset, length, checksum = found
+
+        with open(self._path(number, SEGMENT_SUFFIX), "rb") as file:
+            file.seek(offset)
+            compressed = file.read(length)
+
+        if len(compressed) != length or zlib.crc32(compressed) != checksum:
+            raise CorruptSegmentError(
+                f"Record '{key}' in segment {number} does not match its index"
+            )
+
+        return zlib.decompress(compressed)
+
+    def _find(
+        self, key: UUID, indexes: list[tuple[int, bytes]]
+    ) -> tuple[int, int, int, int] | None:
+        target = key.bytes
+        size = INDEX_ENTRY.size
+
+        for number, index in sorted(indexes, reverse=True):
+            low, high = 0, len(index) // size
+            while low < high:
+                middle = (low + high) // 2
+                if index[middle * size : middle * size + 16] < target:
+                    low = middle + 1
+                else:
+                    high = middle
+
+            if low * size < len(index):
+                entry_key, offset, length, checksum = INDEX_ENTRY.unpack_from(
+                    index, low * size
+                )
+                if entry_key == target:
+                    return number, offset, length, checksum
+
+        return None
+
+    def _known_indexes(self) -> list[tuple[int, bytes]]:
+        with self._lock:
+            return list(self._indexes.items())
+
+    def _load_new_indexes(self) -> list[tuple[int, bytes]]:
+        loaded: list[tuple[int, bytes]] = []
+
+        with self._lock:
+            for number in self._segment_numbers():
+                if number not in self._indexes:
+                    index = self._path(number, INDEX_SUFFIX).read_bytes()
+                    self._indexes[number] = index
+                    loaded.append((number, index))
+
+        return loaded
+
+    def _segment_numbers(self, suffix: str = INDEX_SUFFIX) -> list[int]:
+        """
+        Returns the numbers of the segment files with a suffix. By default
+        the complete segments, the ones with an index.
+        """
+        if not self.directory.is_dir():
+            return []
+
+        numbers = []
+        for path in self.directory.glob(f"{self.prefix}-*{suffix}"):
+            number = path.name[len(self.prefix) + 1 : -len(suffix)]
+            if number.isdigit():
+                numbers.append(int(number))
+
+        return numbers
+
+    def _path(self, number: int, suffix: str) -> Path:
+        return self.directory / f"{self.prefix}-{number:08d}{suffix}"
@@ -1,5 +1,7 @@
 from app.bill.adapters.sql import BillSqlAdapter
+from app.bill.adapters.sql_async import BillAsyncSqlAdapter
 
 __all__ = [
     "BillSqlAdapter",
+    "BillAsyncSqlAdapter",
 ]
@@ -1,10 +1,14 @@
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 from uuid import UUID as py_UUID
 
 from sqlalchemy import Boolean, Float, ForeignKey, String, select
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
+from app.analytics.adapters.sql import SalesDeltas
+from app.analytics.domain.models import sales_day
 from app.bill.domain.models import BillCreate, BillPublic
+from app.core.exceptions import EntityNotFoundError
 from app.db import BaseSchema
 
 if TYPE_CHECKING:
@@ -54,19 +58,49 @@ class BillSqlAdapter(BillPort):
         return self.db.scalar(stmt)
 
     def create_bill(self, request: BillCreate) -> BillPublic:
+        """
+        Creates the bill of an order and adds its amount to the sales rollups,
+        in one transaction.
+
+        Raises:
+            EntityNotFoundError: If the order does not exist.
+        """
+        # imported here, the order schema refers to bills
+        from app.order.adapters.sql import Order, touch_order
+
         new_bill = BillPublic(**request.model_dump())
 
-        db_bill = Bill(
-            id=new_bill.id,
-            created=new_bill.created,
-            modified=new_bill.modified,
-            amount=new_bill.amount,
-            currency=new_bill.currency,
-            image_url=new_bill.image_url or None,
-            paid=new_bill.paid,
-            order_id=new_bill.order_id,
-        )
-
-        self.db.add(db_bill)
+        with self.db.begin():
+            order = self.db.execute(
+                select(Order.created, Order.user_id).where(
+                    Order.id == new_bill.order_id
+                )
+            ).one_or_none()
+
+            if order is None:
+                raise EntityNotFoundError.from_id("Order", new_bill.order_id)
+
+            db_bill = Bill(
+                id=new_bill.id,
+                created=new_bill.created,
+                modified=new_bill.modified,
+                amount=new_bill.amount,
+                currency=new_bill.currency,
+                image_url=str(new_bill.image_url) if new_bill.image_url else None,
+                paid=new_bill.paid,
+                order_id=new_bill.order_id,
+            )
+
+            self.db.add(db_bill)
+            touch_order(self.db, new_bill.order_id, datetime.now(timezone.utc))
+
+            sales = SalesDeltas()
+            sales.add_amounts(
+                order.user_id,
+                sales_day(order.created),
+                new_bill.currency,
+                billed_amount=new_bill.amount,
+            )
+            sales.apply(self.db)
 
         return new_bill
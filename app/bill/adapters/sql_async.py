@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from uuid import UUID as py_UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.bill.adapters.sql import BillSqlAdapter
+from app.bill.domain.models import BillCreate, BillPublic
+from app.bill.domain.port import AsyncBillPort
+
+
+@dataclass
+class BillAsyncSqlAdapter(AsyncBillPort):
+    """
+    asyncio adapter for bills that runs the BillSqlAdapter logic
+    through `AsyncSession.run_sync`
+    """
+
+    db: AsyncSession
+
+    async def fetch_for_order(self, order_id: py_UUID) -> BillPublic | None:
+        def fetch(db: Session) -> BillPublic | None:
+            bill = BillSqlAdapter(db).fetch_for_order(order_id=order_id)
+            return BillPublic.model_validate(bill) if bill else None
+
+        return await self.db.run_sync(fetch)
+
+    async def create_bill(self, request: BillCreate) -> BillPublic:
+        return await self.db.run_sync(
+            lambda db: BillSqlAdapter(db).create_bill(request)
+        )
@@ -16,3 +16,17 @@ class BillPort(Protocol):
         Create a new bill for an order
         """
         ...
+
+
+class AsyncBillPort(Protocol):
+    async def fetch_for_order(self, order_id: UUID) -> BillPublic | None:
+        """
+        Fetch a bill for a given order
+        """
+        ...
+
+    async def create_bill(self, request: BillCreate) -> BillPublic:
+        """
+        Create a new bill for an order
+        """
+        ...
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 from app.bill.domain.models import BillCreate, BillPublic
-from app.bill.domain.port import BillPort
+from app.bill.domain.port import AsyncBillPort, BillPort
 from app.core.logging import get_logger
 from app.core.service import BaseService
 
@@ -22,3 +22,19 @@ class BillService(BaseService):
 
     def issue_bill(self, request: BillCreate) -> BillPublic:
         return self.port.create_bill(request)
+
+
+@dataclass
+class AsyncBillService:
+    """
+    asyncio service meant for bill management
+    """
+
+    port: AsyncBillPort
+
+    @classmethod
+    def instance(cls, port: AsyncBillPort) -> "AsyncBillService":
+        return cls(port=port)
+
+    async def issue_bill(self, request: BillCreate) -> BillPublic:
+        return await self.port.create_bill(request)
@@ -1,30 +1,68 @@
-from typing import Iterator
+from typing import AsyncIterator, Iterator, cast
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.bill.adapters import BillSqlAdapter
+from app.bill.adapters import BillAsyncSqlAdapter, BillSqlAdapter
 from app.bill.domain.models import BillCreate, BillPublic
-from app.bill.service import BillService
-from app.db import get_db
+from app.bill.service import AsyncBillService, BillService
+from app.config import config
+from app.core.exceptions import EntityNotFoundError
+from app.core.service import ThreadedService
+from app.db import get_async_db, get_db
 
 router_v0 = APIRouter(prefix="/v0")
 
 
-def get_bill_service(db: Session = Depends(get_db)) -> Iterator[BillService]:
+def get_sync_bill_service(
+    db: Session = Depends(get_db),
+) -> Iterator[AsyncBillService]:
     """
-    Returns a BillService instance using the provided database session.
+    Returns a BillService instance using the provided database session,
+    whose methods run in the threadpool.
 
     The BillService instance is used to encapsulate database operations
     related to bills.
     """
-    yield BillService.instance(port=BillSqlAdapter(db))
+    service = BillService.instance(port=BillSqlAdapter(db))
+    yield cast(AsyncBillService, ThreadedService(service))
 
 
-@router_v0.post("/bills/")
-def issue_bill(
+async def get_async_bill_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncIterator[AsyncBillService]:
+    """
+    Returns an AsyncBillService instance using an asyncio database session.
+    """
+    yield AsyncBillService.instance(port=BillAsyncSqlAdapter(db))
+
+
+# the routes only see the asyncio interface; with DB_ASYNC disabled it is the
+# blocking service run in the threadpool
+if config.DB_ASYNC:
+    get_bill_service = get_async_bill_service
+else:
+    get_bill_service = get_sync_bill_service
+
+
+@router_v0.post(
+    "/bills/",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Order not found",
+        },
+    },
+)
+async def issue_bill(
     request: BillCreate,
-    service: BillService = Depends(get_bill_service),
+    service: AsyncBillService = Depends(get_bill_service),
 ) -> BillPublic:
-    return service.issue_bill(request=request)
+    try:
+        return await service.issue_bill(request=request)
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
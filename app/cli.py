@@ -1,3 +1,5 @@
+import argparse
+
 import uvicorn
 
 from app.config import Environments, config
@@ -6,7 +8,10 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 
-def main():
+def serve(_args: argparse.Namespace) -> None:
+    """
+    Runs the API server
+    """
     host = config.HOST
     port = config.PORT
     reload = config.ENVIRONMENT == Environments.DEV
@@ -23,3 +28,111 @@ def main():
         port=port,
         reload=bool(reload),
     )
+
+
+def schema(args: argparse.Namespace) -> None:
+    """
+    Applies the database schema, or reports whether it is up to date
+    """
+    # the db schemas need to be registered
+    import app.db.registry as _registry  # noqa: F401
+    from app.db import Base, engine
+    from app.db.schema import ensure_schema, schema_fingerprint, stored_fingerprint
+
+    if args.action == "status":
+        expected = schema_fingerprint(Base.metadata, engine.dialect)
+        with engine.connect() as connection:
+            stored = stored_fingerprint(connection)
+
+        logger.info(f"expected schema fingerprint: {expected}")
+        logger.info(f"stored schema fingerprint:   {stored}")
+
+        if stored != expected:
+            exit(1)
+        return
+
+    if ensure_schema(engine, Base.metadata, force=args.force):
+        logger.info("Database schema applied")
+
+
+def rollups(args: argparse.Namespace) -> None:
+    """
+    Recomputes the sales rollups from the orders, bills and payments
+    """
+    # the db schemas need to be registered
+    import app.db.registry as _registry  # noqa: F401
+    from app.analytics.adapters.sql import rebuild_sales_rollups
+    from app.db import SessionLocal
+    from app.order.archive import order_archive
+
+    if order_archive is not None and not order_archive.is_empty() and not args.force:
+        # the rebuild only sees the orders left in the database
+        logger.error(
+            "The order archive is not empty: rebuilding would drop the sales of "
+            "archived orders from the rollups. Pass --force to rebuild anyway"
+        )
+        exit(1)
+
+    with SessionLocal() as db:
+        rebuild_sales_rollups(db)
+
+    logger.info("Sales rollups rebuilt")
+
+
+def archive(_args: argparse.Namespace) -> None:
+    """
+    Moves old closed orders to the archive
+    """
+    # the db schemas need to be registered
+    import app.db.registry as _registry  # noqa: F401
+    from app.order.archive import archive_old_orders, order_archive
+
+    if order_archive is None:
+        logger.error("ORDER_ARCHIVE_DIR is not configured")
+        exit(1)
+
+    archived = archive_old_orders()
+    logger.info(f"Archived {archived} orders to {order_archive.directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="dev", description=config.APP_NAME)
+    parser.set_defaults(handler=serve)
+    commands = parser.add_subparsers(title="commands")
+
+    commands.add_parser("serve", help="run the API server (default)").set_defaults(
+        handler=serve
+    )
+
+    schema_parser = commands.add_parser(
+        "schema", help="manage the database schema ahead of deploys"
+    )
+    schema_parser.add_argument(
+        "action",
+        choices=["apply", "status"],
+        help="apply the schema if it changed, or check if it is up to date",
+    )
+    schema_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="apply the schema even if the stored fingerprint matches",
+    )
+    schema_parser.set_defaults(handler=schema)
+
+    rollups_parser = commands.add_parser(
+        "rollups", help="rebuild the sales rollups, e.g. after importing data"
+    )
+    rollups_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild even if orders were archived, dropping their sales",
+    )
+    rollups_parser.set_defaults(handler=rollups)
+
+    commands.add_parser(
+        "archive",
+        help="move closed orders older than ORDER_ARCHIVE_AFTER_DAYS to the archive",
+    ).set_defaults(handler=archive)
+
+    args = parser.parse_args()
+    args.handler(args)
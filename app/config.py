@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -22,5 +23,78 @@ class AppConfig(BaseSettings):
     DB_URL: str | None = None
     DB_PASSWORD: str | None = None
 
+    # connection pool settings, see `sqlalchemy.create_engine` for details.
+    # sizing options are ignored by pools without a queue (e.g. in-memory sqlite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+
+    # apply the schema on startup when its fingerprint changed; turn this off
+    # when the schema is applied ahead of deploys with `dev schema apply`
+    DB_SCHEMA_SYNC_ON_STARTUP: bool = True
+
+    # read-only replicas of DB_URL that read endpoints are spread across
+    DB_READ_REPLICA_URLS: list[str] = []
+    # reads stay on the primary for this long after a client commits a write
+    DB_READ_YOUR_WRITES_SECONDS: float = 2.0
+
+    # sqlite tuning profile applied to every new sqlite connection
+    SQLITE_TUNING: bool = True
+    SQLITE_JOURNAL_MODE: Literal["DELETE", "TRUNCATE", "PERSIST", "WAL"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # negative values are in KiB, positive values in pages
+    SQLITE_CACHE_SIZE: int = -64 * 1024
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_FOREIGN_KEYS: bool = True
+    # seconds between `PRAGMA optimize` + WAL checkpoint runs, 0 disables them
+    SQLITE_MAINTENANCE_INTERVAL: float = 3600
+
+    # report statement shapes repeated more than DB_QUERY_REPEAT_THRESHOLD times
+    # within one request (likely N+1 queries) as warnings, or raise an error
+    DB_QUERY_STRICT_MODE: Literal["off", "warn", "raise"] = "off"
+    DB_QUERY_REPEAT_THRESHOLD: int = 10
+
+    # keep the last DB_SLOW_QUERY_LOG_SIZE statements slower than DB_SLOW_QUERY_MS
+    # (None disables the log), optionally with their EXPLAIN plans
+    DB_SLOW_QUERY_MS: float | None = 250.0
+    DB_SLOW_QUERY_LOG_SIZE: int = 200
+    DB_SLOW_QUERY_EXPLAIN: bool = True
+
+    # number of NDJSON lines written per transaction by POST /v0/orders:bulk
+    ORDER_BULK_BATCH_SIZE: int = 500
+    # number of rows fetched per round trip while streaming GET /v0/orders:export
+    ORDER_EXPORT_BATCH_SIZE: int = 1000
+
+    # responses of creation requests sent with an Idempotency-Key are replayed
+    # to retries for IDEMPOTENCY_TTL_SECONDS, and expired keys swept periodically
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 3600
+    IDEMPOTENCY_CACHE_SIZE: int = 1024
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_SWEEP_INTERVAL: float = 600
+
+    # closed orders created more than ORDER_ARCHIVE_AFTER_DAYS ago are moved to
+    # compressed segment files in ORDER_ARCHIVE_DIR (None disables archival),
+    # ORDER_ARCHIVE_BATCH_SIZE orders per segment, every ORDER_ARCHIVE_INTERVAL
+    # seconds (0 only archives through `dev archive`)
+    ORDER_ARCHIVE_DIR: str | None = None
+    ORDER_ARCHIVE_AFTER_DAYS: int = 365
+    ORDER_ARCHIVE_BATCH_SIZE: int = 1000
+    ORDER_ARCHIVE_INTERVAL: float = 24 * 3600
+
+    # products and variants are served from an in-memory snapshot of the
+    # catalog, dropped by writes in this process and reloaded at least every
+    # PRODUCT_CATALOG_TTL_SECONDS to pick up writes made by other workers
+    PRODUCT_CATALOG_TTL_SECONDS: float = 300
+
+    # serve the routers from the asyncio services backed by AsyncSession instead
+    # of running the blocking ones in the threadpool
+    DB_ASYNC: bool = False
+    # defaults to DB_URL with its driver swapped for an asyncio one
+    DB_ASYNC_URL: str | None = None
+
 
 config = AppConfig()
@@ -0,0 +1,36 @@
+def _quality(parameters: list[str]) -> float:
+    for parameter in parameters:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_encoding(header: str | None, coding: str) -> bool:
+    """
+    Evaluates an Accept-Encoding header for a content coding.
+
+    Args:
+        header (str | None): The header value, e.g. `gzip, br;q=0.8` or `*;q=0`.
+        coding (str): The content coding, e.g. `gzip`.
+
+    Returns:
+        bool: True if the coding is listed, or matched by `*`, with a
+        non-zero quality.
+    """
+    if not header:
+        return False
+
+    wildcard: float | None = None
+    for element in header.split(","):
+        name, *parameters = element.split(";")
+        name = name.strip().lower()
+        if name == coding:
+            return _quality(parameters) > 0
+        if name == "*":
+            wildcard = _quality(parameters)
+
+    return wildcard is not None and wildcard > 0
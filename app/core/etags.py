@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Literal
+
+
+def format_etag(version: int | str) -> str:
+    """
+    Formats a resource version as a strong ETag, e.g. `"3"`.
+    """
+    return f'"{version}"'
+
+
+def parse_etags(header: str) -> list[str] | Literal["*"]:
+    """
+    Parses an If-Match or If-None-Match header.
+
+    Args:
+        header (str): The header value, e.g. `"3", W/"4"` or `*`.
+
+    Returns:
+        list[str] | Literal["*"]: The entity tags as written, including their
+        quotes and any `W/` prefix, or "*" for the wildcard.
+    """
+    if header.strip() == "*":
+        return "*"
+
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def parse_version_etags(header: str | None) -> list[int] | None:
+    """
+    Parses an If-Match header whose tags are integer resource versions.
+
+    If-Match uses the strong comparison, so weak tags never match.
+
+    Returns:
+        list[int] | None: The versions the client expects, or None when any
+        version is acceptable (no header or `*`). Tags that are not strong
+        version tags are dropped, so they can never match.
+    """
+    if header is None:
+        return None
+
+    tags = parse_etags(header)
+    if tags == "*":
+        return None
+
+    return [
+        int(tag[1:-1])
+        for tag in tags
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit()
+    ]
+
+
+def format_http_date(value: datetime) -> str:
+    """
+    Formats a timestamp as an HTTP date, e.g. `Wed, 21 Oct 2015 07:28:00 GMT`.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    """
+    Returns the ETag and Last-Modified headers of a representation.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_http_date(last_modified)
+    return headers
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: datetime | None,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+) -> bool:
+    """
+    Evaluates the preconditions of a conditional GET.
+
+    If-None-Match uses the weak comparison and, when sent, takes precedence
+    over If-Modified-Since, which is compared at the one second resolution
+    of HTTP dates.
+
+    Args:
+        etag (str): The current ETag of the representation.
+        last_modified (datetime | None): When the representation last changed.
+        if_none_match (str | None): The If-None-Match header of the request.
+        if_modified_since (str | None): The If-Modified-Since header of the request.
+
+    Returns:
+        bool: True if the client's copy is current and 304 should be returned.
+    """
+    if if_none_match is not None:
+        tags = parse_etags(if_none_match)
+        return tags == "*" or _opaque_tag(etag) in map(_opaque_tag, tags)
+
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        # invalid dates are ignored
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    return last_modified.replace(microsecond=0) <= since
@@ -1,4 +1,4 @@
-from typing import Self
+from typing import Iterable, Self
 from uuid import UUID
 
 
@@ -26,6 +26,23 @@ class EntityNotFoundError(Exception):
         """
         return cls(f"'{entity}' with id = '{id}' does not exist.")
 
+    @classmethod
+    def from_ids(cls, entity: str, ids: Iterable[UUID]) -> Self:
+        """
+        Creates an EntityNotFoundError with a message describing several
+        non-existent entities at once.
+
+        Args:
+            entity (str): The name of the entity.
+            ids (Iterable[UUID]): The ids of the entities that do not exist.
+
+        Returns:
+            EntityNotFoundError: An instance of EntityNotFoundError with a message
+            listing every non-existent entity id.
+        """
+        joined = ", ".join(f"'{id}'" for id in ids)
+        return cls(f"'{entity}' with ids = [{joined}] do not exist.")
+
 
 class ConflictError(Exception):
     """
@@ -34,3 +51,10 @@ class ConflictError(Exception):
     For example, if a user attempts to create a resource with an email that
     already exists, a ConflictError will be raised.
     """
+
+
+class VersionConflictError(ConflictError):
+    """
+    Raised when a conditional update expected a version of an entity that
+    is no longer current, because it was modified concurrently.
+    """
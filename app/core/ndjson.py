@@ -0,0 +1,70 @@
+from typing import AsyncIterator
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# longest line accepted in a streamed request body
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class LineTooLongError(ValueError):
+    """
+    Raised when a line of a streamed request body exceeds MAX_LINE_BYTES.
+    """
+
+
+async def iter_lines(
+    stream: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Splits a streamed request body into lines as its chunks arrive.
+
+    Args:
+        stream (AsyncIterator[bytes]): The body chunks, e.g. `request.stream()`.
+        max_line_bytes (int): The maximum length of a single line.
+
+    Yields:
+        bytes: Each line without its line terminator, including empty lines.
+
+    Raises:
+        LineTooLongError: If a line is longer than `max_line_bytes`.
+    """
+    buffer = b""
+
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            yield line.rstrip(b"\r")
+
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(f"Line exceeds {max_line_bytes} bytes")
+
+    if buffer:
+        yield buffer.rstrip(b"\r")
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streams newline delimited JSON while the request body is still being read.
+
+    Starlette's StreamingResponse listens for client disconnects by reading
+    from `receive` on servers older than ASGI spec 2.4, which would consume
+    the request body the content iterator is still reading. This response
+    only sends, leaving `receive` to the request.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import inspect
+from functools import partial
+from typing import Any, Generic, TypeVar
+
 from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+S = TypeVar("S")
 
 
 class BaseService:
@@ -12,3 +19,28 @@ class BaseService:
 
     def __init__(self, db: Session):
         self.db = db
+
+
+class ThreadedService(Generic[S]):
+    """
+    Gives a blocking service the interface of its asyncio counterpart, so one
+    set of `async` routes serves both.
+
+    Calling a method returns a coroutine that runs it in the threadpool, and
+    generator methods return an async iterator that advances the generator
+    in the threadpool.
+    """
+
+    def __init__(self, service: S) -> None:
+        self.service = service
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.service, name)
+
+        if inspect.isgeneratorfunction(attribute):
+            return lambda *args, **kwargs: iterate_in_threadpool(
+                attribute(*args, **kwargs)
+            )
+        if callable(attribute):
+            return partial(run_in_threadpool, attribute)
+        return attribute
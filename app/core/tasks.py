@@ -0,0 +1,36 @@
+import asyncio
+from typing import Callable
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def run_periodically(name: str, interval: float, job: Callable[[], None]) -> None:
+    """
+    Runs a blocking job every `interval` seconds until cancelled.
+
+    The job runs in a worker thread so it does not block the event loop, and
+    failures are logged without stopping the schedule.
+
+    Args:
+        name (str): The name of the job, used in log messages.
+        interval (float): The number of seconds to wait between runs.
+        job (Callable[[], None]): The job to run.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(job)
+        except Exception:
+            logger.exception(f"Periodic job '{name}' failed")
+
+
+async def cancel_tasks(tasks: list[asyncio.Task]) -> None:
+    """
+    Cancels background tasks and waits for them to finish.
+    """
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,5 +1,14 @@
 from .base import Base, BaseSchema
-from .session import SessionLocal, engine, get_db
+from .session import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    engine,
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+)
 
 __all__ = [
     "Base",
@@ -7,4 +16,9 @@ __all__ = [
     "engine",
     "SessionLocal",
     "get_db",
+    "get_read_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "get_async_read_db",
 ]
@@ -0,0 +1,94 @@
+from itertools import islice
+from typing import Any, Iterable, Iterator, TypeVar
+
+from sqlalchemy import Table, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# stays below the bound parameter limit of every supported database
+# (32766 for sqlite, 65535 for postgres)
+MAX_PARAMETERS_PER_STATEMENT = 30_000
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Splits an iterable into lists of at most `size` elements.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def bulk_insert(db: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    """
+    Inserts rows with multi-row `INSERT ... VALUES` statements.
+
+    The rows are split so that no statement exceeds the bound parameter
+    limit of the database. Every row must have the same keys.
+
+    Args:
+        db (Session): The session whose transaction the rows are inserted in.
+        table (Table): The table to insert into.
+        rows (list[dict[str, Any]]): The column values of each row.
+    """
+    if not rows:
+        return
+
+    rows_per_statement = max(1, MAX_PARAMETERS_PER_STATEMENT // len(rows[0]))
+
+    for chunk in chunked(rows, rows_per_statement):
+        db.execute(insert(table).values(chunk))
+
+
+def bulk_increment(
+    db: Session, table: Table, keys: list[str], rows: list[dict[str, Any]]
+) -> None:
+    """
+    Adds the values of rows to the counters of a table, inserting the rows
+    whose keys are not present yet.
+
+    sqlite and postgres run multi-row `INSERT ... ON CONFLICT DO UPDATE`
+    statements, so concurrent writers never lose increments. Other databases
+    fall back to an UPDATE, then an INSERT, per row. Every row must have the
+    same keys, and no two rows the same key values.
+
+    Args:
+        db (Session): The session whose transaction the rows are written in.
+        table (Table): The table to write to.
+        keys (list[str]): The columns of the primary key.
+        rows (list[dict[str, Any]]): The key values and increments of each row.
+    """
+    if not rows:
+        return
+
+    counters = [column for column in rows[0] if column not in keys]
+    upsert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(
+        db.get_bind().dialect.name
+    )
+
+    if upsert is None:
+        for row in rows:
+            updated = db.execute(
+                update(table)
+                .where(*(table.c[key] == row[key] for key in keys))
+                .values({column: table.c[column] + row[column] for column in counters})
+            ).rowcount
+            if not updated:
+                db.execute(insert(table).values(row))
+        return
+
+    rows_per_statement = max(1, MAX_PARAMETERS_PER_STATEMENT // len(rows[0]))
+
+    for chunk in chunked(rows, rows_per_statement):
+        stmt = upsert(table).values(chunk)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=keys,
+                set_={
+                    column: table.c[column] + stmt.excluded[column]
+                    for column in counters
+                },
+            )
+        )
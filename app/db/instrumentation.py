@@ -0,0 +1,184 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterator, Literal
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+
+# expanded IN lists, e.g. "(?, ?, ?)" or "(%(id_1_1)s, %(id_1_2)s)"
+_EXPANDED_PARAMS = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))+\s*\)"
+)
+
+# transaction control is not counted as a query, e.g. the savepoints of nested sessions
+_TRANSACTION_CONTROL = re.compile(
+    r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE
+)
+
+StrictMode = Literal["off", "warn", "raise"]
+
+
+class NPlusOneError(RuntimeError):
+    """
+    Raised in strict "raise" mode when the same statement shape runs more
+    often than allowed within a single request.
+    """
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalizes a SQL statement so that statements which only differ by the
+    length of an expanded IN list share the same shape.
+    """
+    return _EXPANDED_PARAMS.sub("(?)", " ".join(statement.split()))
+
+
+@dataclass
+class QueryStats:
+    """
+    Statement counts and database time collected during a unit of work,
+    typically a single request.
+    """
+
+    strict_mode: StrictMode = "off"
+    repeat_threshold: int = 0
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+    repeated: set[str] = field(default_factory=set)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        if _TRANSACTION_CONTROL.match(statement):
+            return
+
+        shape = statement_shape(statement)
+
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[shape] += 1
+
+        if (
+            self.strict_mode == "off"
+            or self.repeat_threshold <= 0
+            or self.shapes[shape] <= self.repeat_threshold
+            or shape in self.repeated
+        ):
+            return
+
+        self.repeated.add(shape)
+        message = (
+            f"Statement ran more than {self.repeat_threshold} times in one "
+            f"request, likely an N+1 query: {shape}"
+        )
+
+        if self.strict_mode == "raise":
+            raise NPlusOneError(message)
+
+        logger.warning(message)
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "rsf_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries(
+    strict_mode: StrictMode = "off", repeat_threshold: int = 0
+) -> Iterator[QueryStats]:
+    """
+    Collects statistics about every statement executed in the current context.
+
+    Args:
+        strict_mode (StrictMode): Whether repeated statement shapes are ignored,
+            logged as warnings or raised as NPlusOneError.
+        repeat_threshold (int): How often a statement shape may run before it
+            is reported, 0 disables the check.
+
+    Yields:
+        QueryStats: The statistics, updated as statements execute.
+    """
+    stats = QueryStats(strict_mode=strict_mode, repeat_threshold=repeat_threshold)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _query_stats.get() is not None:
+        conn.info.setdefault("rsf_query_start", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    stats = _query_stats.get()
+    starts: list[float] = conn.info.get("rsf_query_start", [])
+
+    if stats is None or not starts:
+        return
+
+    stats.record(statement, (perf_counter() - starts.pop()) * 1000)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(context) -> None:
+    # a failed statement never reaches after_cursor_execute
+    starts: list[float] = context.connection.info.get("rsf_query_start", [])
+    if starts:
+        starts.pop()
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the statements and database time of every request.
+
+    With `emit_headers` the totals are returned in the X-DB-Query-Count and
+    X-DB-Query-Time-Ms response headers. The strict mode reports statement
+    shapes that repeat more than `repeat_threshold` times in one request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        emit_headers: bool = False,
+        strict_mode: StrictMode = "off",
+        repeat_threshold: int = 0,
+    ) -> None:
+        self.app = app
+        self.emit_headers = emit_headers
+        self.strict_mode = strict_mode
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(self.strict_mode, self.repeat_threshold) as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if self.emit_headers and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers[QUERY_COUNT_HEADER] = str(stats.count)
+                    headers[QUERY_TIME_HEADER] = f"{stats.total_ms:.2f}"
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
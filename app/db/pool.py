@@ -0,0 +1,177 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+# upper bounds (in milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+@dataclass
+class PoolMetrics:
+    """
+    Live telemetry for a single connection pool.
+
+    Counters are fed by SQLAlchemy pool events (connect, checkout, checkin,
+    invalidate), while checkout wait times and timeouts are measured by the
+    instrumented pool class returned from `instrumented_pool_class`.
+    """
+
+    name: str
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    connections_opened: int = 0
+    checkouts: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    wait_count: int = 0
+    wait_total_ms: float = 0.0
+    wait_max_ms: float = 0.0
+    # one counter per bucket in WAIT_BUCKETS_MS, plus a final overflow bucket
+    wait_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(WAIT_BUCKETS_MS) + 1)
+    )
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def record_invalidate(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def record_timeout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def snapshot(self, pool: Pool | None = None) -> dict[str, Any]:
+        """
+        Returns a point-in-time view of the metrics, suitable for JSON output.
+
+        Args:
+            pool (Pool | None): The live pool, used to report its configured size
+                and current overflow when it exposes them.
+        """
+        with self._lock:
+            histogram = {
+                f"le_{bound:g}ms": count
+                for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            histogram["gt_{:g}ms".format(WAIT_BUCKETS_MS[-1])] = self.wait_buckets[-1]
+
+            result: dict[str, Any] = {
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait": {
+                    "count": self.wait_count,
+                    "mean_ms": self.wait_total_ms / self.wait_count
+                    if self.wait_count
+                    else 0.0,
+                    "max_ms": self.wait_max_ms,
+                    "histogram": histogram,
+                },
+            }
+
+        if pool is not None:
+            result["pool"] = type(pool).__name__
+            for attr in ("size", "overflow", "checkedin"):
+                if callable(getattr(pool, attr, None)):
+                    result[attr] = getattr(pool, attr)()
+
+        return result
+
+
+# metrics for every instrumented engine, keyed by engine role (e.g. "primary")
+POOL_METRICS: dict[str, PoolMetrics] = {}
+
+_instrumented_engines: dict[str, Engine] = {}
+
+
+def instrumented_pool_class(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """
+    Builds a subclass of a queue-based pool class that times every checkout.
+
+    SQLAlchemy has no event for "a checkout has started", so the wait for a
+    free connection is measured around the pool's `_do_get`. The subclass is
+    reused when the pool is recreated (e.g. on `engine.dispose()`), so the
+    metrics survive pool recycling.
+
+    Args:
+        base (type[Pool]): The pool class to instrument, e.g. QueuePool.
+        metrics (PoolMetrics): The metrics the checkout waits are recorded into.
+
+    Returns:
+        type[Pool]: The instrumented pool class.
+    """
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            connection = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.record_timeout((perf_counter() - start) * 1000)
+            raise
+        metrics.record_wait((perf_counter() - start) * 1000)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    """
+    Registers pool event listeners that feed the given metrics, and makes
+    the engine's pool visible to `pool_status`.
+
+    Args:
+        engine (Engine): The (sync) engine to instrument. For asyncio engines
+            pass `async_engine.sync_engine`.
+        metrics (PoolMetrics): The metrics to record into.
+    """
+    event.listen(engine, "connect", lambda *_: metrics.record_connect())
+    event.listen(engine, "checkout", lambda *_: metrics.record_checkout())
+    event.listen(engine, "checkin", lambda *_: metrics.record_checkin())
+    event.listen(engine, "invalidate", lambda *_: metrics.record_invalidate())
+
+    POOL_METRICS[metrics.name] = metrics
+    _instrumented_engines[metrics.name] = engine
+
+
+def pool_status() -> dict[str, dict[str, Any]]:
+    """
+    Returns a snapshot of the metrics of every instrumented pool.
+    """
+    return {
+        name: metrics.snapshot(
+            _instrumented_engines[name].pool if name in _instrumented_engines else None
+        )
+        for name, metrics in POOL_METRICS.items()
+    }
@@ -1,4 +1,6 @@
+from app.analytics.adapters.sql import DailyCustomerSales, DailyVariantSales  # noqa:F401
 from app.bill.adapters.sql import Bill  # noqa:F401
+from app.idempotency.store import IdempotencyRecord  # noqa:F401
 from app.order.adapters.sql import Order, OrderItem  # noqa:F401
 from app.payment.schemas import Payment  # noqa:F401
 from app.product.adapters.sql import Product, ProductVariant  # noqa:F401
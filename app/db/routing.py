@@ -0,0 +1,139 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import cycle
+from math import ceil
+from threading import Lock
+from time import time
+from typing import Generic, TypeVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# cookie holding the (server clock) time of a client's last committed write
+LAST_WRITE_COOKIE = "rsf_last_write"
+
+# session.info flag of the sessions whose commits are writes of the client
+_WRITE_SESSION = "rsf_write_session"
+
+SessionFactory = TypeVar("SessionFactory")
+
+
+@dataclass
+class _WriteMarker:
+    committed: bool = False
+
+
+_write_marker: ContextVar[_WriteMarker | None] = ContextVar(
+    "rsf_write_marker", default=None
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_commit(session: Session) -> None:
+    # flag the current request (if any) as having written to the primary
+    marker = _write_marker.get()
+    if marker is not None and session.info.get(_WRITE_SESSION):
+        marker.committed = True
+
+
+def mark_write_session(session: Session) -> None:
+    """
+    Flags a session so its commits keep the client's reads on the primary.
+    Commits of other sessions, e.g. bookkeeping of the idempotency store, do
+    not.
+    """
+    session.info[_WRITE_SESSION] = True
+
+
+def last_write_at(request: Request) -> float | None:
+    """
+    Returns the time of the client's last committed write, if it is known.
+    """
+    try:
+        return float(request.cookies[LAST_WRITE_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass
+class ReadRouter(Generic[SessionFactory]):
+    """
+    Picks the session factory that a read-only request should use.
+
+    Reads are spread round-robin across the replica factories, except for
+    clients that committed a write within the last `window_seconds`; those
+    stay on the primary so they always read their own writes.
+    """
+
+    primary: SessionFactory
+    replicas: list[SessionFactory] = field(default_factory=list)
+    window_seconds: float = 2.0
+    _cycle: "cycle[SessionFactory] | None" = field(default=None, init=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        self._cycle = cycle(self.replicas) if self.replicas else None
+
+    def factory_for(self, request: Request) -> SessionFactory:
+        """
+        Returns the session factory for a read-only request.
+
+        Args:
+            request (Request): The incoming request, used to look up the client's
+                last write.
+
+        Returns:
+            SessionFactory: A replica factory, or the primary when there are no
+            replicas or the client is inside its read-your-writes window.
+        """
+        if self._cycle is None:
+            return self.primary
+
+        written = last_write_at(request)
+        if written is not None and time() - written < self.window_seconds:
+            return self.primary
+
+        with self._lock:
+            return next(self._cycle)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients that committed a write during a request.
+
+    When a write session (see `mark_write_session`) commits while handling a
+    request, the response sets a short-lived cookie with the commit time,
+    which `ReadRouter` uses to keep that client's reads on the primary until
+    the replicas have caught up.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker = _WriteMarker()
+        token = _write_marker.set(marker)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.committed:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{LAST_WRITE_COOKIE}={time():.3f}; "
+                    f"Max-Age={ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _write_marker.reset(token)
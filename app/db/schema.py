@@ -0,0 +1,210 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from hashlib import sha256
+from time import monotonic, sleep
+from typing import Iterator
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    delete,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.engine import Dialect, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# bookkeeping table, kept out of Base.metadata so it is not part of the fingerprint
+schema_meta = Table(
+    "schema_meta",
+    MetaData(),
+    Column("name", String(64), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+SCHEMA_NAME = "app"
+
+# arbitrary, stable key for the postgres advisory lock guarding schema changes
+_ADVISORY_LOCK_KEY = 0x7273665F736368
+
+# how long a worker waits for another one to finish applying the schema
+SCHEMA_LOCK_TIMEOUT_SECONDS = 120.0
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """
+    Computes a hash of the DDL that the metadata renders for a dialect.
+
+    Args:
+        metadata (MetaData): The metadata describing the expected schema.
+        dialect (Dialect): The dialect of the target database.
+
+    Returns:
+        str: A hex sha256 digest that changes whenever a table, column,
+        constraint or index definition changes.
+    """
+    statements = [
+        str(CreateTable(table).compile(dialect=dialect)).strip()
+        for table in metadata.sorted_tables
+    ]
+    statements += sorted(
+        str(CreateIndex(index).compile(dialect=dialect)).strip()
+        for table in metadata.sorted_tables
+        for index in table.indexes
+    )
+
+    return sha256("\n".join(statements).encode()).hexdigest()
+
+
+def stored_fingerprint(connection: Connection) -> str | None:
+    """
+    Returns the fingerprint of the schema last applied to the database,
+    or None if no schema was applied through `ensure_schema` yet.
+    """
+    if not inspect(connection).has_table(schema_meta.name):
+        return None
+
+    return connection.scalar(
+        select(schema_meta.c.fingerprint).where(schema_meta.c.name == SCHEMA_NAME)
+    )
+
+
+@contextmanager
+def schema_lock(connection: Connection) -> Iterator[None]:
+    """
+    Holds a database-wide lock for the duration of the current transaction,
+    so only one worker applies DDL while the others wait for it.
+
+    sqlite takes its write lock with `BEGIN IMMEDIATE` and postgres uses a
+    transaction-level advisory lock. Other databases are not locked.
+    """
+    dialect = connection.dialect.name
+    deadline = monotonic() + SCHEMA_LOCK_TIMEOUT_SECONDS
+
+    if dialect == "sqlite":
+        while True:
+            try:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                break
+            except OperationalError:
+                connection.rollback()
+                if monotonic() > deadline:
+                    raise
+                sleep(0.5)
+    elif dialect == "postgresql":
+        connection.exec_driver_sql(
+            f"SELECT pg_advisory_xact_lock({_ADVISORY_LOCK_KEY})"
+        )
+    else:
+        logger.warning(
+            f"Applying the schema without a lock, '{dialect}' is not supported"
+        )
+
+    yield
+
+
+def add_missing_columns(connection: Connection, table: Table) -> None:
+    """
+    Adds the columns of a table that are missing from the database.
+
+    Only additive changes are handled. A new NOT NULL column needs a
+    `server_default` to be added to a table that already has rows.
+    """
+    existing = {
+        column["name"] for column in inspect(connection).get_columns(table.name)
+    }
+    preparer = connection.dialect.identifier_preparer
+
+    for column in table.columns:
+        if column.name in existing:
+            continue
+
+        logger.info(f"Adding column '{table.name}.{column.name}'")
+
+        connection.exec_driver_sql(
+            f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+            f"{CreateColumn(column).compile(dialect=connection.dialect)}"
+        )
+
+
+def apply_schema(connection: Connection, metadata: MetaData) -> None:
+    """
+    Creates missing tables, then any columns and indexes missing from
+    existing tables.
+
+    `MetaData.create_all` only creates columns and indexes together with their
+    tables, so the ones added to an existing table are created separately.
+    """
+    existing_tables = set(inspect(connection).get_table_names())
+
+    metadata.create_all(bind=connection)
+
+    for table in metadata.sorted_tables:
+        if table.name in existing_tables:
+            add_missing_columns(connection, table)
+
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+
+
+def ensure_schema(engine: Engine, metadata: MetaData, force: bool = False) -> bool:
+    """
+    Brings the database schema up to date with the metadata.
+
+    When the fingerprint stored in the database matches the metadata, this
+    returns without inspecting any table. Otherwise the schema is applied
+    under `schema_lock`, re-checking the fingerprint once the lock is held in
+    case another worker applied it while this one was waiting.
+
+    Args:
+        engine (Engine): The engine of the database to update.
+        metadata (MetaData): The metadata describing the expected schema.
+        force (bool): Apply the schema even if the fingerprints match.
+
+    Returns:
+        bool: True if the schema was applied by this call, False otherwise.
+    """
+    expected = schema_fingerprint(metadata, engine.dialect)
+
+    if not force:
+        with engine.connect() as connection:
+            if stored_fingerprint(connection) == expected:
+                logger.info("Database schema is up to date")
+                return False
+
+    with engine.connect() as connection:
+        with schema_lock(connection):
+            if not force and stored_fingerprint(connection) == expected:
+                logger.info("Database schema was applied by another worker")
+                connection.commit()
+                return False
+
+            logger.info("Applying database schema")
+
+            apply_schema(connection, metadata)
+            schema_meta.create(bind=connection, checkfirst=True)
+            connection.execute(
+                delete(schema_meta).where(schema_meta.c.name == SCHEMA_NAME)
+            )
+            connection.execute(
+                insert(schema_meta).values(
+                    name=SCHEMA_NAME,
+                    fingerprint=expected,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+
+        connection.commit()
+
+    return True
@@ -1,10 +1,23 @@
-from typing import Any
+from typing import Any, AsyncIterator
 
 import orjson
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from app.config import config
+from app.db.pool import PoolMetrics, instrument_engine, instrumented_pool_class
+from app.db.routing import ReadRouter, mark_write_session
+from app.db.slow_query import SlowQueryLog
+from app.db.sqlite import configure_sqlite_engine
 
 DATABASE_URL = config.DB_URL
 
@@ -13,6 +26,21 @@ if DATABASE_URL is None:
         "DB_URL environment variable not set. Failed to determine database url."
     )
 
+# asyncio drivers used when DB_ASYNC_URL is not provided explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+# statements slower than DB_SLOW_QUERY_MS, across every engine
+slow_query_log = SlowQueryLog(
+    threshold_ms=config.DB_SLOW_QUERY_MS or 0.0,
+    capacity=config.DB_SLOW_QUERY_LOG_SIZE,
+    capture_plans=config.DB_SLOW_QUERY_EXPLAIN,
+)
+
 
 def orjson_serializer(obj: Any):
     """
@@ -24,26 +52,204 @@ def orjson_serializer(obj: Any):
     ).decode()
 
 
-engine = create_engine(
-    DATABASE_URL,
-    json_serializer=orjson_serializer,
-    json_deserializer=orjson.loads,
-    connect_args={"check_same_thread": False}
-    if DATABASE_URL.startswith("sqlite")
-    else {},
-)
+def to_async_url(url: str) -> str:
+    """
+    Converts a database url into one that uses an asyncio driver.
+
+    Args:
+        url (str): The database url, e.g. `sqlite:///./orders.db`.
+
+    Returns:
+        str: The same url with an asyncio driver, e.g. `sqlite+aiosqlite:///./orders.db`.
+
+    Raises:
+        ValueError: If no asyncio driver is known for the database backend.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver is known for the '{backend}' backend")
+
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+def is_memory_database(url: str) -> bool:
+    """
+    Checks if a database url points to an in-memory sqlite database, which
+    is served by a single-connection pool rather than a queue-based one.
+    """
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:")
+        or parsed.query.get("mode") == "memory"
+    )
+
+
+def pool_options(
+    url: str, pool_class: type[Pool], metrics: PoolMetrics
+) -> dict[str, Any]:
+    """
+    Builds the connection pool keyword arguments for an engine from the AppConfig.
+
+    Args:
+        url (str): The database url the engine connects to.
+        pool_class (type[Pool]): The queue-based pool class used by the dialect.
+        metrics (PoolMetrics): Metrics that record checkout wait times.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for `create_engine`/`create_async_engine`.
+    """
+    options: dict[str, Any] = {
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+    }
+
+    if not is_memory_database(url):
+        options.update(
+            poolclass=instrumented_pool_class(pool_class, metrics),
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+
+    return options
+
+
+def build_engine(url: str, name: str) -> Engine:
+    """
+    Creates an instrumented engine configured from the AppConfig.
+
+    Args:
+        url (str): The database url to connect to.
+        name (str): The role of the engine (e.g. "primary"), used to report its
+            pool telemetry.
+
+    Returns:
+        Engine: The new engine.
+    """
+    metrics = PoolMetrics(name=name)
+
+    new_engine = create_engine(
+        url,
+        json_serializer=orjson_serializer,
+        json_deserializer=orjson.loads,
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+        **pool_options(url, QueuePool, metrics),
+    )
+    instrument_engine(new_engine, metrics)
+    configure_sqlite_engine(new_engine)
+
+    if config.DB_SLOW_QUERY_MS is not None:
+        slow_query_log.install(new_engine)
+
+    return new_engine
+
+
+def build_async_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Creates an instrumented asyncio engine configured from the AppConfig.
+
+    Args:
+        url (str): The asyncio database url to connect to.
+        name (str): The role of the engine (e.g. "async"), used to report its
+            pool telemetry.
+
+    Returns:
+        AsyncEngine: The new asyncio engine.
+    """
+    metrics = PoolMetrics(name=name)
+
+    new_engine = create_async_engine(
+        url,
+        json_serializer=orjson_serializer,
+        json_deserializer=orjson.loads,
+        **pool_options(url, AsyncAdaptedQueuePool, metrics),
+    )
+    instrument_engine(new_engine.sync_engine, metrics)
+    configure_sqlite_engine(new_engine.sync_engine)
+
+    if config.DB_SLOW_QUERY_MS is not None:
+        slow_query_log.install(new_engine.sync_engine)
+
+    return new_engine
+
+
+engine = build_engine(DATABASE_URL, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# read-only replicas of the primary database
+replica_engines: list[Engine] = [
+    build_engine(url, f"replica-{index}")
+    for index, url in enumerate(config.DB_READ_REPLICA_URLS)
+]
+
+read_router = ReadRouter(
+    primary=SessionLocal,
+    replicas=[
+        sessionmaker(autocommit=False, autoflush=False, bind=replica)
+        for replica in replica_engines
+    ],
+    window_seconds=config.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+ASYNC_DATABASE_URL = config.DB_ASYNC_URL or (
+    to_async_url(DATABASE_URL) if config.DB_ASYNC else None
+)
+
+async_engine: AsyncEngine | None = None
+async_replica_engines: list[AsyncEngine] = []
+
+if config.DB_ASYNC and ASYNC_DATABASE_URL:
+    async_engine = build_async_engine(ASYNC_DATABASE_URL, "async")
+    async_replica_engines = [
+        build_async_engine(to_async_url(url), f"async-replica-{index}")
+        for index, url in enumerate(config.DB_READ_REPLICA_URLS)
+    ]
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, bind=async_engine)
+
+async_read_router = ReadRouter(
+    primary=AsyncSessionLocal,
+    replicas=[
+        async_sessionmaker(autoflush=False, bind=replica)
+        for replica in async_replica_engines
+    ],
+    window_seconds=config.DB_READ_YOUR_WRITES_SECONDS,
+)
+
 
 def get_db():
     """
     Yields a database session.
 
     The session is automatically rolled back if an exception occurs,
-    and automatically closed when the context manager exits.
+    and automatically closed when the context manager exits. Its commits
+    keep the client's reads on the primary.
     """
     db = SessionLocal()
+    mark_write_session(db)
+    try:
+        yield db
+    except:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Yields a database session for read-only work.
+
+    The session is bound to a read replica when any are configured, unless
+    the client committed a write within the read-your-writes window, in which
+    case it is bound to the primary like `get_db`.
+    """
+    db = read_router.factory_for(request)()
     try:
         yield db
     except:
@@ -51,3 +257,42 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Yields an asyncio database session.
+
+    Mirrors `get_db`: the session is rolled back if an exception occurs,
+    and closed when the request finishes.
+    """
+    if async_engine is None:
+        raise OSError("DB_ASYNC is not enabled. Failed to create an asyncio session.")
+
+    db = AsyncSessionLocal()
+    mark_write_session(db.sync_session)
+    try:
+        yield db
+    except:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Yields an asyncio database session for read-only work, routed like
+    `get_read_db`.
+    """
+    if async_engine is None:
+        raise OSError("DB_ASYNC is not enabled. Failed to create an asyncio session.")
+
+    db = async_read_router.factory_for(request)()
+    try:
+        yield db
+    except:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
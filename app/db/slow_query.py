@@ -0,0 +1,200 @@
+import sys
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# statements that EXPLAIN can plan without side effects
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+
+# set in `Connection.info` while a plan is captured, so the EXPLAIN and its
+# savepoint are neither timed nor explained themselves
+_EXPLAINING = "rsf_slow_query_explaining"
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    """
+    A statement that took longer than the slow-query threshold
+    """
+
+    recorded_at: datetime
+    duration_ms: float
+    database: str
+    statement: str
+    # the types of the bound parameters, never their values
+    parameters: Any
+    executemany: bool
+    # the adapter method that issued the statement, e.g. "OrderSqlAdapter.get_order_by_id"
+    caller: str | None
+    plan: list[str] | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Describes bound parameters by their types, so no customer data is logged.
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: describe the first row and the number of rows
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def find_caller() -> str | None:
+    """
+    Returns the innermost adapter method on the current call stack, falling
+    back to the innermost application frame outside of `app.db`.
+    """
+    fallback: str | None = None
+    frame = sys._getframe(1)
+
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and not module.startswith("app.db"):
+            if ".adapters." in module:
+                return frame.f_code.co_qualname
+            fallback = fallback or f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+
+    return fallback
+
+
+def explain(conn: Connection, statement: str, parameters: Any) -> list[str] | None:
+    """
+    Captures the query plan of a statement on the connection that ran it.
+
+    Uses `EXPLAIN QUERY PLAN` on sqlite and `EXPLAIN` elsewhere. Neither
+    executes the statement itself. The EXPLAIN runs in a savepoint of the
+    caller's transaction: a failed EXPLAIN, which aborts the whole
+    transaction on postgres, only rolls back to the savepoint.
+    """
+    if not statement.lstrip().lower().startswith(_EXPLAINABLE):
+        return None
+
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+
+    conn.info[_EXPLAINING] = True
+    try:
+        with conn.begin_nested():
+            rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    except DBAPIError as e:
+        return [f"EXPLAIN failed: {e.orig}"]
+    finally:
+        del conn.info[_EXPLAINING]
+
+    if conn.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        return [str(row[-1]) for row in rows]
+
+    return [" ".join(str(column) for column in row) for row in rows]
+
+
+class SlowQueryLog:
+    """
+    Bounded ring buffer of statements slower than `threshold_ms`.
+
+    Each entry records the bound-parameter shape, the adapter method that
+    issued the statement and, optionally, its query plan. Plans are captured
+    once per distinct statement and reused, so a statement that is slow on
+    every request pays for EXPLAIN only the first time.
+    """
+
+    def __init__(
+        self, threshold_ms: float, capacity: int = 200, capture_plans: bool = True
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.capture_plans = capture_plans
+        self._entries: deque[SlowQuery] = deque(maxlen=capacity)
+        # statement -> its plan, for as many statements as the log holds
+        self._plans: OrderedDict[str, list[str] | None] = OrderedDict()
+        self._lock = Lock()
+
+    def install(self, engine: Engine) -> None:
+        """
+        Times every statement of the engine. For asyncio engines pass
+        `async_engine.sync_engine`.
+        """
+        event.listen(engine, "before_cursor_execute", self._start)
+        event.listen(engine, "after_cursor_execute", self._finish)
+
+    def recent(self, limit: int | None = None) -> list[SlowQuery]:
+        """
+        Returns the most recent slow queries, newest first.
+        """
+        with self._lock:
+            entries = list(reversed(self._entries))
+
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+    def _start(self, conn, cursor, statement, parameters, context, executemany):
+        if not conn.info.get(_EXPLAINING):
+            context._rsf_slow_query_start = perf_counter()
+
+    def _plan(
+        self, conn: Connection, statement: str, parameters: Any
+    ) -> list[str] | None:
+        with self._lock:
+            if statement in self._plans:
+                self._plans.move_to_end(statement)
+                return self._plans[statement]
+
+        plan = explain(conn, statement, parameters)
+
+        with self._lock:
+            self._plans[statement] = plan
+            while len(self._plans) > (self._entries.maxlen or 0):
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def _finish(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_rsf_slow_query_start", None)
+        if start is None:
+            return
+
+        duration_ms = (perf_counter() - start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = SlowQuery(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=duration_ms,
+            database=conn.engine.url.render_as_string(hide_password=True),
+            statement=statement,
+            parameters=parameter_shape(parameters),
+            executemany=executemany,
+            caller=find_caller(),
+            plan=self._plan(conn, statement, parameters)
+            if self.capture_plans and not executemany
+            else None,
+        )
+
+        with self._lock:
+            self._entries.append(entry)
+
+        logger.warning(
+            f"Slow query ({duration_ms:.1f} ms) from {entry.caller}: "
+            f"{' '.join(statement.split())}"
+        )
@@ -0,0 +1,84 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import config
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def sqlite_pragmas() -> list[str]:
+    """
+    Returns the per-connection PRAGMA statements of the sqlite tuning profile.
+
+    WAL lets readers proceed while a writer commits, and with
+    `synchronous=NORMAL` a commit no longer waits for a full fsync (the WAL is
+    synced at checkpoints instead). The remaining pragmas size the page cache
+    and memory map, keep temporary tables in memory, make writers wait for a
+    lock rather than failing with SQLITE_BUSY, and enforce foreign keys.
+    """
+    pragmas = [
+        f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size={int(config.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA temp_store={config.SQLITE_TEMP_STORE}",
+        f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}",
+    ]
+
+    if config.SQLITE_FOREIGN_KEYS:
+        pragmas.append("PRAGMA foreign_keys=ON")
+
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """
+    `connect` event listener that applies the sqlite tuning profile to a
+    newly opened DBAPI connection.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(engine: Engine) -> None:
+    """
+    Applies the sqlite tuning profile to every connection the engine opens.
+
+    Does nothing for engines of other databases, or when the profile is disabled.
+    For asyncio engines pass `async_engine.sync_engine`.
+    """
+    if engine.dialect.name != "sqlite" or not config.SQLITE_TUNING:
+        return
+
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+
+def run_sqlite_maintenance(engine: Engine) -> None:
+    """
+    Refreshes the query planner statistics and checkpoints the WAL.
+
+    `PRAGMA optimize` only analyzes tables whose statistics are stale, and a
+    PASSIVE checkpoint copies WAL frames back into the database without
+    blocking readers or writers, which keeps the WAL file from growing.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA optimize")
+        busy, wal_frames, checkpointed = connection.exec_driver_sql(
+            "PRAGMA wal_checkpoint(PASSIVE)"
+        ).one()
+        connection.commit()
+
+    logger.info(
+        f"sqlite maintenance finished: checkpointed {checkpointed}/{wal_frames} WAL frames"
+        + (" (database busy)" if busy else "")
+    )
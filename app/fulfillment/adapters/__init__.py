@@ -0,0 +1,7 @@
+from app.fulfillment.adapters.sql import FulfillmentSqlAdapter
+from app.fulfillment.adapters.sql_async import FulfillmentAsyncSqlAdapter
+
+__all__ = [
+    "FulfillmentSqlAdapter",
+    "FulfillmentAsyncSqlAdapter",
+]
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+
+from app.fulfillment.domain.models import Picklist, PicklistLine, PicklistQuery
+from app.fulfillment.domain.port import FulfillmentPort
+from app.order.adapters.sql import Order, OrderItem
+from app.order.domain.models import OrderStatus
+from app.product.adapters.sql import Product, ProductVariant
+from app.product.domain.models import ProductVariantUnit
+
+
+@dataclass
+class FulfillmentSqlAdapter(FulfillmentPort):
+    db: Session
+
+    def get_picklist(self, query: PicklistQuery) -> Picklist:
+        """
+        Totals the quantities of every product variant across pending orders.
+
+        The totals are computed by the database in a single GROUP BY over the
+        order items of the matching orders.
+
+        Args:
+            query (PicklistQuery): Filters for the pending orders to include.
+
+        Returns:
+            Picklist: One line per product variant in the matching orders.
+        """
+        conditions = [Order.status == OrderStatus.PENDING]
+
+        if query.created_after is not None:
+            conditions.append(Order.created >= query.created_after)
+        if query.created_before is not None:
+            conditions.append(Order.created < query.created_before)
+        if query.user_id is not None:
+            conditions.append(Order.user_id == query.user_id)
+
+        group = (
+            Product.id,
+            Product.name,
+            ProductVariant.id,
+            ProductVariant.kind,
+            ProductVariant.size,
+            ProductVariant.unit,
+        )
+
+        rows = self.db.execute(
+            select(
+                *group,
+                func.sum(OrderItem.quantity),
+                func.count(distinct(OrderItem.order_id)),
+            )
+            .select_from(OrderItem)
+            .join(Order, Order.id == OrderItem.order_id)
+            .join(ProductVariant, ProductVariant.id == OrderItem.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(*conditions)
+            .group_by(*group)
+            .order_by(
+                Product.name,
+                ProductVariant.kind,
+                ProductVariant.size,
+                ProductVariant.id,
+            )
+        ).all()
+
+        lines = []
+        for product_id, name, variant_id, kind, size, unit, quantity, orders in rows:
+            unit = ProductVariantUnit(unit)
+            lines.append(
+                PicklistLine(
+                    product_id=product_id,
+                    product_name=name,
+                    product_variant_id=variant_id,
+                    kind=kind,
+                    size=size,
+                    unit=unit,
+                    quantity=quantity,
+                    order_count=orders,
+                    volume_ml=unit.to_milliliters(size * quantity),
+                )
+            )
+
+        return Picklist(
+            lines=lines,
+            total_quantity=sum(line.quantity for line in lines),
+            total_volume_ml=sum(line.volume_ml for line in lines),
+        )
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.fulfillment.adapters.sql import FulfillmentSqlAdapter
+from app.fulfillment.domain.models import Picklist, PicklistQuery
+from app.fulfillment.domain.port import AsyncFulfillmentPort
+
+
+@dataclass
+class FulfillmentAsyncSqlAdapter(AsyncFulfillmentPort):
+    """
+    asyncio adapter for fulfillment that runs the FulfillmentSqlAdapter logic
+    through `AsyncSession.run_sync`
+    """
+
+    db: AsyncSession
+
+    async def get_picklist(self, query: PicklistQuery) -> Picklist:
+        return await self.db.run_sync(
+            lambda db: FulfillmentSqlAdapter(db).get_picklist(query)
+        )
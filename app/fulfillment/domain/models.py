@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.order.domain.models import as_utc
+from app.product.domain.models import ProductVariantUnit
+
+
+class PicklistQuery(BaseModel):
+    """
+    Filters for the pending orders a pick list is built from
+    """
+
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    user_id: UUID | None = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def ensure_utc(cls, v: datetime | None) -> datetime | None:
+        return as_utc(v) if v is not None else None
+
+
+class PicklistLine(BaseModel):
+    """
+    Total quantity of one product variant across the pending orders
+    """
+
+    product_id: UUID
+    product_name: str
+    product_variant_id: UUID
+    kind: str
+    size: int
+    unit: ProductVariantUnit
+    quantity: int
+    # the number of pending orders containing the variant
+    order_count: int
+    # quantity * size, converted to milliliters
+    volume_ml: float
+
+
+class Picklist(BaseModel):
+    """
+    Pick list of the pending orders, one line per product variant, ordered
+    by product name, kind, and size
+    """
+
+    lines: list[PicklistLine] = Field(default_factory=list)
+    total_quantity: int = 0
+    total_volume_ml: float = 0
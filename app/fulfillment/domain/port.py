@@ -0,0 +1,33 @@
+from typing import Protocol
+
+from app.fulfillment.domain.models import Picklist, PicklistQuery
+
+
+class FulfillmentPort(Protocol):
+    """
+    Port that reads the orders waiting to be fulfilled
+    """
+
+    def get_picklist(self, query: PicklistQuery) -> Picklist:
+        """
+        Totals the quantities of every product variant across pending orders.
+
+        Args:
+            query (PicklistQuery): Filters for the pending orders to include.
+
+        Returns:
+            Picklist: One line per product variant in the matching orders.
+        """
+        ...
+
+
+class AsyncFulfillmentPort(Protocol):
+    """
+    asyncio counterpart of the FulfillmentPort
+    """
+
+    async def get_picklist(self, query: PicklistQuery) -> Picklist:
+        """
+        Totals the quantities of every product variant across pending orders.
+        """
+        ...
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+
+from app.fulfillment.domain.models import Picklist, PicklistQuery
+from app.fulfillment.domain.port import AsyncFulfillmentPort, FulfillmentPort
+
+
+@dataclass(frozen=True)
+class FulfillmentService:
+    """
+    Service layer for preparing orders for the warehouse
+    """
+
+    port: FulfillmentPort
+
+    @classmethod
+    def instance(cls, port: FulfillmentPort) -> "FulfillmentService":
+        return cls(port=port)
+
+    def get_picklist(self, query: PicklistQuery) -> Picklist:
+        """
+        Totals the quantities of every product variant across pending orders.
+        """
+        return self.port.get_picklist(query)
+
+
+@dataclass(frozen=True)
+class AsyncFulfillmentService:
+    """
+    asyncio service layer for preparing orders for the warehouse
+    """
+
+    port: AsyncFulfillmentPort
+
+    @classmethod
+    def instance(cls, port: AsyncFulfillmentPort) -> "AsyncFulfillmentService":
+        return cls(port=port)
+
+    async def get_picklist(self, query: PicklistQuery) -> Picklist:
+        """
+        Totals the quantities of every product variant across pending orders.
+        """
+        return await self.port.get_picklist(query)
@@ -0,0 +1,55 @@
+from typing import Annotated, AsyncIterator, Iterator, cast
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.core.service import ThreadedService
+from app.db import get_async_read_db, get_read_db
+from app.fulfillment.adapters import FulfillmentAsyncSqlAdapter, FulfillmentSqlAdapter
+from app.fulfillment.domain.models import Picklist, PicklistQuery
+from app.fulfillment.service import AsyncFulfillmentService, FulfillmentService
+
+router_v0 = APIRouter(prefix="/v0")
+
+
+def get_sync_fulfillment_read_service(
+    db: Session = Depends(get_read_db),
+) -> Iterator[AsyncFulfillmentService]:
+    """
+    Gets an instance of the FulfillmentService for read-only operations, bound
+    to a read replica session when replicas are configured, whose methods
+    run in the threadpool
+    """
+    service = FulfillmentService.instance(FulfillmentSqlAdapter(db))
+    yield cast(AsyncFulfillmentService, ThreadedService(service))
+
+
+async def get_async_fulfillment_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncIterator[AsyncFulfillmentService]:
+    """
+    Gets an instance of the AsyncFulfillmentService for read-only operations
+    """
+    yield AsyncFulfillmentService.instance(FulfillmentAsyncSqlAdapter(db))
+
+
+# the routes only see the asyncio interface; with DB_ASYNC disabled it is the
+# blocking service run in the threadpool
+if config.DB_ASYNC:
+    get_fulfillment_read_service = get_async_fulfillment_read_service
+else:
+    get_fulfillment_read_service = get_sync_fulfillment_read_service
+
+
+@router_v0.get("/fulfillment/picklist")
+async def get_picklist(
+    query: Annotated[PicklistQuery, Query()],
+    service: AsyncFulfillmentService = Depends(get_fulfillment_read_service),
+) -> Picklist:
+    """
+    Totals the quantities to pick per product variant across pending orders,
+    optionally limited to orders created in a date window or by one customer.
+    """
+    return await service.get_picklist(query)
@@ -0,0 +1,9 @@
+from app.idempotency.middleware import IDEMPOTENCY_KEY_HEADER, IdempotencyMiddleware
+from app.idempotency.store import IdempotencyRecord, IdempotencyStore
+
+__all__ = [
+    "IDEMPOTENCY_KEY_HEADER",
+    "IdempotencyMiddleware",
+    "IdempotencyRecord",
+    "IdempotencyStore",
+]
@@ -0,0 +1,137 @@
+from hashlib import sha256
+
+from anyio import CancelScope
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.idempotency.store import (
+    IdempotencyInFlightError,
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """
+    Runs requests that carry an Idempotency-Key at most once.
+
+    Applies to the `(method, path)` pairs in `routes`. The first request with
+    a key runs normally and its successful (2xx) response is stored; retries
+    with the same key and body get the stored response replayed, marked with
+    an `Idempotent-Replayed: true` header. Failed requests release their key
+    so they can be retried.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        routes: set[tuple[str, str]],
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or (scope["method"], scope["path"]) not in self.routes
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = Headers(scope=scope).get(IDEMPOTENCY_KEY_HEADER)
+
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {
+                    "detail": f"{IDEMPOTENCY_KEY_HEADER} must have 1 to "
+                    f"{MAX_KEY_LENGTH} characters"
+                },
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        key = f"{scope['method']} {scope['path']} {idempotency_key}"
+        request_hash = sha256(
+            scope["method"].encode() + b" " + scope["path"].encode() + b"\n" + body
+        ).hexdigest()
+
+        try:
+            cached = await self.store.reserve(key, request_hash)
+        except IdempotencyKeyReusedError as e:
+            await JSONResponse({"detail": str(e)}, status_code=422)(
+                scope, receive, send
+            )
+            return
+        except IdempotencyInFlightError as e:
+            await JSONResponse(
+                {"detail": str(e)}, status_code=409, headers={"Retry-After": "1"}
+            )(scope, receive, send)
+            return
+
+        if cached is not None:
+            replay = Response(
+                cached.body,
+                status_code=cached.status_code,
+                media_type=cached.content_type,
+                headers={IDEMPOTENT_REPLAYED_HEADER: "true"},
+            )
+            await replay(scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        content_type: str | None = None
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except BaseException:
+            # also release the key when the request is cancelled
+            with CancelScope(shield=True):
+                await self.store.release(key)
+            raise
+
+        if 200 <= status_code < 300:
+            stored = self.store.response_for(
+                request_hash, status_code, content_type, b"".join(chunks)
+            )
+            await self.store.complete(key, stored)
+        else:
+            await self.store.release(key)
@@ -0,0 +1,396 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, TypeVar
+
+import anyio
+from anyio import CapacityLimiter, to_thread
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    LargeBinary,
+    String,
+    delete,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy import (
+    Enum as SqlEnum,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.core.exceptions import ConflictError
+from app.core.logging import get_logger
+from app.db import Base
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class IdempotencyStatus(str, Enum):
+    IN_FLIGHT = "in_flight"
+    COMPLETED = "completed"
+
+
+class IdempotencyRecord(Base):
+    """
+    A reserved Idempotency-Key and, once its request completed, the response
+    that is replayed to retries of the request
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    # "<method> <path> <Idempotency-Key>", so keys are scoped to an endpoint
+    key: Mapped[str] = mapped_column(String(512), primary_key=True)
+
+    # sha256 of the request, to detect a key reused for a different request
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status: Mapped[IdempotencyStatus] = mapped_column(
+        SqlEnum(
+            IdempotencyStatus, values_callable=lambda enum: [e.value for e in enum]
+        ),
+        nullable=False,
+    )
+
+    # the stored response, set once the request completed
+    response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_content_type: Mapped[str | None] = mapped_column(
+        String(255), nullable=True
+    )
+    response_body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    # in-flight reservations expire so a crashed worker cannot hold a key forever
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    A response stored for an Idempotency-Key
+    """
+
+    request_hash: str
+    status_code: int
+    content_type: str | None
+    body: bytes
+    expires_at: datetime
+
+
+class IdempotencyKeyReusedError(ConflictError):
+    """
+    Raised when an Idempotency-Key is reused for a different request.
+    """
+
+
+class IdempotencyInFlightError(ConflictError):
+    """
+    Raised when a request with the same Idempotency-Key is still running
+    after the wait timeout.
+    """
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # sqlite returns naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class IdempotencyStore:
+    """
+    Stores the responses of requests made with an Idempotency-Key.
+
+    A key is reserved in the `idempotency_keys` table before its request
+    runs, so only one worker runs it. Duplicates wait for the in-flight
+    request, on an event within this process or by polling the table
+    otherwise, and then receive its stored response. Completed responses are
+    kept for `ttl_seconds` and cached in an in-memory LRU in front of the
+    table.
+
+    Duplicates wait on the event loop, not in worker threads, so a burst of
+    retries cannot exhaust the threadpool the requests they wait for need.
+    Only the table reads and writes run in threads, at most `max_threads`
+    at a time.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ttl_seconds: float,
+        cache_size: int = 1024,
+        wait_seconds: float = 10.0,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 0.1,
+        max_threads: int = 8,
+    ) -> None:
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self.wait_seconds = wait_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._in_flight: dict[str, anyio.Event] = {}
+        self._lock = Lock()
+        # bounds the threads running table statements, apart from the
+        # threadpool shared with the sync endpoints
+        self._limiter = CapacityLimiter(max_threads)
+
+    async def reserve(self, key: str, request_hash: str) -> CachedResponse | None:
+        """
+        Reserves a key for a request, or returns the response stored for it.
+
+        Waits while another request with the same key is in flight.
+
+        Args:
+            key (str): The endpoint-scoped Idempotency-Key.
+            request_hash (str): The hash of the request.
+
+        Returns:
+            CachedResponse | None: The stored response to replay, or None if
+            the key was reserved and the request should run. The caller must
+            then call `complete` or `release`.
+
+        Raises:
+            IdempotencyKeyReusedError: If the key was used for a different request.
+            IdempotencyInFlightError: If the in-flight request did not finish in time.
+        """
+        deadline = monotonic() + self.wait_seconds
+
+        while True:
+            cached = self._cached(key)
+            if cached is not None:
+                return self._check(cached, request_hash)
+
+            with self._lock:
+                event = self._in_flight.get(key)
+                if event is None:
+                    self._in_flight[key] = anyio.Event()
+
+            if event is not None:
+                # a request in this process holds the key
+                with anyio.move_on_after(max(0.0, deadline - monotonic())) as scope:
+                    await event.wait()
+                if scope.cancelled_caught:
+                    raise IdempotencyInFlightError(
+                        "A request with this Idempotency-Key is still in progress"
+                    )
+                continue
+
+            try:
+                stored = await self._run(self._reserve_row, key, request_hash)
+            except BaseException:
+                self._finish(key)
+                raise
+
+            if stored is None:
+                return None
+
+            # another worker holds or completed the key
+            self._finish(key)
+
+            if isinstance(stored, CachedResponse):
+                self._remember(key, stored)
+                return self._check(stored, request_hash)
+
+            if monotonic() >= deadline:
+                raise IdempotencyInFlightError(
+                    "A request with this Idempotency-Key is still in progress"
+                )
+
+            await anyio.sleep(min(self.poll_interval, deadline - monotonic()))
+
+    async def complete(self, key: str, response: CachedResponse) -> None:
+        """
+        Stores the response of a reserved key and wakes up waiting duplicates.
+        """
+        try:
+            await self._run(self._store_response, key, response)
+            self._remember(key, response)
+        finally:
+            self._finish(key)
+
+    async def release(self, key: str) -> None:
+        """
+        Drops the reservation of a key whose request failed, so a retry runs
+        the request again.
+        """
+        try:
+            await self._run(self._delete_reservation, key)
+        finally:
+            self._finish(key)
+
+    def response_for(
+        self, request_hash: str, status_code: int, content_type: str | None, body: bytes
+    ) -> CachedResponse:
+        """
+        Builds the response to store for a completed request.
+        """
+        return CachedResponse(
+            request_hash=request_hash,
+            status_code=status_code,
+            content_type=content_type,
+            body=body,
+            expires_at=_now() + timedelta(seconds=self.ttl_seconds),
+        )
+
+    def sweep(self) -> int:
+        """
+        Deletes expired keys.
+
+        Returns:
+            int: The number of deleted keys.
+        """
+        with self.session_factory() as db, db.begin():
+            deleted = db.execute(
+                delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < _now())
+            ).rowcount
+
+        if deleted:
+            logger.info(f"Swept {deleted} expired idempotency keys")
+
+        return deleted
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        return await to_thread.run_sync(function, *args, limiter=self._limiter)
+
+    def _store_response(self, key: str, response: CachedResponse) -> None:
+        with self.session_factory() as db, db.begin():
+            db.execute(
+                update(IdempotencyRecord)
+                .where(IdempotencyRecord.key == key)
+                .values(
+                    status=IdempotencyStatus.COMPLETED,
+                    response_status=response.status_code,
+                    response_content_type=response.content_type,
+                    response_body=response.body,
+                    expires_at=response.expires_at,
+                )
+            )
+
+    def _delete_reservation(self, key: str) -> None:
+        with self.session_factory() as db, db.begin():
+            db.execute(
+                delete(IdempotencyRecord).where(
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.status == IdempotencyStatus.IN_FLIGHT,
+                )
+            )
+
+    def _reserve_row(
+        self, key: str, request_hash: str
+    ) -> CachedResponse | IdempotencyStatus | None:
+        """
+        Inserts the reservation row of a key.
+
+        Returns:
+            CachedResponse | IdempotencyStatus | None: None if the key was
+            reserved, the stored response if it completed, or IN_FLIGHT if
+            another worker holds it.
+        """
+        now = _now()
+        lease = now + timedelta(seconds=self.lease_seconds)
+
+        with self.session_factory() as db:
+            try:
+                with db.begin():
+                    db.execute(
+                        insert(IdempotencyRecord).values(
+                            key=key,
+                            request_hash=request_hash,
+                            status=IdempotencyStatus.IN_FLIGHT,
+                            expires_at=lease,
+                        )
+                    )
+                return None
+            except IntegrityError:
+                pass
+
+            with db.begin():
+                row = db.execute(
+                    select(IdempotencyRecord).where(IdempotencyRecord.key == key)
+                ).scalar_one_or_none()
+
+                if row is not None and _as_utc(row.expires_at) > now:
+                    if row.status != IdempotencyStatus.COMPLETED:
+                        return IdempotencyStatus.IN_FLIGHT
+
+                    return CachedResponse(
+                        request_hash=row.request_hash,
+                        status_code=row.response_status or 200,
+                        content_type=row.response_content_type,
+                        body=row.response_body or b"",
+                        expires_at=_as_utc(row.expires_at),
+                    )
+
+                # the key expired (or was just released): take it over
+                taken = db.execute(
+                    update(IdempotencyRecord)
+                    .where(
+                        IdempotencyRecord.key == key,
+                        IdempotencyRecord.expires_at <= now,
+                    )
+                    .values(
+                        request_hash=request_hash,
+                        status=IdempotencyStatus.IN_FLIGHT,
+                        response_status=None,
+                        response_content_type=None,
+                        response_body=None,
+                        expires_at=lease,
+                    )
+                ).rowcount
+
+            if taken:
+                return None
+
+            # released in the meantime, or taken over by another worker
+            return IdempotencyStatus.IN_FLIGHT
+
+    def _cached(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            if cached.expires_at <= _now():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return cached
+
+    def _remember(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._cache[key] = response
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    @staticmethod
+    def _check(cached: CachedResponse, request_hash: str) -> CachedResponse:
+        if cached.request_hash != request_hash:
+            raise IdempotencyKeyReusedError(
+                "This Idempotency-Key was already used for a different request"
+            )
+        return cached
@@ -1,26 +1,84 @@
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 
-from app import bill, order, payment, product, user
+from app import analytics, bill, fulfillment, order, payment, product, user
 from app.config import Environments, config
 from app.core.logging import get_logger
+from app.core.tasks import cancel_tasks, run_periodically
+from app.db import SessionLocal
+from app.db.instrumentation import QueryStatsMiddleware
+from app.idempotency import IdempotencyMiddleware, IdempotencyStore
+from app.product.catalog import warm_product_catalog
 
 logger = get_logger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Creating database tables")
     # the db schemas need to be registered
     import app.db.registry as _registry  # noqa: F401
     from app.db import Base, engine
+    from app.db.schema import ensure_schema
+
+    if config.DB_SCHEMA_SYNC_ON_STARTUP:
+        ensure_schema(engine, Base.metadata)
+
+    # indexing the whole catalog takes seconds, searches must not wait for it
+    await asyncio.to_thread(warm_product_catalog)
+
+    background_tasks: list[asyncio.Task] = []
+
+    if engine.dialect.name == "sqlite" and config.SQLITE_MAINTENANCE_INTERVAL > 0:
+        from app.db.sqlite import run_sqlite_maintenance
+
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "sqlite-maintenance",
+                    config.SQLITE_MAINTENANCE_INTERVAL,
+                    lambda: run_sqlite_maintenance(engine),
+                )
+            )
+        )
+
+    if config.IDEMPOTENCY_SWEEP_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "idempotency-sweep",
+                    config.IDEMPOTENCY_SWEEP_INTERVAL,
+                    idempotency_store.sweep,
+                )
+            )
+        )
+
+    # scheduled in every worker, a run is skipped while another one archives
+    if config.ORDER_ARCHIVE_DIR and config.ORDER_ARCHIVE_INTERVAL > 0:
+        from app.order.archive import archive_old_orders
+
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "order-archive",
+                    config.ORDER_ARCHIVE_INTERVAL,
+                    archive_old_orders,
+                )
+            )
+        )
 
-    Base.metadata.create_all(bind=engine)
     yield
 
     logger.info("Shutting down")
 
+    await cancel_tasks(background_tasks)
+
+    from app.db import async_engine
+
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     lifespan=lifespan,
@@ -30,7 +88,43 @@ app = FastAPI(
     redoc_url=None if config.ENVIRONMENT == Environments.PROD else "/redoc",
 )
 
+# per-request statement counts, returned as response headers in dev
+app.add_middleware(
+    QueryStatsMiddleware,
+    emit_headers=config.ENVIRONMENT == Environments.DEV,
+    strict_mode=config.DB_QUERY_STRICT_MODE,
+    repeat_threshold=config.DB_QUERY_REPEAT_THRESHOLD,
+)
+
+# creation requests sent with an Idempotency-Key run at most once
+idempotency_store = IdempotencyStore(
+    session_factory=SessionLocal,
+    ttl_seconds=config.IDEMPOTENCY_TTL_SECONDS,
+    cache_size=config.IDEMPOTENCY_CACHE_SIZE,
+    wait_seconds=config.IDEMPOTENCY_WAIT_SECONDS,
+)
+
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    routes={
+        ("POST", "/v0/orders"),
+        ("POST", "/v0/payments"),
+        ("POST", "/v0/products"),
+    },
+)
+
+if config.DB_READ_REPLICA_URLS:
+    from app.db.routing import ReadYourWritesMiddleware
+
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=config.DB_READ_YOUR_WRITES_SECONDS,
+    )
+
+app.include_router(analytics.router_v0, tags=["analytics"])
 app.include_router(bill.router_v0, tags=["bills"])
+app.include_router(fulfillment.router_v0, tags=["fulfillment"])
 app.include_router(order.router_v0, tags=["orders"])
 app.include_router(payment.router_v0, tags=["payments"])
 app.include_router(product.router_v0, tags=["products"])
@@ -45,6 +139,35 @@ async def health():
     return {"status": "ok"}
 
 
+# the database diagnostics expose SQL text, call sites and pool internals,
+# so they are not served in production
+if config.ENVIRONMENT != Environments.PROD:
+
+    @app.get("/admin/db/pool")
+    async def db_pool():
+        """
+        Connection pool telemetry endpoint
+
+        Reports checked-out connections, checkout wait-time histograms and
+        timeouts for every database engine.
+        """
+        from app.db.pool import pool_status
+
+        return pool_status()
+
+    @app.get("/admin/db/slow-queries")
+    async def db_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+        """
+        Slow query log endpoint
+
+        Lists the most recent statements slower than DB_SLOW_QUERY_MS, newest
+        first, with their parameter types, calling adapter method and query plan.
+        """
+        from app.db.session import slow_query_log
+
+        return [entry.to_dict() for entry in slow_query_log.recent(limit)]
+
+
 @app.get("/info")
 async def info():
     """
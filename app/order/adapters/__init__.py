@@ -1,5 +1,9 @@
+from app.order.adapters.archive import OrderArchiveAdapter
 from app.order.adapters.sql import OrderSqlAdapter
+from app.order.adapters.sql_async import OrderAsyncSqlAdapter
 
 __all__ = [
     "OrderSqlAdapter",
+    "OrderAsyncSqlAdapter",
+    "OrderArchiveAdapter",
 ]
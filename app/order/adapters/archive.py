@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.archive import SegmentStore
+from app.order.domain.models import ArchivedOrder, OrderPublic, OrderVersion
+from app.order.domain.port import OrderLookupPort
+
+
+@dataclass
+class OrderArchiveAdapter(OrderLookupPort):
+    """
+    Read-only adapter for the orders moved to the archive segments.
+
+    Archived orders are closed, so they can only be looked up by ID; the
+    archive is not indexed by user and is only written by `archive_orders`.
+    """
+
+    store: SegmentStore
+
+    def get_archived_order(self, order_id: UUID) -> ArchivedOrder | None:
+        """
+        Reads an archived order together with its payments.
+        """
+        record = self.store.read(order_id)
+        return ArchivedOrder.model_validate_json(record) if record else None
+
+    def get_order_by_id(self, order_id: UUID) -> OrderPublic | None:
+        archived = self.get_archived_order(order_id)
+        return archived.order if archived else None
+
+    def get_order_version(self, order_id: UUID) -> OrderVersion | None:
+        order = self.get_order_by_id(order_id)
+        return (
+            OrderVersion(version=order.version, modified=order.modified)
+            if order
+            else None
+        )
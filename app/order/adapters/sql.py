@@ -1,22 +1,62 @@
 from dataclasses import dataclass
-from datetime import datetime
-from typing import TYPE_CHECKING, Iterable
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 from uuid import UUID as py_UUID
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Select,
+    and_,
+    bindparam,
+    case,
+    delete,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
-from app.core.exceptions import EntityNotFoundError
+from app.analytics.adapters.sql import SalesDeltas
+from app.analytics.domain.models import sales_day
+from app.bill.domain.models import BillPublic
+from app.core.exceptions import (
+    ConflictError,
+    EntityNotFoundError,
+    VersionConflictError,
+)
 from app.db import Base, BaseSchema
+from app.db.bulk import bulk_insert
 from app.order.domain.models import (
+    ArchivedOrder,
     OrderCreate,
+    OrderCursor,
+    OrderExportQuery,
+    OrderExportRow,
     OrderItemPublic,
+    OrderPage,
     OrderPublic,
+    OrderQuery,
+    OrderReorder,
     OrderStatus,
+    OrderTransitionResult,
     OrderUpdateItems,
+    OrderVersion,
+    SkippedOrder,
+    TransitionedOrder,
+    statuses_leading_to,
 )
 from app.order.domain.port import OrderPort
+from app.payment.models import PaymentPublic
+from app.payment.schemas import Payment
 from app.product.adapters.sql import ProductVariant
+from app.user.adapters.sql import User
 
 if TYPE_CHECKING:
     from app.bill.adapters.sql import Bill
@@ -53,6 +93,17 @@ class Order(BaseSchema):
 
     __tablename__ = "orders"
 
+    __table_args__ = (
+        # keyset pagination of a user's orders, newest first
+        Index("ix_orders_user_created", "user_id", "created", "id"),
+        # filtering a user's orders by status
+        Index("ix_orders_user_status", "user_id", "status"),
+        # pick lists over all pending orders, optionally in a date window
+        Index("ix_orders_status_created", "status", "created"),
+        # exports of every order created in a period
+        Index("ix_orders_created", "created", "id"),
+    )
+
     # order status related fields
     status: Mapped[OrderStatus] = mapped_column(
         Enum(OrderStatus, values_callable=lambda enum: [e.value for e in enum]),
@@ -66,6 +117,11 @@ class Order(BaseSchema):
     # refer to the user that placed the order
     user_id: Mapped[py_UUID] = mapped_column(ForeignKey("users.id"))
 
+    # incremented by every change, for optimistic concurrency control
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+
     # tracks which products were ordered, and how many
     items: Mapped[list["OrderItem"]] = relationship()
 
@@ -77,6 +133,59 @@ class Order(BaseSchema):
     )
 
 
+def touch_order(db: Session, order_id: py_UUID, modified: datetime) -> None:
+    """
+    Increments the version of an order whose bill changed, since the bill is
+    part of the order's representation, and so of its ETag and Last-Modified.
+    """
+    db.execute(
+        update(Order.__table__)
+        .where(Order.id == order_id)
+        .values(modified=modified, version=Order.version + 1)
+    )
+
+
+def order_export_statement(query: OrderExportQuery) -> Select:
+    """
+    Builds the statement selecting the OrderExportRow of every line item of
+    the orders matching an export query, with their bills joined in, oldest
+    order first.
+    """
+    # imported here, the bill schema refers back to orders
+    from app.bill.adapters.sql import Bill
+
+    conditions: list[ColumnElement[bool]] = []
+
+    if query.status:
+        conditions.append(Order.status.in_(query.status))
+    if query.created_after is not None:
+        conditions.append(Order.created >= query.created_after)
+    if query.created_before is not None:
+        conditions.append(Order.created < query.created_before)
+
+    return (
+        select(
+            Order.id,
+            Order.created,
+            Order.modified,
+            Order.status,
+            Order.status_timestamp,
+            Order.user_id,
+            Order.version,
+            OrderItem.product_variant_id,
+            OrderItem.quantity,
+            Bill.id,
+            Bill.amount,
+            Bill.currency,
+            Bill.paid,
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .outerjoin(Bill, Bill.order_id == Order.id)
+        .where(*conditions)
+        .order_by(Order.created, Order.id, OrderItem.product_variant_id)
+    )
+
+
 @dataclass
 class OrderSqlAdapter(OrderPort):
     db: Session
@@ -90,8 +199,20 @@ class OrderSqlAdapter(OrderPort):
 
         Returns:
             OrderPublic | None: The OrderPublic object representing the order, or None if the order does not exist.
+            The order is loaded with its items and bill in a fixed number of queries.
+        """
+        orders = self._load_orders(Order.id == order_id)
+        return orders[0] if orders else None
+
+    def get_order_version(self, order_id: py_UUID) -> OrderVersion | None:
+        """
+        Reads the version and modification time of an order with a single
+        query on the orders table.
         """
-        return self.db.get(Order, order_id)
+        row = self.db.execute(
+            select(Order.version, Order.modified).where(Order.id == order_id)
+        ).one_or_none()
+        return OrderVersion(version=row.version, modified=row.modified) if row else None
 
     def get_orders_by_user_id(self, user_id: py_UUID) -> Iterable[OrderPublic]:
         """
@@ -104,38 +225,171 @@ class OrderSqlAdapter(OrderPort):
         Returns:
             Iterator[OrderPublic]: An iterator of OrderPublic objects.
         """
-        return self.db.query(Order).filter(Order.user_id == user_id).all()
+        return self._load_orders(Order.user_id == user_id)
 
-    def _extract_validated_items(
-        self, variants: list[OrderItemPublic]
-    ) -> list[OrderItem]:
+    def get_orders_page(self, user_id: py_UUID, query: OrderQuery) -> OrderPage:
         """
-        Validates and extracts OrderItem objects from a given variant map.
+        Returns one page of the orders made by a user, newest first.
+
+        Pages are found by keyset on (created, id), served by the
+        `ix_orders_user_created` index, so every page costs the same no
+        matter how far into the history it is.
 
         Args:
-            variant_map (dict[UUID, int]): A dictionary mapping product variant IDs to their quantities.
+            user_id (UUID): The ID of the user whose orders are to be retrieved.
+            query (OrderQuery): The filters, page size and cursor of the page.
 
         Returns:
-            list[OrderItem]: A list of OrderItem objects representing the validated items.
+            OrderPage: The orders of the page and the cursor of the next one.
+        """
+        conditions: list[ColumnElement[bool]] = [Order.user_id == user_id]
+
+        if query.status:
+            conditions.append(Order.status.in_(query.status))
+        if query.created_after is not None:
+            conditions.append(Order.created >= query.created_after)
+        if query.created_before is not None:
+            conditions.append(Order.created < query.created_before)
+        if query.cursor is not None:
+            cursor = OrderCursor.decode(query.cursor)
+            conditions.append(
+                tuple_(Order.created, Order.id) < tuple_(cursor.created, cursor.id)
+            )
 
-        Raises:
-            ValueError: If any of the quantities are invalid (i.e. <= 0).
-            EntityNotFoundError: If any of the product variants do not exist.
+        # one extra row tells whether there is a next page
+        orders = self._load_orders(
+            and_(*conditions), newest_first=True, limit=query.limit + 1
+        )
+        page, rest = orders[: query.limit], orders[query.limit :]
+
+        next_cursor = (
+            OrderCursor(created=page[-1].created, id=page[-1].id).encode()
+            if rest
+            else None
+        )
+
+        return OrderPage(items=page, next_cursor=next_cursor)
+
+    def _load_orders(
+        self,
+        condition: ColumnElement[bool],
+        newest_first: bool = False,
+        limit: int | None = None,
+    ) -> list[OrderPublic]:
         """
-        result: list[OrderItem] = []
+        Loads the orders matching a condition together with their items and
+        bills, building OrderPublic models straight from the rows.
 
-        for item in variants:
-            if not self.db.get(ProductVariant, item.product_variant_id):
-                raise EntityNotFoundError("Product variant", item.product_variant_id)
+        Always issues at most three statements (orders, their items and their
+        bills) regardless of how many orders match, instead of lazy loading
+        the `items` and `bill` relationships of every order.
 
-            result.append(
-                OrderItem(
-                    product_variant_id=item.product_variant_id,
-                    quantity=item.quantity,
+        Args:
+            condition (ColumnElement[bool]): The filter applied to the orders table.
+            newest_first (bool): Order by descending (created, id) instead of ascending.
+            limit (int | None): The maximum number of orders to load.
+
+        Returns:
+            list[OrderPublic]: The matching orders.
+        """
+        # imported here, the bill schema refers back to orders
+        from app.bill.adapters.sql import Bill
+
+        order_by = (
+            (Order.created.desc(), Order.id.desc())
+            if newest_first
+            else (Order.created, Order.id)
+        )
+
+        order_rows = self.db.execute(
+            select(
+                Order.id,
+                Order.created,
+                Order.modified,
+                Order.status,
+                Order.status_timestamp,
+                Order.user_id,
+                Order.version,
+            )
+            .where(condition)
+            .order_by(*order_by)
+            .limit(limit)
+        ).all()
+
+        if not order_rows:
+            return []
+
+        order_ids = [row.id for row in order_rows]
+
+        items: dict[py_UUID, list[OrderItemPublic]] = {id: [] for id in order_ids}
+        for row in self.db.execute(
+            select(
+                OrderItem.order_id,
+                OrderItem.product_variant_id,
+                OrderItem.quantity,
+            ).where(OrderItem.order_id.in_(order_ids))
+        ):
+            items[row.order_id].append(
+                OrderItemPublic(
+                    product_variant_id=row.product_variant_id,
+                    quantity=row.quantity,
                 )
             )
 
-        return result
+        bills: dict[py_UUID, BillPublic] = {
+            row.order_id: BillPublic.model_validate(row._asdict())
+            for row in self.db.execute(
+                select(
+                    Bill.id,
+                    Bill.created,
+                    Bill.modified,
+                    Bill.amount,
+                    Bill.currency,
+                    Bill.image_url,
+                    Bill.paid,
+                    Bill.order_id,
+                ).where(Bill.order_id.in_(order_ids))
+            )
+        }
+
+        return [
+            OrderPublic(
+                **row._asdict(),
+                items=items[row.id],
+                bill=bills.get(row.id),
+            )
+            for row in order_rows
+        ]
+
+    @staticmethod
+    def _merge_items(items: list[OrderItemPublic]) -> dict[py_UUID, int]:
+        """
+        Merges the quantities of duplicate product variant IDs.
+
+        Args:
+            items (list[OrderItemPublic]): The items requested for an order.
+
+        Returns:
+            dict[UUID, int]: The total quantity of each product variant, in the
+            order the variants were first requested.
+        """
+        quantities: dict[py_UUID, int] = {}
+
+        for item in items:
+            quantities[item.product_variant_id] = (
+                quantities.get(item.product_variant_id, 0) + item.quantity
+            )
+
+        return quantities
+
+    def _existing_ids(self, column: Any, ids: set[py_UUID]) -> set[py_UUID]:
+        """
+        Returns the subset of `ids` present in an ID column, using one query.
+        """
+        if not ids:
+            return set()
+
+        return set(self.db.scalars(select(column).where(column.in_(ids))))
 
     def create_order(self, request: OrderCreate) -> OrderPublic:
         """
@@ -146,51 +400,546 @@ class OrderSqlAdapter(OrderPort):
 
         Returns:
             OrderPublic: The newly created order with its items.
+
+        Raises:
+            EntityNotFoundError: If the user or any of the product variants do not exist.
         """
+        (result,) = self.create_orders([request])
 
-        new_order = OrderPublic(**request.model_dump())
+        if isinstance(result, EntityNotFoundError):
+            raise result
+
+        return result
+
+    def create_orders(
+        self, requests: list[OrderCreate]
+    ) -> list[OrderPublic | EntityNotFoundError]:
+        """
+        Creates a batch of orders in a single transaction.
+
+        The users and product variants of the whole batch are each checked
+        with one set-based lookup, and the orders and their items are written
+        with multi-row inserts, along with their sales rollups. Orders that
+        refer to a missing user or product variant are skipped without
+        affecting the rest of the batch.
+
+        Args:
+            requests (list[OrderCreate]): The orders to create.
+
+        Returns:
+            list[OrderPublic | EntityNotFoundError]: For each request, in order,
+            the created order or the error explaining why it was skipped.
+        """
+        merged = [self._merge_items(request.items) for request in requests]
+        results: list[OrderPublic | EntityNotFoundError] = []
+        order_rows: list[dict[str, Any]] = []
+        item_rows: list[dict[str, Any]] = []
+        sales = SalesDeltas()
 
         with self.db.begin():
-            db_order = Order(
-                id=new_order.id,
-                created=new_order.created,
-                modified=new_order.modified,
-                status=new_order.status,
-                status_timestamp=new_order.status_timestamp,
-                user_id=new_order.user_id,
+            users = self._existing_ids(
+                User.id, {request.user_id for request in requests}
             )
+            variants = self._existing_ids(
+                ProductVariant.id, {id for items in merged for id in items}
+            )
+
+            for request, quantities in zip(requests, merged):
+                if request.user_id not in users:
+                    results.append(EntityNotFoundError.from_id("User", request.user_id))
+                    continue
+
+                missing = [id for id in quantities if id not in variants]
+                if missing:
+                    results.append(
+                        EntityNotFoundError.from_ids("Product variant", missing)
+                    )
+                    continue
+
+                # duplicate variants were merged during validation
+                new_order = OrderPublic(
+                    **request.model_dump(exclude={"items"}),
+                    items=[
+                        OrderItemPublic(product_variant_id=id, quantity=quantity)
+                        for id, quantity in quantities.items()
+                    ],
+                )
+                results.append(new_order)
+
+                order_rows.append(
+                    {
+                        "id": new_order.id,
+                        "created": new_order.created,
+                        "modified": new_order.modified,
+                        "status": new_order.status,
+                        "status_timestamp": new_order.status_timestamp,
+                        "user_id": new_order.user_id,
+                        "version": new_order.version,
+                    }
+                )
+                item_rows.extend(
+                    {
+                        "order_id": new_order.id,
+                        "product_variant_id": item.product_variant_id,
+                        "quantity": item.quantity,
+                    }
+                    for item in new_order.items
+                )
+
+                day = sales_day(new_order.created)
+                sales.add_customer(
+                    new_order.user_id,
+                    day,
+                    order_count=1,
+                    units=sum(quantities.values()),
+                )
+                for id, quantity in quantities.items():
+                    sales.add_variant(id, day, order_count=1, units=quantity)
+
+            bulk_insert(self.db, Order.__table__, order_rows)
+            bulk_insert(self.db, OrderItem.__table__, item_rows)
+            sales.apply(self.db)
 
-            self.db.add(db_order)
-            # flush here to generate UUID which can be used in public model
-            self.db.flush()
+        return results
+
+    def reorder(self, order_id: py_UUID, request: OrderReorder) -> OrderPublic:
+        """
+        Places a new pending order with the items of a previous order, created
+        at the server's current time.
+
+        The items are copied with a single `INSERT ... SELECT`, which applies
+        the quantity overrides and leaves out variants that no longer exist,
+        so no variant is looked up on its own.
+
+        Args:
+            order_id (UUID): The ID of the order to copy.
+            request (OrderReorder): Quantity overrides of the new order.
 
-            validated_db_items: list[OrderItem] = self._extract_validated_items(
-                request.items
+        Returns:
+            OrderPublic: The new order.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            ConflictError: If none of the order's items can be reordered.
+        """
+        source = OrderItem.__table__
+        overrides = {
+            item.product_variant_id: item.quantity for item in request.overrides
+        }
+        quantity = (
+            case(overrides, value=source.c.product_variant_id, else_=source.c.quantity)
+            if overrides
+            else source.c.quantity
+        )
+
+        with self.db.begin():
+            user_id = self.db.scalar(select(Order.user_id).where(Order.id == order_id))
+
+            if user_id is None:
+                raise EntityNotFoundError.from_id("Order", order_id)
+
+            now = datetime.now(timezone.utc)
+            new_order = OrderPublic(
+                created=now, modified=now, status_timestamp=now, user_id=user_id
+            )
+            self.db.execute(
+                insert(Order.__table__).values(
+                    id=new_order.id,
+                    created=new_order.created,
+                    modified=new_order.modified,
+                    status=new_order.status,
+                    status_timestamp=new_order.status_timestamp,
+                    user_id=new_order.user_id,
+                    version=new_order.version,
+                )
             )
 
-            db_order.items.extend(validated_db_items)
+            copied = self.db.execute(
+                insert(source).from_select(
+                    ["order_id", "product_variant_id", "quantity"],
+                    select(
+                        literal(new_order.id, Order.id.type),
+                        source.c.product_variant_id,
+                        quantity,
+                    )
+                    .join(
+                        ProductVariant,
+                        ProductVariant.id == source.c.product_variant_id,
+                    )
+                    .where(source.c.order_id == order_id, quantity > 0),
+                )
+            ).rowcount
+
+            if not copied:
+                raise ConflictError(
+                    f"None of the items of order with id = '{order_id}' can be reordered"
+                )
+
+            new_order.items = [
+                OrderItemPublic(
+                    product_variant_id=row.product_variant_id, quantity=row.quantity
+                )
+                for row in self.db.execute(
+                    select(source.c.product_variant_id, source.c.quantity).where(
+                        source.c.order_id == new_order.id
+                    )
+                )
+            ]
+
+            sales = SalesDeltas()
+            day = sales_day(new_order.created)
+            sales.add_customer(
+                user_id,
+                day,
+                order_count=1,
+                units=sum(item.quantity for item in new_order.items),
+            )
+            for item in new_order.items:
+                sales.add_variant(
+                    item.product_variant_id, day, order_count=1, units=item.quantity
+                )
+            sales.apply(self.db)
 
         return new_order
 
-    def update_order_items(self, request: OrderUpdateItems) -> OrderPublic:
+    def update_order_items(
+        self, request: OrderUpdateItems, expected_versions: list[int] | None = None
+    ) -> OrderPublic:
         """
         Updates an existing order with the given items.
 
+        Only the difference to the stored items is written: new variants are
+        inserted, changed quantities updated and dropped variants deleted, each
+        with a single bulk statement. The order's `modified` timestamp is set
+        by the server and its version is incremented. The sales rollups are
+        adjusted by the difference in the same transaction.
+
         Args:
             request (OrderUpdateItems): The request model containing the order ID and items to update.
+            expected_versions (list[int] | None): Only update the order if its
+                current version is one of these. None updates any version.
 
         Returns:
             OrderPublic: The updated order with its items.
 
         Raises:
-            EntityNotFoundError: If the order with the given ID does not exist.
+            EntityNotFoundError: If the order with the given ID or any of the
+            product variants do not exist.
+            VersionConflictError: If the order is not at an expected version.
+        """
+        items = OrderItem.__table__
+
+        with self.db.begin():
+            self._bump_version(request.id, expected_versions)
+
+            quantities = self._merge_items(request.items)
+            existing = self._existing_ids(ProductVariant.id, set(quantities))
+            missing = [id for id in quantities if id not in existing]
+
+            if missing:
+                raise EntityNotFoundError.from_ids("Product variant", missing)
+
+            current: dict[py_UUID, int] = {
+                row.product_variant_id: row.quantity
+                for row in self.db.execute(
+                    select(OrderItem.product_variant_id, OrderItem.quantity).where(
+                        OrderItem.order_id == request.id
+                    )
+                )
+            }
+
+            inserts = [
+                {
+                    "order_id": request.id,
+                    "product_variant_id": variant_id,
+                    "quantity": quantity,
+                }
+                for variant_id, quantity in quantities.items()
+                if variant_id not in current
+            ]
+            updates = [
+                {"variant_id": variant_id, "new_quantity": quantity}
+                for variant_id, quantity in quantities.items()
+                if variant_id in current and current[variant_id] != quantity
+            ]
+            deletes = [id for id in current if id not in quantities]
+
+            bulk_insert(self.db, items, inserts)
+
+            if updates:
+                self.db.execute(
+                    update(items)
+                    .where(
+                        items.c.order_id == request.id,
+                        items.c.product_variant_id == bindparam("variant_id"),
+                    )
+                    .values(quantity=bindparam("new_quantity")),
+                    updates,
+                )
+
+            if deletes:
+                self.db.execute(
+                    delete(items).where(
+                        items.c.order_id == request.id,
+                        items.c.product_variant_id.in_(deletes),
+                    )
+                )
+
+            updated_order = self.get_order_by_id(request.id)
+
+            sales = SalesDeltas()
+            day = sales_day(updated_order.created)
+            sales.add_customer(
+                updated_order.user_id,
+                day,
+                units=sum(quantities.values()) - sum(current.values()),
+            )
+            for variant_id, quantity in quantities.items():
+                sales.add_variant(
+                    variant_id,
+                    day,
+                    order_count=0 if variant_id in current else 1,
+                    units=quantity - current.get(variant_id, 0),
+                )
+            for variant_id in deletes:
+                sales.add_variant(
+                    variant_id, day, order_count=-1, units=-current[variant_id]
+                )
+            sales.apply(self.db)
+
+        return updated_order
+
+    def transition_orders(
+        self, order_ids: list[py_UUID], status: OrderStatus
+    ) -> OrderTransitionResult:
+        """
+        Moves orders to a new status with one set-based UPDATE.
+
+        Only orders whose current status may transition to `status` are
+        updated; their status timestamp is set and their version incremented.
+        The other orders are reported as skipped, with the reason.
+
+        Args:
+            order_ids (list[UUID]): The IDs of the orders to transition.
+            status (OrderStatus): The new status.
+
+        Returns:
+            OrderTransitionResult: The transitioned and the skipped orders.
+        """
+        ids = list(dict.fromkeys(order_ids))
+        result = OrderTransitionResult(
+            status=status, status_timestamp=datetime.now(timezone.utc)
+        )
+        sources = statuses_leading_to(status)
+
+        with self.db.begin():
+            if sources:
+                condition = and_(Order.id.in_(ids), Order.status.in_(sources))
+                stmt = (
+                    update(Order.__table__)
+                    .where(condition)
+                    .values(
+                        status=status,
+                        status_timestamp=result.status_timestamp,
+                        modified=result.status_timestamp,
+                        version=Order.version + 1,
+                    )
+                )
+
+                if self.db.get_bind().dialect.update_returning:
+                    rows = self.db.execute(
+                        stmt.returning(Order.id, Order.version)
+                    ).all()
+                else:
+                    # lock the candidates first when UPDATE ... RETURNING is unavailable
+                    candidates = list(
+                        self.db.scalars(
+                            select(Order.id).where(condition).with_for_update()
+                        )
+                    )
+                    self.db.execute(stmt.where(Order.id.in_(candidates)))
+                    rows = self.db.execute(
+                        select(Order.id, Order.version).where(Order.id.in_(candidates))
+                    ).all()
+
+                result.transitioned = [
+                    TransitionedOrder(id=row.id, version=row.version) for row in rows
+                ]
+
+            moved = {order.id for order in result.transitioned}
+            remaining = [id for id in ids if id not in moved]
+
+            current: dict[py_UUID, OrderStatus] = {}
+            if remaining:
+                current = {
+                    row.id: row.status
+                    for row in self.db.execute(
+                        select(Order.id, Order.status).where(Order.id.in_(remaining))
+                    )
+                }
+
+        for id in remaining:
+            if id not in current:
+                result.skipped.append(SkippedOrder(id=id, reason="not_found"))
+            else:
+                result.skipped.append(
+                    SkippedOrder(
+                        id=id,
+                        reason="already_in_status"
+                        if current[id] == status
+                        else "invalid_transition",
+                        current_status=current[id],
+                    )
+                )
+
+        return result
+
+    def export_orders(
+        self, query: OrderExportQuery, batch_size: int
+    ) -> Iterator[list[OrderExportRow]]:
+        """
+        Streams the line items of the matching orders, oldest order first.
+
+        The rows are read through a server-side cursor (`yield_per`), so only
+        one batch is held in memory at a time however large the export is.
+        The session must stay open until the iterator is exhausted.
+
+        Args:
+            query (OrderExportQuery): The filters of the export.
+            batch_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[list[OrderExportRow]]: Batches of rows, read lazily.
+        """
+        result = self.db.execute(
+            order_export_statement(query).execution_options(yield_per=batch_size)
+        )
+
+        with result:
+            for partition in result.partitions():
+                yield [OrderExportRow(*row) for row in partition]
+
+    def get_archivable_orders(
+        self, created_before: datetime, limit: int
+    ) -> list[ArchivedOrder]:
+        """
+        Loads the oldest closed (fulfilled or cancelled) orders created before
+        a cutoff, with their items, bills and payments.
+
+        Args:
+            created_before (datetime): The cutoff on the orders' creation time.
+            limit (int): The maximum number of orders to load.
+
+        Returns:
+            list[ArchivedOrder]: The orders, oldest first.
+        """
+        with self.db.begin():
+            orders = self._load_orders(
+                and_(
+                    Order.status.in_([OrderStatus.FULFILLED, OrderStatus.CANCELLED]),
+                    Order.created < created_before,
+                ),
+                limit=limit,
+            )
+
+            bill_ids = [order.bill.id for order in orders if order.bill is not None]
+            payments: dict[py_UUID, list[PaymentPublic]] = {id: [] for id in bill_ids}
+
+            if bill_ids:
+                for payment in self.db.scalars(
+                    select(Payment).where(Payment.bill_id.in_(bill_ids))
+                ):
+                    payments[payment.bill_id].append(
+                        PaymentPublic.model_validate(payment)
+                    )
+
+        return [
+            ArchivedOrder(
+                order=order,
+                payments=payments[order.bill.id] if order.bill is not None else [],
+            )
+            for order in orders
+        ]
+
+    def delete_archived_orders(self, orders: list[ArchivedOrder]) -> list[py_UUID]:
         """
+        Deletes archived orders with their items, bills and payments.
+
+        Orders changed since they were archived, i.e. no longer at the
+        archived version, are kept.
+
+        Args:
+            orders (list[ArchivedOrder]): The orders that were archived.
+
+        Returns:
+            list[UUID]: The IDs of the deleted orders.
+        """
+        # imported here, the bill schema refers back to orders
+        from app.bill.adapters.sql import Bill
+
+        if not orders:
+            return []
+
         with self.db.begin():
-            db_order: Order | None = self.db.get(Order, request.id)
+            ids = list(
+                self.db.scalars(
+                    select(Order.id).where(
+                        tuple_(Order.id, Order.version).in_(
+                            [
+                                (archived.order.id, archived.order.version)
+                                for archived in orders
+                            ]
+                        )
+                    )
+                )
+            )
+
+            if ids:
+                self.db.execute(
+                    delete(Payment.__table__).where(
+                        Payment.bill_id.in_(
+                            select(Bill.id).where(Bill.order_id.in_(ids))
+                        )
+                    )
+                )
+                self.db.execute(delete(Bill.__table__).where(Bill.order_id.in_(ids)))
+                self.db.execute(
+                    delete(OrderItem.__table__).where(OrderItem.order_id.in_(ids))
+                )
+                self.db.execute(delete(Order.__table__).where(Order.id.in_(ids)))
+
+        return ids
+
+    def _bump_version(
+        self, order_id: py_UUID, expected_versions: list[int] | None
+    ) -> None:
+        """
+        Increments the version of an order and stamps its modification time
+        with a conditional UPDATE, so a concurrent change made since the
+        client read the order is detected without holding a lock.
+
+        Raises:
+            EntityNotFoundError: If the order does not exist.
+            VersionConflictError: If the order is not at an expected version.
+        """
+        stmt = (
+            update(Order.__table__)
+            .where(Order.id == order_id)
+            .values(modified=datetime.now(timezone.utc), version=Order.version + 1)
+        )
+
+        if expected_versions is not None:
+            stmt = stmt.where(Order.version.in_(expected_versions))
+
+        if self.db.execute(stmt).rowcount > 0:
+            return
 
-            if not db_order:
-                raise EntityNotFoundError.from_id("Order", request.id)
+        current = self.db.scalar(select(Order.version).where(Order.id == order_id))
 
-            db_order.items = self._extract_validated_items(request.items)
+        if current is None:
+            raise EntityNotFoundError.from_id("Order", order_id)
 
-        return OrderPublic.model_validate(db_order)
+        raise VersionConflictError(
+            f"Order with id = '{order_id}' is at version {current}, "
+            f"expected one of {expected_versions}"
+        )
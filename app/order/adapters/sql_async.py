@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+from uuid import UUID as py_UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import EntityNotFoundError
+from app.order.adapters.sql import OrderSqlAdapter, order_export_statement
+from app.order.domain.models import (
+    OrderCreate,
+    OrderExportQuery,
+    OrderExportRow,
+    OrderPage,
+    OrderPublic,
+    OrderQuery,
+    OrderReorder,
+    OrderStatus,
+    OrderTransitionResult,
+    OrderUpdateItems,
+    OrderVersion,
+)
+from app.order.domain.port import AsyncOrderPort
+
+
+@dataclass
+class OrderAsyncSqlAdapter(AsyncOrderPort):
+    """
+    asyncio adapter for orders, backed by an AsyncSession.
+
+    Each call runs the OrderSqlAdapter logic through `AsyncSession.run_sync`,
+    which drives the sync ORM code on the event loop (via greenlets) while the
+    asyncio driver performs the I/O. The sync adapter returns public models,
+    so no lazy loads happen after the call returns.
+    """
+
+    db: AsyncSession
+
+    async def get_order_by_id(self, order_id: py_UUID) -> OrderPublic | None:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).get_order_by_id(order_id=order_id)
+        )
+
+    async def get_order_version(self, order_id: py_UUID) -> OrderVersion | None:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).get_order_version(order_id=order_id)
+        )
+
+    async def get_orders_by_user_id(self, user_id: py_UUID) -> list[OrderPublic]:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).get_orders_by_user_id(user_id=user_id)
+        )
+
+    async def get_orders_page(self, user_id: py_UUID, query: OrderQuery) -> OrderPage:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).get_orders_page(user_id=user_id, query=query)
+        )
+
+    async def create_order(self, request: OrderCreate) -> OrderPublic:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).create_order(request=request)
+        )
+
+    async def create_orders(
+        self, requests: list[OrderCreate]
+    ) -> list[OrderPublic | EntityNotFoundError]:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).create_orders(requests=requests)
+        )
+
+    async def reorder(self, order_id: py_UUID, request: OrderReorder) -> OrderPublic:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).reorder(order_id=order_id, request=request)
+        )
+
+    async def transition_orders(
+        self, order_ids: list[py_UUID], status: OrderStatus
+    ) -> OrderTransitionResult:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).transition_orders(
+                order_ids=order_ids, status=status
+            )
+        )
+
+    async def update_order_items(
+        self, request: OrderUpdateItems, expected_versions: list[int] | None = None
+    ) -> OrderPublic:
+        return await self.db.run_sync(
+            lambda db: OrderSqlAdapter(db).update_order_items(
+                request=request, expected_versions=expected_versions
+            )
+        )
+
+    async def export_orders(
+        self, query: OrderExportQuery, batch_size: int
+    ) -> AsyncIterator[list[OrderExportRow]]:
+        # streamed with AsyncSession.stream, a generator cannot cross run_sync
+        result = await self.db.stream(
+            order_export_statement(query).execution_options(yield_per=batch_size)
+        )
+
+        try:
+            async for partition in result.partitions():
+                yield [OrderExportRow(*row) for row in partition]
+        finally:
+            await result.close()
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.archive import SegmentStore
+from app.config import config
+from app.core.logging import get_logger
+from app.db import SessionLocal
+from app.order.adapters import OrderArchiveAdapter, OrderSqlAdapter
+
+logger = get_logger(__name__)
+
+# the archive of closed orders, None when archival is disabled
+order_archive = (
+    SegmentStore(config.ORDER_ARCHIVE_DIR, prefix="orders")
+    if config.ORDER_ARCHIVE_DIR
+    else None
+)
+
+
+def get_order_archive() -> OrderArchiveAdapter | None:
+    """
+    Returns the adapter reading the order archive, or None when archival is
+    disabled
+    """
+    return OrderArchiveAdapter(order_archive) if order_archive else None
+
+
+def archive_orders(
+    db: Session, store: SegmentStore, created_before: datetime, batch_size: int
+) -> int:
+    """
+    Moves closed orders created before a cutoff, with their items, bills and
+    payments, from the database to segments of the archive.
+
+    Each batch is written to its own segment before it is deleted from the
+    database, so an interrupted run never loses orders: at worst they are
+    archived again by the next run, and reads prefer the database anyway.
+
+    Args:
+        db (Session): The session to read and delete the orders with.
+        store (SegmentStore): The archive to write the orders to.
+        created_before (datetime): The cutoff on the orders' creation time.
+        batch_size (int): The number of orders per segment.
+
+    Returns:
+        int: The number of archived orders.
+    """
+    adapter = OrderSqlAdapter(db)
+    archived = 0
+
+    while orders := adapter.get_archivable_orders(created_before, batch_size):
+        store.write_segment(
+            [(order.order.id, order.model_dump_json().encode()) for order in orders]
+        )
+
+        deleted = adapter.delete_archived_orders(orders)
+        archived += len(deleted)
+
+        # orders changed since they were loaded stay, and would be loaded again
+        if len(orders) < batch_size or not deleted:
+            break
+
+    if archived:
+        logger.info(f"Archived {archived} orders created before {created_before}")
+
+    return archived
+
+
+def archive_old_orders() -> int:
+    """
+    Archives the closed orders older than ORDER_ARCHIVE_AFTER_DAYS into the
+    configured archive, as the `dev archive` command and the scheduled job do.
+
+    Every worker schedules the job, so a run is skipped while another process
+    archives into the same directory.
+
+    Returns:
+        int: The number of archived orders, 0 if the run was skipped.
+    """
+    if order_archive is None:
+        raise RuntimeError("ORDER_ARCHIVE_DIR is not configured")
+
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=config.ORDER_ARCHIVE_AFTER_DAYS
+    )
+
+    with order_archive.exclusive() as locked:
+        if not locked:
+            logger.info("Skipping archival, another process is archiving orders")
+            return 0
+
+        with SessionLocal() as db:
+            return archive_orders(
+                db, order_archive, cutoff, batch_size=config.ORDER_ARCHIVE_BATCH_SIZE
+            )
@@ -0,0 +1,84 @@
+from typing import AsyncIterator, Awaitable, Callable
+
+from pydantic import ValidationError
+
+from app.core.exceptions import EntityNotFoundError
+from app.core.ndjson import LineTooLongError, iter_lines
+from app.order.domain.models import OrderCreate, OrderImportResult, OrderPublic
+
+# creates a batch of orders, e.g. OrderService.create_orders run in a threadpool
+BatchCreator = Callable[
+    [list[OrderCreate]], Awaitable[list[OrderPublic | EntityNotFoundError]]
+]
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'line'}: {detail['msg']}"
+        for detail in error.errors(include_url=False)
+    )
+
+
+async def import_orders(
+    body: AsyncIterator[bytes],
+    create_orders: BatchCreator,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """
+    Imports orders from an NDJSON body, one OrderCreate per line.
+
+    Lines are validated as they arrive and handed to `create_orders` in
+    batches of `batch_size`, so each batch is written in its own transaction
+    and its results are streamed back before the next one is read. Blank
+    lines are ignored.
+
+    Args:
+        body (AsyncIterator[bytes]): The streamed request body.
+        create_orders (BatchCreator): Creates one batch of orders.
+        batch_size (int): The number of lines per batch.
+
+    Yields:
+        bytes: One NDJSON OrderImportResult per non-blank line, in input order.
+    """
+    line_number = 0
+    # (line number, validated request or the reason it is invalid)
+    batch: list[tuple[int, OrderCreate | str]] = []
+
+    async def flush() -> AsyncIterator[bytes]:
+        valid = [request for _, request in batch if isinstance(request, OrderCreate)]
+        created = iter(await create_orders(valid) if valid else [])
+
+        for number, request in batch:
+            outcome = next(created) if isinstance(request, OrderCreate) else request
+
+            if isinstance(outcome, OrderPublic):
+                result = OrderImportResult(line=number, status="created", id=outcome.id)
+            else:
+                result = OrderImportResult(
+                    line=number, status="failed", error=str(outcome)
+                )
+
+            yield result.model_dump_json(exclude_none=True).encode() + b"\n"
+
+        batch.clear()
+
+    try:
+        async for line in iter_lines(body):
+            line_number += 1
+
+            if not line.strip():
+                continue
+
+            try:
+                batch.append((line_number, OrderCreate.model_validate_json(line)))
+            except ValidationError as e:
+                batch.append((line_number, _validation_message(e)))
+
+            if len(batch) >= batch_size:
+                async for result in flush():
+                    yield result
+    except LineTooLongError as e:
+        batch.append((line_number + 1, str(e)))
+
+    async for result in flush():
+        yield result
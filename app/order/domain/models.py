@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
 from datetime import datetime, timezone
 from enum import Enum
+from typing import Literal, NamedTuple
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.bill.domain.models import BillPublic
 from app.core.models import Identifiable, TimeStamped
+from app.payment.models import PaymentPublic
 
 
 class OrderStatus(str, Enum):
@@ -16,10 +20,31 @@ class OrderStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# the statuses an order may move to from each status
+ORDER_STATUS_TRANSITIONS: dict[OrderStatus, set[OrderStatus]] = {
+    OrderStatus.PENDING: {OrderStatus.FULFILLED, OrderStatus.CANCELLED},
+    OrderStatus.FULFILLED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+
+def statuses_leading_to(status: OrderStatus) -> set[OrderStatus]:
+    """
+    Returns the statuses from which an order may move to `status`.
+    """
+    return {
+        source
+        for source, targets in ORDER_STATUS_TRANSITIONS.items()
+        if status in targets
+    }
+
+
 class OrderItemPublic(BaseModel):
     product_variant_id: UUID
     quantity: int = Field(gt=0)
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class OrderBase(BaseModel):
     """
@@ -50,12 +75,219 @@ class OrderPublic(OrderCreate, Identifiable):
 
     bill: BillPublic | None = None
 
+    # incremented by every change, returned as the ETag of the order
+    version: int = 1
+
     model_config = ConfigDict(from_attributes=True)
 
 
-class OrderUpdateItems(TimeStamped, Identifiable):
+class OrderItemOverride(BaseModel):
+    product_variant_id: UUID
+    # 0 leaves the item out of the new order
+    quantity: int = Field(ge=0)
+
+
+class OrderReorder(BaseModel):
+    """
+    Request to place a new order with the items of a previous one, timestamped
+    by the server
+    """
+
+    # quantities replacing those of the previous order's items; variants that
+    # were not in the previous order are ignored
+    overrides: list[OrderItemOverride] = Field(default_factory=list)
+
+
+class ArchivedOrder(BaseModel):
+    """
+    A closed order moved to the archive, with the payments of its bill
+    """
+
+    order: OrderPublic
+    payments: list[PaymentPublic] = Field(default_factory=list)
+
+
+class OrderUpdateItems(Identifiable):
     """
-    Model to update an existing order's items
+    Model to update an existing order's items; the server timestamps the
+    change
     """
 
     items: list[OrderItemPublic] = Field(default_factory=list)
+
+
+def as_utc(value: datetime) -> datetime:
+    # naive datetimes are taken as utc, like the timestamps sqlite returns
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class OrderVersion(BaseModel):
+    """
+    Validators of an order, read without loading it, for conditional requests
+    """
+
+    version: int
+    modified: datetime
+
+    @field_validator("modified")
+    @classmethod
+    def ensure_utc(cls, v: datetime) -> datetime:
+        return as_utc(v)
+
+
+class OrderCursor(BaseModel):
+    """
+    Position of the last order of a page, in newest first (created, id) order
+    """
+
+    created: datetime
+    id: UUID
+
+    @field_validator("created")
+    @classmethod
+    def ensure_utc(cls, v: datetime) -> datetime:
+        return as_utc(v)
+
+    def encode(self) -> str:
+        """
+        Encodes the cursor into an opaque, url-safe token.
+        """
+        raw = f"{self.created.isoformat()}|{self.id}"
+        return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> OrderCursor:
+        """
+        Decodes a token created by `encode`.
+
+        Raises:
+            ValueError: If the token is not a valid cursor.
+        """
+        try:
+            raw = urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            created, id = raw.split("|")
+            return cls(created=datetime.fromisoformat(created), id=UUID(id))
+        except (Base64Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+
+class OrderQuery(BaseModel):
+    """
+    Filters and page position for listing a user's orders
+    """
+
+    status: list[OrderStatus] | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: str | None = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def ensure_utc(cls, v: datetime | None) -> datetime | None:
+        return as_utc(v) if v is not None else None
+
+    @field_validator("cursor")
+    @classmethod
+    def ensure_valid_cursor(cls, v: str | None) -> str | None:
+        if v is not None:
+            OrderCursor.decode(v)
+        return v
+
+
+class OrderPage(BaseModel):
+    """
+    A page of orders, newest first. `next_cursor` is None on the last page.
+    """
+
+    items: list[OrderPublic]
+    next_cursor: str | None = None
+
+
+class OrderExportQuery(BaseModel):
+    """
+    Filters and format of an order export
+    """
+
+    format: Literal["csv", "ndjson"] = "csv"
+    status: list[OrderStatus] | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def ensure_utc(cls, v: datetime | None) -> datetime | None:
+        return as_utc(v) if v is not None else None
+
+
+class OrderExportRow(NamedTuple):
+    """
+    One line item of an exported order with the order's bill. Orders without
+    items are exported as a single row without item columns.
+    """
+
+    order_id: UUID
+    created: datetime
+    modified: datetime
+    status: OrderStatus
+    status_timestamp: datetime
+    user_id: UUID
+    version: int
+    product_variant_id: UUID | None
+    quantity: int | None
+    bill_id: UUID | None
+    bill_amount: float | None
+    bill_currency: str | None
+    bill_paid: bool | None
+
+
+class OrderImportResult(BaseModel):
+    """
+    Outcome of one line of a bulk order import
+    """
+
+    line: int
+    status: Literal["created", "failed"]
+    id: UUID | None = None
+    error: str | None = None
+
+
+class OrderStatusChange(BaseModel):
+    """
+    Request to move an order to a new status
+    """
+
+    status: OrderStatus
+
+
+class OrderBulkStatusChange(OrderStatusChange):
+    """
+    Request to move several orders to a new status at once
+    """
+
+    order_ids: list[UUID] = Field(min_length=1, max_length=1000)
+
+
+class TransitionedOrder(BaseModel):
+    id: UUID
+    version: int
+
+
+class SkippedOrder(BaseModel):
+    id: UUID
+    reason: Literal["not_found", "already_in_status", "invalid_transition"]
+    # the status of the order, if it exists
+    current_status: OrderStatus | None = None
+
+
+class OrderTransitionResult(BaseModel):
+    """
+    Outcome of a status change: the orders that moved and the ones skipped
+    """
+
+    status: OrderStatus
+    status_timestamp: datetime
+    transitioned: list[TransitionedOrder] = Field(default_factory=list)
+    skipped: list[SkippedOrder] = Field(default_factory=list)
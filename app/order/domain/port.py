@@ -1,10 +1,28 @@
-from typing import Iterable, Protocol
+from typing import AsyncIterator, Iterable, Iterator, Protocol
 from uuid import UUID
 
-from app.order.domain.models import OrderCreate, OrderPublic, OrderUpdateItems
+from app.core.exceptions import EntityNotFoundError
+from app.order.domain.models import (
+    OrderCreate,
+    OrderExportQuery,
+    OrderExportRow,
+    OrderPage,
+    OrderPublic,
+    OrderQuery,
+    OrderReorder,
+    OrderStatus,
+    OrderTransitionResult,
+    OrderUpdateItems,
+    OrderVersion,
+)
 
 
-class OrderPort(Protocol):
+class OrderLookupPort(Protocol):
+    """
+    Reads single orders by ID, all that is needed from read-only stores
+    such as the archive
+    """
+
     def get_order_by_id(self, order_id: UUID) -> OrderPublic | None:
         """
         Retrieves an order by its ID.
@@ -17,6 +35,21 @@ class OrderPort(Protocol):
         """
         ...
 
+    def get_order_version(self, order_id: UUID) -> OrderVersion | None:
+        """
+        Reads the version and modification time of an order without loading
+        its items and bill.
+
+        Args:
+            order_id (UUID): The ID of the order.
+
+        Returns:
+            OrderVersion | None: The validators of the order, or None if the order does not exist.
+        """
+        ...
+
+
+class OrderPort(OrderLookupPort, Protocol):
     def get_orders_by_user_id(self, user_id: UUID) -> Iterable[OrderPublic]:
         """
         Returns an iterator of OrderPublic objects that represent the orders
@@ -30,6 +63,19 @@ class OrderPort(Protocol):
         """
         ...
 
+    def get_orders_page(self, user_id: UUID, query: OrderQuery) -> OrderPage:
+        """
+        Returns one page of the orders made by a user, newest first.
+
+        Args:
+            user_id (UUID): The ID of the user whose orders are to be retrieved.
+            query (OrderQuery): The filters, page size and cursor of the page.
+
+        Returns:
+            OrderPage: The orders of the page and the cursor of the next one.
+        """
+        ...
+
     def create_order(self, request: OrderCreate) -> OrderPublic:
         """
         Creates a new order with the given items.
@@ -42,17 +88,218 @@ class OrderPort(Protocol):
         """
         ...
 
-    def update_order_items(self, request: OrderUpdateItems) -> OrderPublic:
+    def create_orders(
+        self, requests: list[OrderCreate]
+    ) -> list[OrderPublic | EntityNotFoundError]:
+        """
+        Creates a batch of orders in a single transaction.
+
+        Orders that refer to a missing user or product variant are skipped
+        without affecting the rest of the batch.
+
+        Args:
+            requests (list[OrderCreate]): The orders to create.
+
+        Returns:
+            list[OrderPublic | EntityNotFoundError]: For each request, in order,
+            the created order or the error explaining why it was skipped.
+        """
+        ...
+
+    def reorder(self, order_id: UUID, request: OrderReorder) -> OrderPublic:
+        """
+        Places a new pending order with the items of a previous order.
+
+        Args:
+            order_id (UUID): The ID of the order to copy.
+            request (OrderReorder): Quantity overrides of the new order.
+
+        Returns:
+            OrderPublic: The new order.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            ConflictError: If none of the order's items can be reordered.
+        """
+        ...
+
+    def transition_orders(
+        self, order_ids: list[UUID], status: OrderStatus
+    ) -> OrderTransitionResult:
+        """
+        Moves orders to a new status with one set-based update.
+
+        Args:
+            order_ids (list[UUID]): The IDs of the orders to transition.
+            status (OrderStatus): The new status.
+
+        Returns:
+            OrderTransitionResult: The transitioned orders and the skipped ones,
+            with the reason each was skipped.
+        """
+        ...
+
+    def update_order_items(
+        self, request: OrderUpdateItems, expected_versions: list[int] | None = None
+    ) -> OrderPublic:
+        """
+        Updates an existing order with the given items.
+
+        Args:
+            request (OrderUpdateItems): The request model containing the order ID and items to update.
+            expected_versions (list[int] | None): Only update the order if its
+                current version is one of these. None updates any version.
+
+        Returns:
+            OrderPublic: The updated order with its items.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            VersionConflictError: If the order is not at an expected version.
+        """
+        ...
+
+    def export_orders(
+        self, query: OrderExportQuery, batch_size: int
+    ) -> Iterator[list[OrderExportRow]]:
+        """
+        Streams the line items of the matching orders, oldest order first.
+
+        Args:
+            query (OrderExportQuery): The filters of the export.
+            batch_size (int): The number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator[list[OrderExportRow]]: Batches of rows, read lazily.
+        """
+        ...
+
+
+class AsyncOrderPort(Protocol):
+    """
+    asyncio counterpart of the OrderPort, used by the native async request path
+    """
+
+    async def get_order_by_id(self, order_id: UUID) -> OrderPublic | None:
+        """
+        Retrieves an order by its ID.
+
+        Args:
+            order_id (UUID): The ID of the order to be retrieved.
+
+        Returns:
+            OrderPublic | None: The OrderPublic object representing the order, or None if the order does not exist.
+        """
+        ...
+
+    async def get_order_version(self, order_id: UUID) -> OrderVersion | None:
+        """
+        Reads the version and modification time of an order without loading
+        its items and bill.
+        """
+        ...
+
+    async def get_orders_by_user_id(self, user_id: UUID) -> list[OrderPublic]:
+        """
+        Returns the orders made by the user with the given user_id.
+
+        Args:
+            user_id (UUID): The ID of the user whose orders are to be retrieved.
+
+        Returns:
+            list[OrderPublic]: A list of OrderPublic objects.
+        """
+        ...
+
+    async def get_orders_page(self, user_id: UUID, query: OrderQuery) -> OrderPage:
+        """
+        Returns one page of the orders made by a user, newest first.
+
+        Args:
+            user_id (UUID): The ID of the user whose orders are to be retrieved.
+            query (OrderQuery): The filters, page size and cursor of the page.
+
+        Returns:
+            OrderPage: The orders of the page and the cursor of the next one.
+        """
+        ...
+
+    async def create_order(self, request: OrderCreate) -> OrderPublic:
+        """
+        Creates a new order with the given items.
+
+        Args:
+            request (OrderCreate): The request model containing the user ID and items to add to the order.
+
+        Returns:
+            OrderPublic: The newly created order with its items.
+        """
+        ...
+
+    async def create_orders(
+        self, requests: list[OrderCreate]
+    ) -> list[OrderPublic | EntityNotFoundError]:
+        """
+        Creates a batch of orders in a single transaction.
+
+        Orders that refer to a missing user or product variant are skipped
+        without affecting the rest of the batch.
+
+        Args:
+            requests (list[OrderCreate]): The orders to create.
+
+        Returns:
+            list[OrderPublic | EntityNotFoundError]: For each request, in order,
+            the created order or the error explaining why it was skipped.
+        """
+        ...
+
+    async def reorder(self, order_id: UUID, request: OrderReorder) -> OrderPublic:
+        """
+        Places a new pending order with the items of a previous order.
+        """
+        ...
+
+    async def transition_orders(
+        self, order_ids: list[UUID], status: OrderStatus
+    ) -> OrderTransitionResult:
+        """
+        Moves orders to a new status with one set-based update.
+
+        Args:
+            order_ids (list[UUID]): The IDs of the orders to transition.
+            status (OrderStatus): The new status.
+
+        Returns:
+            OrderTransitionResult: The transitioned orders and the skipped ones,
+            with the reason each was skipped.
+        """
+        ...
+
+    async def update_order_items(
+        self, request: OrderUpdateItems, expected_versions: list[int] | None = None
+    ) -> OrderPublic:
         """
         Updates an existing order with the given items.
 
         Args:
             request (OrderUpdateItems): The request model containing the order ID and items to update.
+            expected_versions (list[int] | None): Only update the order if its
+                current version is one of these. None updates any version.
 
         Returns:
             OrderPublic: The updated order with its items.
 
         Raises:
             EntityNotFoundError: If the order with the given ID does not exist.
+            VersionConflictError: If the order is not at an expected version.
+        """
+        ...
+
+    def export_orders(
+        self, query: OrderExportQuery, batch_size: int
+    ) -> AsyncIterator[list[OrderExportRow]]:
+        """
+        Streams the line items of the matching orders, oldest order first.
         """
         ...
@@ -0,0 +1,71 @@
+import csv
+from datetime import datetime
+from enum import Enum
+from io import StringIO
+from typing import Any, AsyncIterator, Literal
+
+import orjson
+
+from app.core.ndjson import NDJSON_MEDIA_TYPE
+from app.order.domain.models import OrderExportRow
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": NDJSON_MEDIA_TYPE,
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _encode(batch: list[OrderExportRow], format: ExportFormat) -> bytes:
+    """
+    Encodes a batch of rows as CSV lines or NDJSON objects.
+    """
+    if format == "ndjson":
+        return b"".join(orjson.dumps(row._asdict()) + b"\n" for row in batch)
+
+    buffer = StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in row] for row in batch)
+    return buffer.getvalue().encode()
+
+
+def _header(format: ExportFormat) -> bytes:
+    if format == "ndjson":
+        return b""
+
+    buffer = StringIO()
+    csv.writer(buffer).writerow(OrderExportRow._fields)
+    return buffer.getvalue().encode()
+
+
+async def export_chunks(
+    batches: AsyncIterator[list[OrderExportRow]], format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """
+    Encodes batches of exported rows as they are read, one chunk per batch,
+    so the export is streamed in constant memory.
+
+    Args:
+        batches (AsyncIterator[list[OrderExportRow]]): The rows, e.g. from `AsyncOrderService.export_orders`.
+        format (ExportFormat): CSV with a header line, or NDJSON.
+
+    Yields:
+        bytes: The header, then the encoded rows of each batch.
+    """
+    if header := _header(format):
+        yield header
+
+    async for batch in batches:
+        yield _encode(batch, format)
@@ -1,10 +1,44 @@
+import asyncio
 from dataclasses import dataclass
-from typing import Iterable
+from typing import AsyncIterator, Iterable, Iterator
 from uuid import UUID
 
+from app.core.exceptions import ConflictError, EntityNotFoundError
 from app.core.service import BaseService
-from app.order.domain.models import OrderCreate, OrderPublic, OrderUpdateItems
-from app.order.domain.port import OrderPort
+from app.order.domain.models import (
+    OrderCreate,
+    OrderExportQuery,
+    OrderExportRow,
+    OrderPage,
+    OrderPublic,
+    OrderQuery,
+    OrderReorder,
+    OrderStatus,
+    OrderTransitionResult,
+    OrderUpdateItems,
+    OrderVersion,
+)
+from app.order.domain.port import AsyncOrderPort, OrderLookupPort, OrderPort
+
+
+def check_transition(order_id: UUID, result: OrderTransitionResult) -> None:
+    """
+    Raises the error explaining why a single order was not transitioned.
+    An order that already is in the requested status is not an error.
+
+    Raises:
+        EntityNotFoundError: If the order does not exist.
+        ConflictError: If the order cannot move to the requested status.
+    """
+    for skipped in result.skipped:
+        if skipped.reason == "not_found":
+            raise EntityNotFoundError.from_id("Order", order_id)
+
+        if skipped.reason == "invalid_transition":
+            raise ConflictError(
+                f"Order with id = '{order_id}' cannot move from "
+                f"'{skipped.current_status.value}' to '{result.status.value}'"
+            )
 
 
 @dataclass
@@ -15,13 +49,19 @@ class OrderService(BaseService):
 
     port: OrderPort
 
+    # where orders missing from the port are looked up, e.g. the archive
+    archive: OrderLookupPort | None = None
+
     @classmethod
-    def instance(cls, port: OrderPort) -> "OrderService":
-        return cls(port=port)
+    def instance(
+        cls, port: OrderPort, archive: OrderLookupPort | None = None
+    ) -> "OrderService":
+        return cls(port=port, archive=archive)
 
     def get_order_by_id(self, order_id: UUID) -> OrderPublic | None:
         """
-        Retrieves an order by its ID.
+        Retrieves an order by its ID, falling back to the archive for orders
+        that are no longer in the port.
 
         Args:
             order_id (UUID): The ID of the order to be retrieved.
@@ -29,7 +69,30 @@ class OrderService(BaseService):
         Returns:
             OrderPublic | None: The OrderPublic object representing the order, or None if the order does not exist.
         """
-        return self.port.get_order_by_id(order_id=order_id)
+        order = self.port.get_order_by_id(order_id=order_id)
+
+        if order is None and self.archive is not None:
+            order = self.archive.get_order_by_id(order_id=order_id)
+
+        return order
+
+    def get_order_version(self, order_id: UUID) -> OrderVersion | None:
+        """
+        Reads the validators of an order without loading it, falling back to
+        the archive like `get_order_by_id`.
+
+        Args:
+            order_id (UUID): The ID of the order.
+
+        Returns:
+            OrderVersion | None: The version and modification time of the order, or None if the order does not exist.
+        """
+        version = self.port.get_order_version(order_id=order_id)
+
+        if version is None and self.archive is not None:
+            version = self.archive.get_order_version(order_id=order_id)
+
+        return version
 
     def get_orders_by_user_id(self, user_id: UUID) -> Iterable[OrderPublic]:
         """
@@ -44,6 +107,19 @@ class OrderService(BaseService):
         """
         return self.port.get_orders_by_user_id(user_id=user_id)
 
+    def get_orders_page(self, user_id: UUID, query: OrderQuery) -> OrderPage:
+        """
+        Returns one page of the orders made by a user, newest first.
+
+        Args:
+            user_id (UUID): The ID of the user whose orders are to be retrieved.
+            query (OrderQuery): The filters, page size and cursor of the page.
+
+        Returns:
+            OrderPage: The orders of the page and the cursor of the next one.
+        """
+        return self.port.get_orders_page(user_id=user_id, query=query)
+
     def create_order(self, request: OrderCreate) -> OrderPublic:
         """
         Creates a new order with the given items.
@@ -57,17 +133,226 @@ class OrderService(BaseService):
 
         return self.port.create_order(request=request)
 
-    def update_order_items(self, request: OrderUpdateItems) -> OrderPublic:
+    def create_orders(
+        self, requests: list[OrderCreate]
+    ) -> list[OrderPublic | EntityNotFoundError]:
+        """
+        Creates a batch of orders in a single transaction.
+
+        Orders that refer to a missing user or product variant are skipped
+        without affecting the rest of the batch.
+
+        Args:
+            requests (list[OrderCreate]): The orders to create.
+
+        Returns:
+            list[OrderPublic | EntityNotFoundError]: For each request, in order,
+            the created order or the error explaining why it was skipped.
+        """
+        return self.port.create_orders(requests=requests)
+
+    def reorder(self, order_id: UUID, request: OrderReorder) -> OrderPublic:
+        """
+        Places a new pending order with the items of a previous order.
+
+        Args:
+            order_id (UUID): The ID of the order to copy.
+            request (OrderReorder): Quantity overrides of the new order.
+
+        Returns:
+            OrderPublic: The new order.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            ConflictError: If none of the order's items can be reordered.
+        """
+        return self.port.reorder(order_id=order_id, request=request)
+
+    def transition_orders(
+        self, order_ids: list[UUID], status: OrderStatus
+    ) -> OrderTransitionResult:
+        """
+        Moves orders to a new status with one set-based update.
+
+        Args:
+            order_ids (list[UUID]): The IDs of the orders to transition.
+            status (OrderStatus): The new status.
+
+        Returns:
+            OrderTransitionResult: The transitioned orders and the skipped ones,
+            with the reason each was skipped.
+        """
+        return self.port.transition_orders(order_ids=order_ids, status=status)
+
+    def export_orders(
+        self, query: OrderExportQuery, batch_size: int
+    ) -> Iterator[list[OrderExportRow]]:
+        """
+        Streams the line items of the matching orders in batches, oldest
+        order first.
+        """
+        yield from self.port.export_orders(query=query, batch_size=batch_size)
+
+    def transition_order(self, order_id: UUID, status: OrderStatus) -> OrderPublic:
+        """
+        Moves a single order to a new status.
+
+        Args:
+            order_id (UUID): The ID of the order to transition.
+            status (OrderStatus): The new status.
+
+        Returns:
+            OrderPublic: The order in its new status.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            ConflictError: If the order cannot move to the status from its current one.
+        """
+        result = self.port.transition_orders(order_ids=[order_id], status=status)
+        check_transition(order_id, result)
+
+        return self.port.get_order_by_id(order_id=order_id)
+
+    def update_order_items(
+        self, request: OrderUpdateItems, expected_versions: list[int] | None = None
+    ) -> OrderPublic:
         """
         Updates an existing order with the given items.
 
         Args:
             request (OrderUpdateItems): The request model containing the order ID and items to update.
+            expected_versions (list[int] | None): Only update the order if its
+                current version is one of these. None updates any version.
 
         Returns:
             OrderPublic: The updated order with its items.
 
         Raises:
             EntityNotFoundError: If the order with the given ID does not exist.
+            VersionConflictError: If the order is not at an expected version.
+        """
+        return self.port.update_order_items(
+            request=request, expected_versions=expected_versions
+        )
+
+
+@dataclass
+class AsyncOrderService:
+    """
+    asyncio service for handling orders
+    """
+
+    port: AsyncOrderPort
+
+    # where orders missing from the port are looked up, e.g. the archive;
+    # its blocking reads run in a worker thread
+    archive: OrderLookupPort | None = None
+
+    @classmethod
+    def instance(
+        cls, port: AsyncOrderPort, archive: OrderLookupPort | None = None
+    ) -> "AsyncOrderService":
+        return cls(port=port, archive=archive)
+
+    async def get_order_by_id(self, order_id: UUID) -> OrderPublic | None:
+        """
+        Retrieves an order by its ID, falling back to the archive for orders
+        that are no longer in the port.
+        """
+        order = await self.port.get_order_by_id(order_id=order_id)
+
+        if order is None and self.archive is not None:
+            order = await asyncio.to_thread(self.archive.get_order_by_id, order_id)
+
+        return order
+
+    async def get_order_version(self, order_id: UUID) -> OrderVersion | None:
+        """
+        Reads the validators of an order without loading it, falling back to
+        the archive like `get_order_by_id`.
+        """
+        version = await self.port.get_order_version(order_id=order_id)
+
+        if version is None and self.archive is not None:
+            version = await asyncio.to_thread(self.archive.get_order_version, order_id)
+
+        return version
+
+    async def get_orders_by_user_id(self, user_id: UUID) -> list[OrderPublic]:
+        """
+        Returns the orders made by the user with the given user_id.
+        """
+        return await self.port.get_orders_by_user_id(user_id=user_id)
+
+    async def get_orders_page(self, user_id: UUID, query: OrderQuery) -> OrderPage:
+        """
+        Returns one page of the orders made by a user, newest first.
+        """
+        return await self.port.get_orders_page(user_id=user_id, query=query)
+
+    async def create_order(self, request: OrderCreate) -> OrderPublic:
+        """
+        Creates a new order with the given items.
+        """
+        return await self.port.create_order(request=request)
+
+    async def create_orders(
+        self, requests: list[OrderCreate]
+    ) -> list[OrderPublic | EntityNotFoundError]:
+        """
+        Creates a batch of orders in a single transaction, skipping the ones
+        that refer to a missing user or product variant.
+        """
+        return await self.port.create_orders(requests=requests)
+
+    async def reorder(self, order_id: UUID, request: OrderReorder) -> OrderPublic:
+        """
+        Places a new pending order with the items of a previous order.
+        """
+        return await self.port.reorder(order_id=order_id, request=request)
+
+    async def transition_orders(
+        self, order_ids: list[UUID], status: OrderStatus
+    ) -> OrderTransitionResult:
+        """
+        Moves orders to a new status with one set-based update.
+        """
+        return await self.port.transition_orders(order_ids=order_ids, status=status)
+
+    def export_orders(
+        self, query: OrderExportQuery, batch_size: int
+    ) -> AsyncIterator[list[OrderExportRow]]:
+        """
+        Streams the line items of the matching orders in batches, oldest
+        order first.
+        """
+        return self.port.export_orders(query=query, batch_size=batch_size)
+
+    async def transition_order(
+        self, order_id: UUID, status: OrderStatus
+    ) -> OrderPublic:
+        """
+        Moves a single order to a new status.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            ConflictError: If the order cannot move to the status from its current one.
+        """
+        result = await self.port.transition_orders(order_ids=[order_id], status=status)
+        check_transition(order_id, result)
+
+        return await self.port.get_order_by_id(order_id=order_id)
+
+    async def update_order_items(
+        self, request: OrderUpdateItems, expected_versions: list[int] | None = None
+    ) -> OrderPublic:
+        """
+        Updates an existing order with the given items.
+
+        Raises:
+            EntityNotFoundError: If the order with the given ID does not exist.
+            VersionConflictError: If the order is not at an expected version.
         """
-        return self.port.update_order_items(request=request)
+        return await self.port.update_order_items(
+            request=request, expected_versions=expected_versions
+        )
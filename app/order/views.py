@@ -1,26 +1,106 @@
-from typing import Iterator
+from typing import Annotated, AsyncIterator, Iterator, cast
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Request, Response, status
 from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.responses import StreamingResponse
 
-from app.db import get_db
-from app.order.adapters import OrderSqlAdapter
-from app.order.domain.models import OrderCreate, OrderPublic, OrderUpdateItems
-from app.order.service import OrderService
+from app.config import config
+from app.core.etags import (
+    format_etag,
+    is_not_modified,
+    parse_version_etags,
+    validator_headers,
+)
+from app.core.exceptions import (
+    ConflictError,
+    EntityNotFoundError,
+    VersionConflictError,
+)
+from app.core.ndjson import NDJSONStreamingResponse
+from app.core.service import ThreadedService
+from app.db import get_async_db, get_async_read_db, get_db, get_read_db
+from app.order.adapters import (
+    OrderArchiveAdapter,
+    OrderAsyncSqlAdapter,
+    OrderSqlAdapter,
+)
+from app.order.archive import get_order_archive
+from app.order.bulk import import_orders
+from app.order.domain.models import (
+    OrderBulkStatusChange,
+    OrderCreate,
+    OrderExportQuery,
+    OrderPage,
+    OrderPublic,
+    OrderQuery,
+    OrderReorder,
+    OrderStatusChange,
+    OrderTransitionResult,
+    OrderUpdateItems,
+)
+from app.order.export import EXPORT_MEDIA_TYPES, export_chunks
+from app.order.service import AsyncOrderService, OrderService
 
 router_v0 = APIRouter(prefix="/v0")
 
 
-def get_order_service(db: Session = Depends(get_db)) -> Iterator:
+def get_sync_order_service(
+    db: Session = Depends(get_db),
+) -> Iterator[AsyncOrderService]:
+    """
+    Returns an OrderService bound to a blocking database session, whose
+    methods run in the threadpool.
+    """
+    service = OrderService.instance(port=OrderSqlAdapter(db))
+    yield cast(AsyncOrderService, ThreadedService(service))
+
+
+def get_sync_order_read_service(
+    db: Session = Depends(get_read_db),
+    archive: OrderArchiveAdapter | None = Depends(get_order_archive),
+) -> Iterator[AsyncOrderService]:
     """
-    Returns an instance of OrderService that can be used to interact with the database.
+    Returns an OrderService for read-only operations, whose methods run in
+    the threadpool.
 
-    The OrderService instance is used to encapsulate database operations
-    related to orders.
+    The service is bound to a read replica session when replicas are configured,
+    and looks up orders missing from the database in the archive.
+    """
+    service = OrderService.instance(port=OrderSqlAdapter(db), archive=archive)
+    yield cast(AsyncOrderService, ThreadedService(service))
+
+
+async def get_async_order_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncIterator[AsyncOrderService]:
+    """
+    Returns an instance of AsyncOrderService bound to an asyncio database session.
+    """
+    yield AsyncOrderService.instance(port=OrderAsyncSqlAdapter(db))
+
+
+async def get_async_order_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+    archive: OrderArchiveAdapter | None = Depends(get_order_archive),
+) -> AsyncIterator[AsyncOrderService]:
+    """
+    Returns an instance of AsyncOrderService for read-only operations, which
+    looks up orders missing from the database in the archive.
     """
-    yield OrderService.instance(port=OrderSqlAdapter(db))
+    yield AsyncOrderService.instance(port=OrderAsyncSqlAdapter(db), archive=archive)
+
+
+# the routes only see the asyncio interface; with DB_ASYNC disabled it is the
+# blocking service run in the threadpool
+if config.DB_ASYNC:
+    get_order_service = get_async_order_service
+    get_order_read_service = get_async_order_read_service
+else:
+    get_order_service = get_sync_order_service
+    get_order_read_service = get_sync_order_read_service
 
 
 @router_v0.get(
@@ -33,20 +113,42 @@ def get_order_service(db: Session = Depends(get_db)) -> Iterator:
     response_model=OrderPublic,
     status_code=status.HTTP_200_OK,
 )
-def get_order_by_id(
+async def get_order_by_id(
     order_id: UUID,
-    service: OrderService = Depends(get_order_service),
-) -> OrderPublic:
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+    service: AsyncOrderService = Depends(get_order_read_service),
+) -> OrderPublic | Response:
     """
     Retrieves an order by its ID.
 
+    Revalidations, sent with If-None-Match or If-Modified-Since, are answered
+    with 304 Not Modified after reading only the order's version.
+
     Args:
         order_id (UUID): The ID of the order to be retrieved.
 
     Returns:
         OrderPublic: The OrderPublic object representing the order.
     """
-    order = service.get_order_by_id(order_id=order_id)
+    if if_none_match is not None or if_modified_since is not None:
+        # answer revalidations from the orders table alone
+        current = await service.get_order_version(order_id=order_id)
+        if current is not None and is_not_modified(
+            format_etag(current.version),
+            current.modified,
+            if_none_match,
+            if_modified_since,
+        ):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=validator_headers(
+                    format_etag(current.version), current.modified
+                ),
+            )
+
+    order = await service.get_order_by_id(order_id=order_id)
 
     if not order:
         raise HTTPException(
@@ -54,41 +156,264 @@ def get_order_by_id(
             detail=f"Order with id: {order_id} does not exist",
         )
 
+    response.headers.update(
+        validator_headers(format_etag(order.version), order.modified)
+    )
+
     return order
 
 
 @router_v0.get(
     "/orders/user/{user_id}",
-    response_model=list[OrderPublic],
+    response_model=OrderPage,
     status_code=status.HTTP_200_OK,
 )
-def get_order_for_user(
+async def get_order_for_user(
     user_id: UUID,
-    service: OrderService = Depends(get_order_service),
+    query: Annotated[OrderQuery, Query()],
+    service: AsyncOrderService = Depends(get_order_read_service),
 ):
-    return list(service.get_orders_by_user_id(user_id=user_id))
+    """
+    Lists a user's orders, newest first, one page at a time.
+
+    Pass the `next_cursor` of a page as `cursor` to fetch the next one. The
+    filters must stay the same between pages.
+    """
+    return await service.get_orders_page(user_id=user_id, query=query)
 
 
 @router_v0.post(
     "/orders",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "User or product variant not found",
+        },
+    },
     response_model=OrderPublic,
     status_code=status.HTTP_201_CREATED,
 )
-def create_order(
+async def create_order(
     request: OrderCreate,
-    service: OrderService = Depends(get_order_service),
+    service: AsyncOrderService = Depends(get_order_service),
+):
+    try:
+        return await service.create_order(request=request)
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+
+
+@router_v0.get(
+    "/orders:export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_orders(
+    query: Annotated[OrderExportQuery, Query()],
+    service: AsyncOrderService = Depends(get_order_read_service),
 ):
-    return service.create_order(request=request)
+    """
+    Exports every line item of the matching orders, with the order's bill,
+    as CSV or NDJSON.
+
+    Rows are read through a server-side cursor and streamed as they are
+    fetched, ORDER_EXPORT_BATCH_SIZE at a time, so the export runs in
+    constant memory however many orders match.
+    """
+    batches = service.export_orders(
+        query=query, batch_size=config.ORDER_EXPORT_BATCH_SIZE
+    )
+
+    return StreamingResponse(
+        export_chunks(batches, query.format),
+        media_type=EXPORT_MEDIA_TYPES[query.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="orders.{query.format}"'
+        },
+    )
+
+
+@router_v0.post(
+    "/orders:bulk",
+    response_class=NDJSONStreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def create_orders_bulk(
+    request: Request,
+    service: AsyncOrderService = Depends(get_order_service),
+):
+    """
+    Imports orders from an NDJSON body, one OrderCreate per line.
+
+    Lines are written in batches of ORDER_BULK_BATCH_SIZE, one transaction per
+    batch, and an OrderImportResult is streamed back for every line as soon
+    as its batch is written.
+    """
+    return NDJSONStreamingResponse(
+        import_orders(
+            request.stream(),
+            create_orders=service.create_orders,
+            batch_size=config.ORDER_BULK_BATCH_SIZE,
+        )
+    )
 
 
 @router_v0.put(
     "/orders/{id}/items",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Order or product variant not found",
+        },
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "description": "Order was modified since the If-Match version",
+        },
+    },
     response_model=OrderPublic,
     status_code=status.HTTP_200_OK,
 )
-def update_order(
+async def update_order(
     id: UUID,
     request: OrderUpdateItems,
-    service: OrderService = Depends(get_order_service),
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
+    service: AsyncOrderService = Depends(get_order_service),
+):
+    """
+    Updates an order's items.
+
+    Send the ETag of the order as `If-Match` to only update it if nobody else
+    changed it in the meantime; otherwise 412 is returned. The order is the
+    one in the path; an `id` in the body must match it.
+    """
+    if "id" in request.model_fields_set and request.id != id:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="The order id of the body does not match the path",
+        )
+
+    try:
+        order = await service.update_order_items(
+            request=request.model_copy(update={"id": id}),
+            expected_versions=parse_version_etags(if_match),
+        )
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e),
+        ) from e
+
+    response.headers["ETag"] = format_etag(order.version)
+
+    return order
+
+
+@router_v0.post(
+    "/orders/{order_id}/reorder",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Order not found",
+        },
+        status.HTTP_409_CONFLICT: {
+            "description": "None of the order's items can be reordered",
+        },
+    },
+    response_model=OrderPublic,
+    status_code=status.HTTP_201_CREATED,
+)
+async def reorder(
+    order_id: UUID,
+    response: Response,
+    request: OrderReorder | None = None,
+    service: AsyncOrderService = Depends(get_order_service),
+):
+    """
+    Places a new pending order with the items of a previous one.
+
+    Items whose product variant no longer exists are left out, and
+    `overrides` change the quantity of some items, 0 leaving them out.
+    """
+    try:
+        order = await service.reorder(
+            order_id=order_id, request=request or OrderReorder()
+        )
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+
+    response.headers["ETag"] = format_etag(order.version)
+
+    return order
+
+
+@router_v0.post(
+    "/orders/{order_id}/status",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Order not found",
+        },
+        status.HTTP_409_CONFLICT: {
+            "description": "Order cannot move to the status from its current one",
+        },
+    },
+    response_model=OrderPublic,
+    status_code=status.HTTP_200_OK,
+)
+async def change_order_status(
+    order_id: UUID,
+    request: OrderStatusChange,
+    response: Response,
+    service: AsyncOrderService = Depends(get_order_service),
 ):
-    return service.update_order_items(request=request)
+    """
+    Moves an order to a new status, e.g. from pending to fulfilled.
+    """
+    try:
+        order = await service.transition_order(order_id=order_id, status=request.status)
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+
+    response.headers["ETag"] = format_etag(order.version)
+
+    return order
+
+
+@router_v0.post(
+    "/orders:transition",
+    response_model=OrderTransitionResult,
+    status_code=status.HTTP_200_OK,
+)
+async def change_orders_status(
+    request: OrderBulkStatusChange,
+    service: AsyncOrderService = Depends(get_order_service),
+):
+    """
+    Moves up to 1000 orders to a new status with a single update.
+
+    Orders that do not exist or cannot move to the status are skipped and
+    reported with the reason, without affecting the others.
+    """
+    return await service.transition_orders(
+        order_ids=request.order_ids, status=request.status
+    )
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 from uuid import UUID
 
+from app.analytics.adapters.sql import SalesDeltas
+from app.analytics.domain.models import sales_day
 from app.bill.adapters.sql import Bill
 from app.core.exceptions import EntityNotFoundError
 from app.core.service import BaseService
@@ -38,6 +40,9 @@ class PaymentService(BaseService):
         Raises:
             EntityNotFoundError: If the bill with the given ID does not exist.
         """
+        # imported here, the order models refer to payments
+        from app.order.adapters.sql import touch_order
+
         bill: Bill | None = self.db.get(Bill, request.bill_id)
 
         if not bill:
@@ -67,6 +72,17 @@ class PaymentService(BaseService):
             bill.paid = False
 
         bill.modified = datetime.now(tz=timezone.utc)
+        touch_order(self.db, bill.order_id, bill.modified)
+
+        # payments are rolled up into the day of the order they pay for
+        sales = SalesDeltas()
+        sales.add_amounts(
+            bill.order.user_id,
+            sales_day(bill.order.created),
+            bill.currency,
+            paid_amount=request.amount,
+        )
+        sales.apply(self.db)
 
         self.db.commit()
 
@@ -1,11 +1,13 @@
 from logging import getLogger
 from typing import Iterator
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from fastapi.routing import APIRouter
 from sqlalchemy.orm import Session
 
+from app.core.exceptions import EntityNotFoundError
 from app.db import get_db
+from app.payment.models import PaymentCreate, PaymentPublic
 from app.payment.service import PaymentService
 
 logger = getLogger(__name__)
@@ -21,3 +23,29 @@ def get_payment_service(db: Session = Depends(get_db)) -> Iterator[PaymentServic
     related to users.
     """
     yield PaymentService(db=db)
+
+
+@router_v0.post(
+    "/payments",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Bill not found",
+        },
+    },
+    response_model=PaymentPublic,
+    status_code=status.HTTP_201_CREATED,
+)
+def make_payment(
+    request: PaymentCreate,
+    service: PaymentService = Depends(get_payment_service),
+):
+    """
+    Records a payment towards a bill, updating the bill's paid status.
+    """
+    try:
+        return service.make_payment(request=request)
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
@@ -1,5 +1,11 @@
+from app.product.adapters.cached import CachedProductAdapter
+from app.product.adapters.cached_async import AsyncCachedProductAdapter
 from app.product.adapters.sql import ProductSqlAdapter
+from app.product.adapters.sql_async import ProductAsyncSqlAdapter
 
 __all__ = [
+    "AsyncCachedProductAdapter",
+    "CachedProductAdapter",
     "ProductSqlAdapter",
+    "ProductAsyncSqlAdapter",
 ]
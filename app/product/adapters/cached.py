@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from app.core.exceptions import ConflictError
+from app.product.adapters.sql import ProductSqlAdapter
+from app.product.catalog import CatalogSnapshot, ProductCatalog
+from app.product.domain.models import (
+    CatalogVersion,
+    ProductCreate,
+    ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
+    ProductVariantCreate,
+    ProductVariantPublic,
+    RenderedCatalog,
+)
+from app.product.domain.port import ProductPort
+
+
+@dataclass
+class CachedProductAdapter(ProductPort):
+    """
+    Adapter serving product reads from the in-memory catalog snapshot.
+
+    The database is only queried to load the snapshot. Writes go through the
+    SQL adapter and then drop the snapshot, which the next read loads again.
+    """
+
+    port: ProductSqlAdapter
+    catalog: ProductCatalog
+
+    def snapshot(self) -> CatalogSnapshot:
+        return self.catalog.get(self.port.fetch_catalog)
+
+    def fetch_one(self, product_id: UUID) -> ProductPublic | None:
+        return self.snapshot().products.get(product_id)
+
+    def fetch_id_map(self) -> dict[UUID, str]:
+        return dict(self.snapshot().id_map)
+
+    def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        return self.snapshot().search(query)
+
+    def fetch_catalog_version(self) -> CatalogVersion:
+        return self.snapshot().catalog_version
+
+    def fetch_rendered_catalog(self) -> RenderedCatalog:
+        return self.snapshot().rendered
+
+    def fetch_variants(self, product_id: UUID) -> Iterable[ProductVariantPublic]:
+        return self.snapshot().variants_by_product.get(product_id, ())
+
+    def add_products(self, products: list[ProductCreate]) -> Iterable[ProductPublic]:
+        result = self.port.add_products(products=products)
+        self.catalog.invalidate()
+        return result
+
+    def add_products_bulk(
+        self, products: list[ProductCreate], partial: bool = True
+    ) -> list[ProductPublic | ConflictError]:
+        results = self.port.add_products_bulk(products=products, partial=partial)
+        self.catalog.invalidate()
+        return results
+
+    def add_variants(
+        self, product_id: UUID, variants: list[ProductVariantCreate]
+    ) -> Iterable[ProductVariantPublic]:
+        result = self.port.add_variants(product_id=product_id, variants=variants)
+        self.catalog.invalidate()
+        return result
@@ -0,0 +1,91 @@
+import asyncio
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ConflictError
+from app.product.adapters.cached import CachedProductAdapter
+from app.product.adapters.sql import ProductSqlAdapter
+from app.product.catalog import CatalogSnapshot, ProductCatalog
+from app.product.domain.models import (
+    CatalogVersion,
+    ProductCreate,
+    ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
+    ProductVariantCreate,
+    ProductVariantPublic,
+    RenderedCatalog,
+)
+from app.product.domain.port import AsyncProductPort
+
+
+@dataclass
+class AsyncCachedProductAdapter(AsyncProductPort):
+    """
+    asyncio adapter serving product reads from the in-memory catalog
+    snapshot, loading it through `AsyncSession.run_sync` when it is missing
+    """
+
+    db: AsyncSession
+    catalog: ProductCatalog
+
+    async def snapshot(self) -> CatalogSnapshot:
+        if snapshot := self.catalog.current():
+            return snapshot
+
+        return await self.db.run_sync(
+            lambda db: self.catalog.refresh(ProductSqlAdapter(db).fetch_catalog)
+        )
+
+    async def fetch_one(self, product_id: UUID) -> ProductPublic | None:
+        return (await self.snapshot()).products.get(product_id)
+
+    async def fetch_id_map(self) -> dict[UUID, str]:
+        return dict((await self.snapshot()).id_map)
+
+    async def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        return (await self.snapshot()).search(query)
+
+    async def fetch_catalog_version(self) -> CatalogVersion:
+        return (await self.snapshot()).catalog_version
+
+    async def fetch_rendered_catalog(self) -> RenderedCatalog:
+        snapshot = await self.snapshot()
+
+        if not snapshot.has_rendered():
+            # serializing the whole catalog would block the event loop too
+            await asyncio.to_thread(lambda: snapshot.rendered)
+
+        return snapshot.rendered
+
+    async def fetch_variants(self, product_id: UUID) -> list[ProductVariantPublic]:
+        return list((await self.snapshot()).variants_by_product.get(product_id, ()))
+
+    async def add_products(self, products: list[ProductCreate]) -> list[ProductPublic]:
+        return await self.db.run_sync(
+            lambda db: list(self._sync(db).add_products(products=products))
+        )
+
+    async def add_products_bulk(
+        self, products: list[ProductCreate], partial: bool = True
+    ) -> list[ProductPublic | ConflictError]:
+        return await self.db.run_sync(
+            lambda db: self._sync(db).add_products_bulk(
+                products=products, partial=partial
+            )
+        )
+
+    async def add_variants(
+        self, product_id: UUID, variants: list[ProductVariantCreate]
+    ) -> list[ProductVariantPublic]:
+        return await self.db.run_sync(
+            lambda db: list(
+                self._sync(db).add_variants(product_id=product_id, variants=variants)
+            )
+        )
+
+    def _sync(self, db: Session) -> CachedProductAdapter:
+        return CachedProductAdapter(ProductSqlAdapter(db), self.catalog)
@@ -1,18 +1,25 @@
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable
-from uuid import UUID
+from typing import Any, Iterable
+from uuid import UUID, uuid4
 
 from sqlalchemy import UUID as sql_UUID
-from sqlalchemy import ForeignKey, Integer, String, select
+from sqlalchemy import ForeignKey, Integer, String, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
+from app.core.exceptions import ConflictError, EntityNotFoundError
 from app.db import Base, BaseSchema
+from app.db.bulk import MAX_PARAMETERS_PER_STATEMENT, bulk_insert, chunked
 from app.product.domain.models import (
+    CatalogVersion,
     ProductCreate,
     ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
     ProductVariantCreate,
     ProductVariantPublic,
+    RenderedCatalog,
 )
 from app.product.domain.port import ProductPort
 
@@ -69,7 +76,75 @@ class ProductSqlAdapter(ProductPort):
         return self.db.get(Product, product_id)
 
     def fetch_id_map(self) -> dict[UUID, str]:
-        return {p.id: p.name for p in self.db.query(Product).all()}
+        return dict(self.db.execute(select(Product.id, Product.name)).tuples().all())
+
+    def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        """
+        Indexes the whole catalog for a single search; CachedProductAdapter
+        keeps the index between searches.
+        """
+        # imported here, the catalog snapshot is built from this adapter's rows
+        from app.product.catalog import CatalogSnapshot
+
+        return CatalogSnapshot.build(0, *self.fetch_catalog()).search(query)
+
+    def fetch_rendered_catalog(self) -> RenderedCatalog:
+        """
+        Renders the whole catalog for a single request; CachedProductAdapter
+        keeps it until the catalog changes.
+        """
+        from app.product.catalog import CatalogSnapshot
+
+        return CatalogSnapshot.build(0, *self.fetch_catalog()).rendered
+
+    def fetch_catalog_version(self) -> CatalogVersion:
+        return CatalogVersion.of(
+            self.db.execute(select(Product.id, Product.name, Product.modified)).tuples()
+        )
+
+    def fetch_catalog(self) -> tuple[list[ProductPublic], list[ProductVariantPublic]]:
+        """
+        Loads every product, without its variants, and every variant, with
+        one query each and without building ORM objects.
+        """
+        products = [
+            ProductPublic(
+                id=row.id,
+                created=row.created,
+                modified=row.modified,
+                name=row.name,
+                description=row.description,
+            )
+            for row in self.db.execute(
+                select(
+                    Product.id,
+                    Product.created,
+                    Product.modified,
+                    Product.name,
+                    Product.description,
+                )
+            )
+        ]
+        variants = [
+            ProductVariantPublic(
+                id=row.id,
+                size=row.size,
+                unit=row.unit,
+                kind=row.kind,
+                product_id=row.product_id,
+            )
+            for row in self.db.execute(
+                select(
+                    ProductVariant.id,
+                    ProductVariant.size,
+                    ProductVariant.unit,
+                    ProductVariant.kind,
+                    ProductVariant.product_id,
+                )
+            )
+        ]
+
+        return products, variants
 
     def fetch_variants(self, product_id: UUID) -> Iterable[ProductVariantPublic]:
         return (
@@ -81,73 +156,148 @@ class ProductSqlAdapter(ProductPort):
         )
 
     def add_products(self, products: list[ProductCreate]) -> Iterable[ProductPublic]:
-        result: list[ProductPublic] = []
-
-        for product_creation in products:
-            new_product = ProductPublic(**product_creation.model_dump())
-
-            db_product = Product(
-                id=new_product.id,
-                created=new_product.created,
-                modified=new_product.modified,
-                name=new_product.name,
-                description=new_product.description,
+        """
+        Registers products with their variants, all or none of them.
+
+        Raises:
+            ConflictError: If a product's name is already taken, or repeated in the request.
+        """
+        results = self.add_products_bulk(products, partial=False)
+
+        conflicts = [result for result in results if isinstance(result, ConflictError)]
+        if conflicts:
+            raise ConflictError(" ".join(str(conflict) for conflict in conflicts))
+
+        return results
+
+    def add_products_bulk(
+        self, products: list[ProductCreate], partial: bool = True
+    ) -> list[ProductPublic | ConflictError]:
+        """
+        Registers a batch of products with their variants in a single
+        transaction.
+
+        The names of the whole batch are checked against the catalog with one
+        set-based lookup, and the products and variants are written with
+        multi-row inserts. Products whose name is taken, or repeated earlier
+        in the batch, are reported without affecting the rest of the batch.
+
+        Args:
+            products (list[ProductCreate]): The products to register.
+            partial (bool): Whether to register the other products when some
+                conflict. Otherwise nothing is written if any does.
+
+        Returns:
+            list[ProductPublic | ConflictError]: For each product, in order,
+            the registered product or the conflict explaining why it was skipped.
+
+        Raises:
+            ConflictError: If a product with one of the names was registered
+                concurrently.
+        """
+        results: list[ProductPublic | ConflictError] = []
+        product_rows: list[dict[str, Any]] = []
+        variant_rows: list[dict[str, Any]] = []
+
+        try:
+            with self.db.begin():
+                taken = self._existing_names({product.name for product in products})
+
+                for product_creation in products:
+                    if product_creation.name in taken:
+                        results.append(
+                            ConflictError(
+                                f"Product with name = '{product_creation.name}' already exists."
+                            )
+                        )
+                        continue
+
+                    taken.add(product_creation.name)
+                    new_product = ProductPublic(**product_creation.model_dump())
+                    results.append(new_product)
+
+                    product_rows.append(
+                        {
+                            "id": new_product.id,
+                            "created": new_product.created,
+                            "modified": new_product.modified,
+                            "name": new_product.name,
+                            "description": new_product.description,
+                        }
+                    )
+                    variant_rows.extend(
+                        {
+                            "id": uuid4(),
+                            "size": variant.size,
+                            "unit": variant.unit.value,
+                            "kind": variant.kind,
+                            "product_id": new_product.id,
+                        }
+                        for variant in new_product.available_variants
+                    )
+
+                if partial or len(product_rows) == len(products):
+                    bulk_insert(self.db, Product.__table__, product_rows)
+                    bulk_insert(self.db, ProductVariant.__table__, variant_rows)
+        except IntegrityError as e:
+            raise ConflictError(
+                "Products with some of the names were registered concurrently."
+            ) from e
+
+        return results
+
+    def _existing_names(self, names: set[str]) -> set[str]:
+        """
+        Returns the subset of `names` already taken by products, in as few
+        queries as the bound parameter limit allows.
+        """
+        return {
+            name
+            for chunk in chunked(names, MAX_PARAMETERS_PER_STATEMENT)
+            for name in self.db.scalars(
+                select(Product.name).where(Product.name.in_(chunk))
             )
-
-            for variant in new_product.available_variants:
-                public_variant = ProductVariantPublic(
-                    **variant.model_dump(),
-                    product_id=new_product.id,
-                )
-
-                db_variant = ProductVariant(
-                    id=public_variant.id,
-                    size=public_variant.size,
-                    unit=public_variant.unit.value,
-                    kind=public_variant.kind,
-                    product_id=public_variant.product_id,
-                )
-
-                db_product.available_variants.append(db_variant)
-
-                self.db.add(db_variant)
-
-            self.db.add(db_product)
-
-            result.append(new_product)
-
-        self.db.commit()
-
-        return result
+        }
 
     def add_variants(
         self, product_id: UUID, variants: list[ProductVariantCreate]
     ) -> Iterable[ProductVariantPublic]:
-        result: list[ProductVariantPublic] = []
-
-        for variant in variants:
-            new_variant = ProductVariantPublic(
-                **variant.model_dump(),
-                product_id=product_id,
-            )
-            db_variant = ProductVariant(
-                id=new_variant.id,
-                size=new_variant.size,
-                unit=new_variant.unit.value,
-                kind=new_variant.kind,
-                product_id=new_variant.product_id,
+        """
+        Registers variants of a product with multi-row inserts, in a single
+        transaction that also updates the product's modification time.
+
+        Raises:
+            EntityNotFoundError: If the product does not exist.
+        """
+        new_variants = [
+            ProductVariantPublic(**variant.model_dump(), product_id=product_id)
+            for variant in variants
+        ]
+
+        with self.db.begin():
+            # the product's validators change with its available variants
+            touched = self.db.execute(
+                update(Product)
+                .where(Product.id == product_id)
+                .values(modified=datetime.now(timezone.utc))
+            ).rowcount
+
+            if not touched:
+                raise EntityNotFoundError.from_id("Product", product_id)
+
+            bulk_insert(
+                self.db,
+                ProductVariant.__table__,
+                [
+                    {
+                        "id": variant.id,
+                        "size": variant.size,
+                        "unit": variant.unit.value,
+                        "kind": variant.kind,
+                        "product_id": variant.product_id,
+                    }
+                    for variant in new_variants
+                ],
             )
-            self.db.add(db_variant)
-            result.append(new_variant)
-
-        product: Product | None = self.db.get(Product, product_id)
-
-        if product is None:
-            raise ValueError(f"Product with ID {product_id} not found")
-
-        # update the product modified timestamp since we updated it's available variants
-        product.modified = datetime.now(timezone.utc)
-
-        self.db.commit()
 
-        return result
+        return new_variants
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ConflictError
+from app.product.adapters.sql import ProductSqlAdapter
+from app.product.domain.models import (
+    CatalogVersion,
+    ProductCreate,
+    ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
+    ProductVariantCreate,
+    ProductVariantPublic,
+    RenderedCatalog,
+)
+from app.product.domain.port import AsyncProductPort
+
+
+@dataclass
+class ProductAsyncSqlAdapter(AsyncProductPort):
+    """
+    asyncio adapter for products that runs the ProductSqlAdapter logic
+    through `AsyncSession.run_sync`
+    """
+
+    db: AsyncSession
+
+    async def fetch_one(self, product_id: UUID) -> ProductPublic | None:
+        def fetch(db: Session) -> ProductPublic | None:
+            product = ProductSqlAdapter(db).fetch_one(product_id=product_id)
+            return ProductPublic.model_validate(product) if product else None
+
+        return await self.db.run_sync(fetch)
+
+    async def fetch_id_map(self) -> dict[UUID, str]:
+        return await self.db.run_sync(lambda db: ProductSqlAdapter(db).fetch_id_map())
+
+    async def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        return await self.db.run_sync(
+            lambda db: ProductSqlAdapter(db).search_products(query=query)
+        )
+
+    async def fetch_catalog_version(self) -> CatalogVersion:
+        return await self.db.run_sync(
+            lambda db: ProductSqlAdapter(db).fetch_catalog_version()
+        )
+
+    async def fetch_rendered_catalog(self) -> RenderedCatalog:
+        return await self.db.run_sync(
+            lambda db: ProductSqlAdapter(db).fetch_rendered_catalog()
+        )
+
+    async def fetch_variants(self, product_id: UUID) -> list[ProductVariantPublic]:
+        def fetch(db: Session) -> list[ProductVariantPublic]:
+            variants = ProductSqlAdapter(db).fetch_variants(product_id=product_id)
+            return [ProductVariantPublic.model_validate(v) for v in variants]
+
+        return await self.db.run_sync(fetch)
+
+    async def add_products(self, products: list[ProductCreate]) -> list[ProductPublic]:
+        return await self.db.run_sync(
+            lambda db: list(ProductSqlAdapter(db).add_products(products=products))
+        )
+
+    async def add_products_bulk(
+        self, products: list[ProductCreate], partial: bool = True
+    ) -> list[ProductPublic | ConflictError]:
+        return await self.db.run_sync(
+            lambda db: ProductSqlAdapter(db).add_products_bulk(
+                products=products, partial=partial
+            )
+        )
+
+    async def add_variants(
+        self, product_id: UUID, variants: list[ProductVariantCreate]
+    ) -> list[ProductVariantPublic]:
+        return await self.db.run_sync(
+            lambda db: list(
+                ProductSqlAdapter(db).add_variants(
+                    product_id=product_id, variants=variants
+                )
+            )
+        )
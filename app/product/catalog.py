@@ -0,0 +1,317 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from typing import Callable, Mapping, TypeVar
+from uuid import UUID
+
+from app.config import config
+from app.product.domain.models import (
+    CatalogVersion,
+    ProductPublic,
+    ProductSearchHit,
+    ProductSearchPage,
+    ProductSearchQuery,
+    ProductVariantBase,
+    ProductVariantPublic,
+    RenderedCatalog,
+)
+from app.product.search import ProductSearchIndex, SearchDocument
+
+# loads every product, without variants, and every variant of the catalog
+CatalogLoader = Callable[[], tuple[list[ProductPublic], list[ProductVariantPublic]]]
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable view of the whole product catalog at one point in time.
+
+    The search index and the rendered catalog are derived on first use,
+    once: concurrent first uses wait for the one building them.
+    """
+
+    # incremented every time the catalog changes in this process
+    version: int
+    # validators of the catalog, the same in every process
+    catalog_version: CatalogVersion
+
+    products: Mapping[UUID, ProductPublic]
+    variants_by_product: Mapping[UUID, tuple[ProductVariantPublic, ...]]
+    product_by_variant: Mapping[UUID, UUID]
+    id_map: Mapping[UUID, str]
+
+    # an index of an older snapshot, updated into this snapshot's instead of
+    # indexing the catalog from scratch
+    base_index: ProductSearchIndex | None = field(default=None, repr=False)
+    # the catalog rendered by an older snapshot of the same catalog version,
+    # e.g. one that expired, reused instead of rendering it again
+    base_rendered: RenderedCatalog | None = field(default=None, repr=False)
+
+    # guards the derivation of the search index and the rendered catalog
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        products: list[ProductPublic],
+        variants: list[ProductVariantPublic],
+        previous: "CatalogSnapshot | None" = None,
+    ) -> "CatalogSnapshot":
+        """
+        Indexes the products and variants of the catalog.
+
+        Args:
+            version (int): The version of the catalog the rows were loaded at.
+            products (list[ProductPublic]): Every product; their variants are ignored.
+            variants (list[ProductVariantPublic]): Every variant.
+            previous (CatalogSnapshot | None): An older snapshot, whose search
+                index, and rendered catalog if the catalog is unchanged, are
+                reused for this one.
+
+        Returns:
+            CatalogSnapshot: The snapshot.
+        """
+        by_product: dict[UUID, list[ProductVariantPublic]] = {}
+        for variant in variants:
+            by_product.setdefault(variant.product_id, []).append(variant)
+
+        catalog_version = CatalogVersion.of(
+            (product.id, product.name, product.modified) for product in products
+        )
+        rendered = previous.latest_rendered() if previous else None
+
+        return cls(
+            version=version,
+            catalog_version=catalog_version,
+            products=MappingProxyType(
+                {
+                    product.id: product.model_copy(
+                        update={
+                            "available_variants": [
+                                ProductVariantBase(
+                                    size=variant.size,
+                                    unit=variant.unit,
+                                    kind=variant.kind,
+                                )
+                                for variant in by_product.get(product.id, [])
+                            ]
+                        }
+                    )
+                    for product in products
+                }
+            ),
+            variants_by_product=MappingProxyType(
+                {
+                    product_id: tuple(product_variants)
+                    for product_id, product_variants in by_product.items()
+                }
+            ),
+            product_by_variant=MappingProxyType(
+                {variant.id: variant.product_id for variant in variants}
+            ),
+            id_map=MappingProxyType({product.id: product.name for product in products}),
+            base_index=previous.latest_search_index() if previous else None,
+            base_rendered=(
+                rendered if rendered and rendered.version == catalog_version else None
+            ),
+        )
+
+    def _derived(self, name: str, derive: Callable[[], T]) -> T:
+        """
+        Returns a value derived from the snapshot, deriving it on first use.
+        """
+        if name not in self.__dict__:
+            with self._lock:
+                if name not in self.__dict__:
+                    # the dataclass is frozen, its attributes cannot be set
+                    self.__dict__[name] = derive()
+        return self.__dict__[name]
+
+    @property
+    def search_index(self) -> ProductSearchIndex:
+        """
+        The search index of the catalog: a few seconds for 50k products from
+        scratch, but only the products changed since the base index otherwise.
+        `ProductCatalog` builds it when it caches the snapshot.
+        """
+        return self._derived("_search_index", self._build_search_index)
+
+    def _build_search_index(self) -> ProductSearchIndex:
+        documents = [
+            SearchDocument(
+                id=product.id,
+                name=product.name,
+                description=product.description,
+                kinds=tuple(
+                    variant.kind
+                    for variant in self.variants_by_product.get(product.id, ())
+                ),
+            )
+            for product in self.products.values()
+        ]
+
+        if self.base_index is None:
+            return ProductSearchIndex.build(documents)
+
+        return self.base_index.updated(
+            documents, removed=self.base_index.ids() - self.products.keys()
+        )
+
+    def has_search_index(self) -> bool:
+        """
+        Whether the search index of this snapshot was built already.
+        """
+        return "_search_index" in self.__dict__
+
+    def latest_search_index(self) -> ProductSearchIndex | None:
+        """
+        Returns the search index of this snapshot if it was built, else the
+        one it would be built from.
+        """
+        return self.search_index if self.has_search_index() else self.base_index
+
+    @property
+    def rendered(self) -> RenderedCatalog:
+        """
+        The whole catalog serialized for GET /v0/catalog, rendered on first
+        use, so at most once per change of the catalog.
+        """
+        return self._derived(
+            "_rendered",
+            lambda: (
+                self.base_rendered
+                or RenderedCatalog.render(self.products.values(), self.catalog_version)
+            ),
+        )
+
+    def has_rendered(self) -> bool:
+        """
+        Whether the catalog of this snapshot was rendered already.
+        """
+        return "_rendered" in self.__dict__ or self.base_rendered is not None
+
+    def latest_rendered(self) -> RenderedCatalog | None:
+        """
+        Returns the rendered catalog of this snapshot, or None if it was not
+        rendered yet.
+        """
+        return self.rendered if self.has_rendered() else None
+
+    def search(self, query: ProductSearchQuery) -> ProductSearchPage:
+        """
+        Searches the names, descriptions and variant kinds of the products.
+
+        Args:
+            query (ProductSearchQuery): The query and the page to return.
+
+        Returns:
+            ProductSearchPage: The matching products, best first.
+        """
+        hits, more = self.search_index.search(query.q, query.limit, query.offset)
+
+        return ProductSearchPage(
+            items=[
+                ProductSearchHit(product=self.products[id], score=score)
+                for id, score in hits
+            ],
+            next_offset=query.offset + query.limit if more else None,
+        )
+
+
+class ProductCatalog:
+    """
+    In-process cache of the product catalog.
+
+    Reads share one `CatalogSnapshot`, which is replaced rather than changed:
+    writes in this process invalidate it, and it expires after `ttl_seconds`
+    so writes made by other workers are picked up too. A load that started
+    before an invalidation is returned to its caller but never cached.
+
+    Concurrent misses may each load the catalog; no lock is held while
+    loading, so loads can run in threads as well as on the event loop.
+
+    Snapshots are cached with their search index built, so searches never
+    build it: only the first load, run by `warm_product_catalog` on startup,
+    indexes the whole catalog, later ones update the previous index.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: CatalogSnapshot | None = None
+        # the last snapshot built, kept after invalidations to update its
+        # search index instead of rebuilding it
+        self._latest: CatalogSnapshot | None = None
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = Lock()
+
+    def current(self) -> CatalogSnapshot | None:
+        """
+        Returns the cached snapshot, or None if it was invalidated or expired.
+        """
+        with self._lock:
+            if self._snapshot is not None and monotonic() < self._expires_at:
+                return self._snapshot
+            return None
+
+    def get(self, load: CatalogLoader) -> CatalogSnapshot:
+        """
+        Returns the cached snapshot, loading the catalog if there is none.
+
+        Args:
+            load (CatalogLoader): Loads the products and variants from the database.
+
+        Returns:
+            CatalogSnapshot: The current snapshot.
+        """
+        return self.current() or self.refresh(load)
+
+    def refresh(self, load: CatalogLoader) -> CatalogSnapshot:
+        """
+        Loads the catalog and caches the new snapshot.
+        """
+        with self._lock:
+            version = self._version
+            latest = self._latest
+
+        products, variants = load()
+        snapshot = CatalogSnapshot.build(version, products, variants, previous=latest)
+        # indexed before it is cached, searches never wait for the index
+        snapshot.search_index
+
+        with self._lock:
+            if self._version == version:
+                self._snapshot = snapshot
+                self._latest = snapshot
+                self._expires_at = monotonic() + self.ttl_seconds
+
+        return snapshot
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached snapshot after the catalog changed.
+        """
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+
+def warm_product_catalog() -> None:
+    """
+    Loads the catalog and builds its search index from scratch, before the
+    first request needs them.
+    """
+    # imported here, the adapters import the catalog
+    from app.db import SessionLocal
+    from app.product.adapters.sql import ProductSqlAdapter
+
+    with SessionLocal() as db:
+        product_catalog.refresh(ProductSqlAdapter(db).fetch_catalog)
+
+
+# the catalog shared by the requests of this process
+product_catalog = ProductCatalog(ttl_seconds=config.PRODUCT_CATALOG_TTL_SECONDS)
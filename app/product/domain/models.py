@@ -1,17 +1,54 @@
 from __future__ import annotations
 
+import gzip
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from hashlib import blake2b
+from typing import Iterable, Literal, NamedTuple
 from uuid import UUID
 
+import orjson
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.etags import format_etag
 from app.core.models import Identifiable, TimeStamped
 
+# fast enough to re-compress the catalog whenever it changes
+CATALOG_GZIP_LEVEL = 6
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # sqlite returns naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def timestamp_etag(value: datetime) -> str:
+    """
+    Formats a modification timestamp, to the microsecond, as a strong ETag.
+    """
+    return format_etag((_as_utc(value) - EPOCH) // timedelta(microseconds=1))
+
 
 class ProductVariantUnit(str, Enum):
     MILLI_LITER = "mL"
     LITER = "L"
 
+    @property
+    def milliliters(self) -> int:
+        """
+        The number of milliliters in one of this unit
+        """
+        return 1000 if self is ProductVariantUnit.LITER else 1
+
+    def to_milliliters(self, size: int | float) -> int | float:
+        """
+        Converts a size in this unit to milliliters
+        """
+        return size * self.milliliters
+
+
 class ProductVariantBase(BaseModel):
     """
     Base model describing a specific product variant's properties
@@ -60,3 +97,126 @@ class ProductPublic(ProductBase, Identifiable, TimeStamped):
     """
 
     model_config = ConfigDict(from_attributes=True)
+
+    @property
+    def etag(self) -> str:
+        """
+        The ETag of the product and of its variants, which bump `modified`
+        """
+        return timestamp_etag(self.modified)
+
+
+class CatalogVersion(BaseModel):
+    """
+    Validators of the whole catalog, for conditional requests
+    """
+
+    etag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def of(cls, products: Iterable[tuple[UUID, str, datetime]]) -> CatalogVersion:
+        """
+        Digests the id, name and modification time of every product, so the
+        ETag is the same in every worker and changes with any product.
+
+        Args:
+            products (Iterable[tuple[UUID, str, datetime]]): The id, name and
+                modification time of each product.
+
+        Returns:
+            CatalogVersion: The validators of the catalog.
+        """
+        digest = blake2b(digest_size=16)
+        last_modified: datetime | None = None
+
+        for id, name, modified in sorted(products, key=lambda product: product[0]):
+            modified = _as_utc(modified)
+            digest.update(id.bytes)
+            digest.update(modified.isoformat().encode())
+            digest.update(name.encode() + b"\0")
+            if last_modified is None or modified > last_modified:
+                last_modified = modified
+
+        return cls(etag=format_etag(digest.hexdigest()), last_modified=last_modified)
+
+
+class RenderedCatalog(NamedTuple):
+    """
+    The whole catalog serialized once, to be served as is
+    """
+
+    version: CatalogVersion
+    # the JSON list of every product with its variants
+    body: bytes
+    # the same list compressed with gzip
+    gzip_body: bytes
+
+    @property
+    def gzip_etag(self) -> str:
+        """
+        The strong ETag of the gzip representation, which must differ from
+        the uncompressed one's.
+        """
+        return f'{self.version.etag[:-1]}-gzip"'
+
+    @classmethod
+    def render(
+        cls, products: Iterable[ProductPublic], version: CatalogVersion
+    ) -> RenderedCatalog:
+        """
+        Serializes products with orjson, producing the same JSON as a
+        `list[ProductPublic]` response model.
+
+        Args:
+            products (Iterable[ProductPublic]): Every product, with its variants.
+            version (CatalogVersion): The validators of the catalog.
+
+        Returns:
+            RenderedCatalog: The serialized and compressed catalog.
+        """
+        body = orjson.dumps(
+            [product.model_dump() for product in products], option=orjson.OPT_UTC_Z
+        )
+        # no timestamp in the header, so every worker compresses to the same bytes
+        gzip_body = gzip.compress(body, compresslevel=CATALOG_GZIP_LEVEL, mtime=0)
+
+        return cls(version=version, body=body, gzip_body=gzip_body)
+
+
+class ProductImportResult(BaseModel):
+    """
+    Outcome of one product of a bulk registration
+    """
+
+    # position of the product in the request
+    index: int
+    status: Literal["created", "conflict"]
+    id: UUID | None = None
+    error: str | None = None
+
+
+class ProductSearchQuery(BaseModel):
+    """
+    Query and page of a product search
+    """
+
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(default=20, ge=1, le=100)
+    offset: int = Field(default=0, ge=0, le=10_000)
+
+
+class ProductSearchHit(BaseModel):
+    product: ProductPublic
+    # higher is better; only comparable within one search
+    score: float
+
+
+class ProductSearchPage(BaseModel):
+    """
+    One page of search results, best match first
+    """
+
+    items: list[ProductSearchHit]
+    # the offset of the next page, None on the last page
+    next_offset: int | None = None
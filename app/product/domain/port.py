@@ -1,11 +1,16 @@
 from typing import Iterable, Protocol
 from uuid import UUID
 
+from app.core.exceptions import ConflictError
 from app.product.domain.models import (
+    CatalogVersion,
     ProductCreate,
     ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
     ProductVariantCreate,
     ProductVariantPublic,
+    RenderedCatalog,
 )
 
 
@@ -28,12 +33,39 @@ class ProductPort(Protocol):
         """
         ...
 
+    def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        """
+        Searches products by name, description and variant kind
+        """
+        ...
+
+    def fetch_catalog_version(self) -> CatalogVersion:
+        """
+        Returns the validators of the catalog, for conditional requests
+        """
+        ...
+
+    def fetch_rendered_catalog(self) -> RenderedCatalog:
+        """
+        Returns every product with its variants, serialized
+        """
+        ...
+
     def add_products(self, products: list[ProductCreate]) -> Iterable[ProductPublic]:
         """
         Add products to the backend
         """
         ...
 
+    def add_products_bulk(
+        self, products: list[ProductCreate], partial: bool = True
+    ) -> list[ProductPublic | ConflictError]:
+        """
+        Add a batch of products, skipping the ones whose name is taken, or
+        adding none of them if any is taken and `partial` is False
+        """
+        ...
+
     def add_variants(
         self, product_id: UUID, variants: list[ProductVariantCreate]
     ) -> Iterable[ProductVariantPublic]:
@@ -41,3 +73,64 @@ class ProductPort(Protocol):
         Add available variants for a product
         """
         ...
+
+
+class AsyncProductPort(Protocol):
+    async def fetch_one(self, product_id: UUID) -> ProductPublic | None:
+        """
+        Fetches a single product
+        """
+        ...
+
+    async def fetch_variants(self, product_id: UUID) -> list[ProductVariantPublic]:
+        """
+        Fetches all the available variants for a product
+        """
+        ...
+
+    async def fetch_id_map(self) -> dict[UUID, str]:
+        """
+        Returns a map of product ids and their name
+        """
+        ...
+
+    async def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        """
+        Searches products by name, description and variant kind
+        """
+        ...
+
+    async def fetch_catalog_version(self) -> CatalogVersion:
+        """
+        Returns the validators of the catalog, for conditional requests
+        """
+        ...
+
+    async def fetch_rendered_catalog(self) -> RenderedCatalog:
+        """
+        Returns every product with its variants, serialized
+        """
+        ...
+
+    async def add_products(self, products: list[ProductCreate]) -> list[ProductPublic]:
+        """
+        Add products to the backend
+        """
+        ...
+
+    async def add_products_bulk(
+        self, products: list[ProductCreate], partial: bool = True
+    ) -> list[ProductPublic | ConflictError]:
+        """
+        Add a batch of products, skipping the ones whose name is taken, or
+        adding none of them if any is taken and `partial` is False
+        """
+        ...
+
+    async def add_variants(
+        self, product_id: UUID, variants: list[ProductVariantCreate]
+    ) -> list[ProductVariantPublic]:
+        """
+        Add available variants for a product
+        """
+        ...
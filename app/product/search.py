@@ -0,0 +1,333 @@
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import merge
+from typing import Iterable, Iterator, KeysView, NamedTuple
+from uuid import UUID
+
+# how much a match in each field of a product counts towards its score
+FIELD_WEIGHTS = {"name": 3.0, "kind": 2.0, "description": 1.0}
+
+# completions of a query term that are scored, in token order
+MAX_PREFIX_EXPANSIONS = 64
+# misspellings of a query term that are scored, most similar first
+MAX_FUZZY_EXPANSIONS = 16
+# Dice coefficient of the trigrams of a term and a token to count as a match
+MIN_FUZZY_SIMILARITY = 0.5
+
+_TOKEN = re.compile(r"\w+")
+
+# a product in ranking order: negated score, case-folded name, ID
+RankKey = tuple[float, str, UUID]
+
+
+def tokenize(text: str | None) -> list[str]:
+    """
+    Splits text into case-folded words.
+    """
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+def trigrams(token: str) -> frozenset[str]:
+    """
+    Returns the trigrams of a token padded with spaces, so short tokens and
+    their first and last letters are represented too.
+    """
+    padded = f" {token} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class SearchDocument(NamedTuple):
+    """
+    The searchable fields of a product
+    """
+
+    id: UUID
+    name: str
+    description: str | None
+    kinds: tuple[str, ...]
+
+    def weights(self) -> dict[str, float]:
+        """
+        Returns the tokens of the product, weighted by the fields they are in.
+        """
+        fields = {
+            "name": tokenize(self.name),
+            "description": tokenize(self.description),
+            "kind": [token for kind in self.kinds for token in tokenize(kind)],
+        }
+
+        weights: dict[str, float] = {}
+        for field, tokens in fields.items():
+            for token in set(tokens):
+                weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS[field]
+
+        return weights
+
+
+class ProductSearchIndex:
+    """
+    Immutable inverted index of product names, descriptions and variant kinds.
+
+    Query terms match tokens exactly, as a prefix found by binary search over
+    the sorted tokens, or, when neither matches, as a misspelling found
+    through the trigrams of the tokens. A product matches when every term
+    does, and is ranked by the sum, over the terms, of its best match scaled
+    by the weight of the fields it is in, then by name.
+
+    The postings of each token are kept in ranking order, so a search walks
+    the postings of its most selective term best first and stops as soon as
+    no remaining product can make it into the requested page; broad terms
+    matching most of the catalog cost no more than narrow ones.
+
+    `updated` returns a new index that shares every posting the changed
+    products do not touch, so an index is never modified once built and
+    can be read without locks.
+    """
+
+    def __init__(
+        self,
+        documents: dict[UUID, SearchDocument],
+        postings: dict[str, dict[UUID, float]],
+        ranked: dict[str, list[RankKey]],
+        tokens: list[str],
+        trigram_tokens: dict[str, frozenset[str]],
+    ) -> None:
+        # the indexed products
+        self._documents = documents
+        # token -> product -> weight of the fields the token is in
+        self._postings = postings
+        # token -> the postings in ranking order, weights negated
+        self._ranked = ranked
+        # every token, sorted for prefix lookups
+        self._tokens = tokens
+        # trigram -> the tokens containing it, for misspellings
+        self._trigram_tokens = trigram_tokens
+
+    @classmethod
+    def build(cls, documents: Iterable[SearchDocument]) -> "ProductSearchIndex":
+        """
+        Indexes products from scratch.
+        """
+        return cls({}, {}, {}, [], {}).updated(documents)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def ids(self) -> KeysView[UUID]:
+        """
+        Returns the IDs of the indexed products.
+        """
+        return self._documents.keys()
+
+    def updated(
+        self, documents: Iterable[SearchDocument], removed: Iterable[UUID] = ()
+    ) -> "ProductSearchIndex":
+        """
+        Returns a new index with products added, replaced or removed.
+
+        Only the postings of the tokens of the changed products are copied,
+        so the cost depends on the size of the change, not of the catalog.
+
+        Args:
+            documents (Iterable[SearchDocument]): New or changed products.
+            removed (Iterable[UUID]): The IDs of the products to drop.
+
+        Returns:
+            ProductSearchIndex: The new index.
+        """
+        changed = {
+            document.id: document
+            for document in documents
+            if self._documents.get(document.id) != document
+        }
+        dropped = [id for id in removed if id in self._documents]
+
+        if not changed and not dropped:
+            return self
+
+        documents_ = dict(self._documents)
+        postings = dict(self._postings)
+        touched: set[str] = set()
+
+        def posting(token: str) -> dict[UUID, float]:
+            if token not in touched:
+                postings[token] = dict(postings.get(token, {}))
+                touched.add(token)
+            return postings[token]
+
+        for id in [*changed, *dropped]:
+            if (previous := documents_.pop(id, None)) is not None:
+                for token in previous.weights():
+                    del posting(token)[id]
+
+        for id, document in changed.items():
+            documents_[id] = document
+            for token, weight in document.weights().items():
+                posting(token)[id] = weight
+
+        added = [
+            token
+            for token in touched
+            if postings[token] and token not in self._postings
+        ]
+        emptied = {token for token in touched if not postings[token]}
+
+        names: dict[UUID, str] = {}
+
+        def sort_name(id: UUID) -> str:
+            if (name := names.get(id)) is None:
+                name = names[id] = documents_[id].name.casefold()
+            return name
+
+        ranked = dict(self._ranked)
+        for token in touched:
+            if token in emptied:
+                del postings[token]
+                ranked.pop(token, None)
+            else:
+                ranked[token] = sorted(
+                    (-weight, sort_name(id), id)
+                    for id, weight in postings[token].items()
+                )
+
+        tokens = self._tokens
+        trigram_tokens = self._trigram_tokens
+
+        if added or emptied:
+            # the sort merges the new tokens into the sorted run in linear time
+            tokens = sorted([token for token in tokens if token not in emptied] + added)
+
+            changes: dict[str, tuple[set[str], set[str]]] = {}
+            for token in added:
+                for trigram in trigrams(token):
+                    changes.setdefault(trigram, (set(), set()))[0].add(token)
+            for token in emptied:
+                for trigram in trigrams(token):
+                    changes.setdefault(trigram, (set(), set()))[1].add(token)
+
+            trigram_tokens = dict(trigram_tokens)
+            for trigram, (plus, minus) in changes.items():
+                trigram_tokens[trigram] = (
+                    trigram_tokens.get(trigram, frozenset()) | plus
+                ) - minus
+
+        return ProductSearchIndex(documents_, postings, ranked, tokens, trigram_tokens)
+
+    def search(
+        self, text: str, limit: int, offset: int = 0
+    ) -> tuple[list[tuple[UUID, float]], bool]:
+        """
+        Finds the products matching every term of a query.
+
+        Args:
+            text (str): The query.
+            limit (int): The number of results to return.
+            offset (int): The number of better ranked results to skip.
+
+        Returns:
+            tuple[list[tuple[UUID, float]], bool]: The IDs and scores of the
+            requested results, best first, and whether more results follow.
+        """
+        terms = [self._matches(term) for term in dict.fromkeys(tokenize(text))]
+        if not terms or not all(terms):
+            return [], False
+
+        # walk the term with the fewest postings, and look the others up
+        terms.sort(key=lambda matches: sum(len(self._postings[t]) for t, _ in matches))
+        walked, *looked_up = terms
+        # the most the looked up terms can add to a product's score; the
+        # first ranked posting of a token has its highest weight
+        bound = sum(
+            max(-self._ranked[token][0][0] * match for token, match in matches)
+            for matches in looked_up
+        )
+
+        wanted = offset + limit + 1
+        top: list[RankKey] = []
+        seen: set[UUID] = set()
+
+        for score, name, id in self._walk(walked):
+            if len(top) == wanted and (score - bound, name, id) >= top[-1]:
+                break
+            # a product found through several completions comes first with
+            # its best one
+            if id in seen:
+                continue
+            seen.add(id)
+
+            for matches in looked_up:
+                best = max(
+                    self._postings[token].get(id, 0.0) * match
+                    for token, match in matches
+                )
+                if not best:
+                    break
+                score -= best
+            else:
+                key = (score, name, id)
+                if len(top) < wanted:
+                    insort(top, key)
+                elif key < top[-1]:
+                    insort(top, key)
+                    top.pop()
+
+        page = [(id, -score) for score, _, id in top[offset : offset + limit]]
+        return page, len(top) == wanted
+
+    def _walk(self, matches: list[tuple[str, float]]) -> Iterator[RankKey]:
+        """
+        Yields the postings of a term's tokens merged in ranking order, with
+        their scores negated.
+        """
+        return merge(
+            *(
+                ((weight * match, name, id) for weight, name, id in self._ranked[token])
+                for token, match in matches
+            )
+        )
+
+    def _matches(self, term: str) -> list[tuple[str, float]]:
+        """
+        Returns the tokens matching a query term, with the score of the match.
+        """
+        return self._prefix_matches(term) or self._fuzzy_matches(term)
+
+    def _prefix_matches(self, term: str) -> list[tuple[str, float]]:
+        """
+        Returns the tokens starting with the term, scored from 1 for the term
+        itself down towards 0.5 for long completions.
+        """
+        matches = []
+        start = bisect_left(self._tokens, term)
+
+        for token in self._tokens[start : start + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            matches.append((token, 0.5 + 0.5 * len(term) / len(token)))
+
+        return matches
+
+    def _fuzzy_matches(self, term: str) -> list[tuple[str, float]]:
+        """
+        Returns the tokens whose trigrams are similar to the term's, scored
+        below 0.5 so they rank after any prefix match.
+        """
+        if len(term) < 3:
+            return []
+
+        term_trigrams = trigrams(term)
+        shared = Counter(
+            token
+            for trigram in term_trigrams
+            for token in self._trigram_tokens.get(trigram, ())
+        )
+
+        matches = []
+        for token, count in shared.items():
+            similarity = 2 * count / (len(term_trigrams) + len(trigrams(token)))
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                matches.append((token, 0.5 * similarity))
+
+        matches.sort(key=lambda match: -match[1])
+        return matches[:MAX_FUZZY_EXPANSIONS]
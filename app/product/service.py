@@ -1,18 +1,38 @@
 from dataclasses import dataclass
 from uuid import UUID
 
+from app.core.exceptions import ConflictError
 from app.core.logging import get_logger
 from app.product.domain.models import (
+    CatalogVersion,
     ProductCreate,
+    ProductImportResult,
     ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
     ProductVariantCreate,
     ProductVariantPublic,
+    RenderedCatalog,
 )
-from app.product.domain.port import ProductPort
+from app.product.domain.port import AsyncProductPort, ProductPort
 
 logger = get_logger(__name__)
 
 
+def import_results(
+    results: list[ProductPublic | ConflictError],
+) -> list[ProductImportResult]:
+    """
+    Reports the outcome of each product of a bulk registration.
+    """
+    return [
+        ProductImportResult(index=index, status="conflict", error=str(result))
+        if isinstance(result, ConflictError)
+        else ProductImportResult(index=index, status="created", id=result.id)
+        for index, result in enumerate(results)
+    ]
+
+
 @dataclass
 class ProductService:
     """
@@ -49,6 +69,24 @@ class ProductService:
         """
         return list(self.port.add_products(products=request))
 
+    def import_products(
+        self, request: list[ProductCreate]
+    ) -> list[ProductImportResult]:
+        """
+        Registers a batch of products, e.g. a supplier catalog, skipping the
+        ones whose name is already taken.
+
+        Args:
+            request (list[ProductCreate]): The products to register.
+
+        Returns:
+            list[ProductImportResult]: The outcome of each product, in order.
+
+        Raises:
+            ConflictError: If a product with one of the names was registered concurrently.
+        """
+        return import_results(self.port.add_products_bulk(products=request))
+
     def get_product_id_map(self) -> dict[UUID, str]:
         """
         Returns a dictionary mapping product IDs to their respective names.
@@ -58,6 +96,38 @@ class ProductService:
         """
         return self.port.fetch_id_map()
 
+    def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        """
+        Searches products by name, description and variant kind, matching
+        words by prefix and tolerating misspellings.
+
+        Args:
+            query (ProductSearchQuery): The query and the page to return.
+
+        Returns:
+            ProductSearchPage: The matching products, best first.
+        """
+        return self.port.search_products(query=query)
+
+    def get_catalog_version(self) -> CatalogVersion:
+        """
+        Returns the validators of the catalog, for conditional requests.
+
+        Returns:
+            CatalogVersion: The ETag and last modification time of the catalog.
+        """
+        return self.port.fetch_catalog_version()
+
+    def get_rendered_catalog(self) -> RenderedCatalog:
+        """
+        Returns every product with its variants, serialized once per change
+        of the catalog rather than on every request.
+
+        Returns:
+            RenderedCatalog: The JSON and gzip encoded catalog, with its validators.
+        """
+        return self.port.fetch_rendered_catalog()
+
     def get_variants_for_product(self, product_id: UUID) -> list[ProductVariantPublic]:
         """
         Retrieves a list of ProductVariantPublic objects for a given product ID.
@@ -79,5 +149,84 @@ class ProductService:
         Args:
             product_id (UUID): The ID of the product to add variants for.
             variants (list[ProductVariantCreate]): A list of ProductVariantCreate objects to add as available variants.
+
+        Raises:
+            EntityNotFoundError: If the product does not exist.
         """
         return list(self.port.add_variants(product_id=product_id, variants=variants))
+
+
+@dataclass
+class AsyncProductService:
+    """
+    asyncio service meant for product-based interactions
+    """
+
+    port: AsyncProductPort
+
+    @classmethod
+    def instance(cls, port: AsyncProductPort) -> "AsyncProductService":
+        return cls(port=port)
+
+    async def get_product(self, product_id: UUID) -> ProductPublic | None:
+        """
+        Retrieves a product by its ID.
+        """
+        return await self.port.fetch_one(product_id=product_id)
+
+    async def register_products(
+        self, request: list[ProductCreate]
+    ) -> list[ProductPublic]:
+        """
+        Registers a list of products with their respective variants.
+        """
+        return await self.port.add_products(products=request)
+
+    async def import_products(
+        self, request: list[ProductCreate]
+    ) -> list[ProductImportResult]:
+        """
+        Registers a batch of products, skipping the ones whose name is
+        already taken.
+        """
+        return import_results(await self.port.add_products_bulk(products=request))
+
+    async def get_product_id_map(self) -> dict[UUID, str]:
+        """
+        Returns a dictionary mapping product IDs to their respective names.
+        """
+        return await self.port.fetch_id_map()
+
+    async def search_products(self, query: ProductSearchQuery) -> ProductSearchPage:
+        """
+        Searches products by name, description and variant kind.
+        """
+        return await self.port.search_products(query=query)
+
+    async def get_catalog_version(self) -> CatalogVersion:
+        """
+        Returns the validators of the catalog, for conditional requests.
+        """
+        return await self.port.fetch_catalog_version()
+
+    async def get_rendered_catalog(self) -> RenderedCatalog:
+        """
+        Returns every product with its variants, serialized.
+        """
+        return await self.port.fetch_rendered_catalog()
+
+    async def get_variants_for_product(
+        self, product_id: UUID
+    ) -> list[ProductVariantPublic]:
+        """
+        Retrieves the variants for a given product ID.
+        """
+        return await self.port.fetch_variants(product_id=product_id)
+
+    async def add_available_variants(
+        self, product_id: UUID, variants: list[ProductVariantCreate]
+    ) -> list[ProductVariantPublic]:
+        """
+        Adds a list of variants as available variants for a given product ID.
+        """
+        return await self.port.add_variants(product_id=product_id, variants=variants)
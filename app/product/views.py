@@ -1,30 +1,122 @@
-from typing import Iterator
+from typing import Annotated, AsyncIterator, Iterator, cast
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Response, status
 from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.product.adapters import ProductSqlAdapter
+from app.config import config
+from app.core.encoding import accepts_encoding
+from app.core.etags import is_not_modified, validator_headers
+from app.core.exceptions import ConflictError, EntityNotFoundError
+from app.core.service import ThreadedService
+from app.db import get_async_db, get_async_read_db, get_db, get_read_db
+from app.product.adapters import (
+    AsyncCachedProductAdapter,
+    CachedProductAdapter,
+    ProductSqlAdapter,
+)
+from app.product.catalog import product_catalog
 from app.product.domain.models import (
     ProductCreate,
+    ProductImportResult,
     ProductPublic,
+    ProductSearchPage,
+    ProductSearchQuery,
     ProductVariantCreate,
     ProductVariantPublic,
 )
-from app.product.service import ProductService
+from app.product.service import AsyncProductService, ProductService
 
 router_v0 = APIRouter(prefix="/v0")
 
 
-def get_product_service(db: Session = Depends(get_db)) -> Iterator[ProductService]:
+def get_sync_product_service(
+    db: Session = Depends(get_db),
+) -> Iterator[AsyncProductService]:
+    """
+    Yields a ProductService bound to a blocking database session, whose
+    methods run in the threadpool.
+    """
+    service = ProductService.instance(
+        port=CachedProductAdapter(ProductSqlAdapter(db), product_catalog)
+    )
+    yield cast(AsyncProductService, ThreadedService(service))
+
+
+def get_sync_product_read_service(
+    db: Session = Depends(get_read_db),
+) -> Iterator[AsyncProductService]:
+    """
+    Yields a ProductService for read-only operations, whose methods run in
+    the threadpool.
+
+    The service reads from the in-memory catalog snapshot, and only uses the
+    session, bound to a read replica when replicas are configured, to load it.
+    """
+    service = ProductService.instance(
+        port=CachedProductAdapter(ProductSqlAdapter(db), product_catalog)
+    )
+    yield cast(AsyncProductService, ThreadedService(service))
+
+
+async def get_async_product_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncIterator[AsyncProductService]:
+    """
+    Yields an instance of AsyncProductService bound to an asyncio database session.
+    """
+    yield AsyncProductService.instance(
+        port=AsyncCachedProductAdapter(db, product_catalog)
+    )
+
+
+async def get_async_product_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncIterator[AsyncProductService]:
+    """
+    Yields an instance of AsyncProductService for read-only operations.
+    """
+    yield AsyncProductService.instance(
+        port=AsyncCachedProductAdapter(db, product_catalog)
+    )
+
+
+# the routes only see the asyncio interface; with DB_ASYNC disabled it is the
+# blocking service run in the threadpool
+if config.DB_ASYNC:
+    get_product_service = get_async_product_service
+    get_product_read_service = get_async_product_read_service
+else:
+    get_product_service = get_sync_product_service
+    get_product_read_service = get_sync_product_read_service
+
+
+# registered before /products/{product_id}, which would match it too
+@router_v0.get(
+    "/products/search",
+    response_model=ProductSearchPage,
+    status_code=status.HTTP_200_OK,
+)
+async def search_products(
+    query: Annotated[ProductSearchQuery, Query()],
+    service: AsyncProductService = Depends(get_product_read_service),
+) -> ProductSearchPage:
     """
-    Returns an instance of ProductService that can be used to interact with the database.
+    Searches products by name, description and variant kind.
+
+    Words match by prefix, or as misspellings when nothing starts with them,
+    and products must match every word. Results are ranked by where the
+    words were found, the name counting most, and paginated with `offset`.
 
-    Yields an instance of ProductService that is bound to the provided database session.
+    Args:
+        query (ProductSearchQuery): The query and the page to return.
+
+    Returns:
+        ProductSearchPage: The matching products, best first, and the offset of the next page.
     """
-    yield ProductService.instance(port=ProductSqlAdapter(db))
+    return await service.search_products(query=query)
 
 
 @router_v0.get(
@@ -37,13 +129,19 @@ def get_product_service(db: Session = Depends(get_db)) -> Iterator[ProductServic
     response_model=ProductPublic,
     status_code=status.HTTP_200_OK,
 )
-def get_product(
+async def get_product(
     product_id: UUID,
-    service: ProductService = Depends(get_product_service),
-) -> ProductPublic:
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+    service: AsyncProductService = Depends(get_product_read_service),
+) -> ProductPublic | Response:
     """
     Retrieves a single Product queried by id
 
+    Returns 304 Not Modified when the client's copy, identified by its ETag
+    or Last-Modified time, is still current.
+
     Args:
         product_id (UUID): The ID of the Product to retrieve
 
@@ -53,7 +151,7 @@ def get_product(
     Raises:
         HttpException with a 404 status if the product cannot be found
     """
-    product = service.get_product(product_id=product_id)
+    product = await service.get_product(product_id=product_id)
 
     if not product:
         raise HTTPException(
@@ -61,17 +159,30 @@ def get_product(
             detail="Product not found",
         )
 
+    headers = validator_headers(product.etag, product.modified)
+    if is_not_modified(
+        product.etag, product.modified, if_none_match, if_modified_since
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+
     return product
 
 
 @router_v0.post(
     "/products",
+    responses={
+        status.HTTP_409_CONFLICT: {
+            "description": "A product name is already taken",
+        },
+    },
     response_model=list[ProductPublic],
     status_code=status.HTTP_201_CREATED,
 )
-def register_products(
+async def register_products(
     request: list[ProductCreate],
-    service: ProductService = Depends(get_product_service),
+    service: AsyncProductService = Depends(get_product_service),
 ) -> list[ProductPublic]:
     """
     Registers a list of products with their respective variants.
@@ -82,7 +193,49 @@ def register_products(
     Returns:
         list[ProductPublic]: A list of newly registered products with their respective variants.
     """
-    return service.register_products(request=request)
+    try:
+        return await service.register_products(request=request)
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+
+
+@router_v0.post(
+    "/products:bulk",
+    responses={
+        status.HTTP_409_CONFLICT: {
+            "description": "Products were registered concurrently with the same names",
+        },
+    },
+    response_model=list[ProductImportResult],
+    status_code=status.HTTP_200_OK,
+)
+async def import_products(
+    request: list[ProductCreate],
+    service: AsyncProductService = Depends(get_product_service),
+) -> list[ProductImportResult]:
+    """
+    Registers a batch of products, e.g. a supplier catalog, in one
+    transaction.
+
+    Products whose name is already taken, or repeated earlier in the batch,
+    are reported as conflicts while the others are registered.
+
+    Args:
+        request (list[ProductCreate]): The products to register.
+
+    Returns:
+        list[ProductImportResult]: The outcome of each product, in request order.
+    """
+    try:
+        return await service.import_products(request=request)
+    except ConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
 
 
 @router_v0.get(
@@ -90,16 +243,77 @@ def register_products(
     response_model=dict[UUID, str],
     status_code=status.HTTP_200_OK,
 )
-def get_product_id_map(
-    service: ProductService = Depends(get_product_service),
-) -> dict[UUID, str]:
+async def get_product_id_map(
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+    service: AsyncProductService = Depends(get_product_read_service),
+) -> dict[UUID, str] | Response:
     """
     Retrieves a dictionary mapping product IDs to their respective names.
 
+    The map is tagged with the version of the whole catalog; 304 Not Modified
+    is returned, without building the map, while the client's copy is current.
+
     Returns:
         dict[UUID, str]: A dictionary mapping product IDs to their names
     """
-    return service.get_product_id_map()
+    version = await service.get_catalog_version()
+
+    headers = validator_headers(version.etag, version.last_modified)
+    if is_not_modified(
+        version.etag, version.last_modified, if_none_match, if_modified_since
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+
+    return await service.get_product_id_map()
+
+
+@router_v0.get(
+    "/catalog",
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {
+            "model": list[ProductPublic],
+            "content": {"application/json": {}},
+        },
+    },
+    status_code=status.HTTP_200_OK,
+)
+async def get_catalog(
+    accept_encoding: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+    service: AsyncProductService = Depends(get_product_read_service),
+) -> Response:
+    """
+    Retrieves every product with its variants.
+
+    The catalog is serialized, and compressed, once per change of the catalog
+    and the bytes are sent as they are; gzip is sent to clients accepting
+    it. Returns 304 Not Modified while the client's copy is current.
+
+    Returns:
+        Response: The JSON list of products, as `list[ProductPublic]`.
+    """
+    rendered = await service.get_rendered_catalog()
+    gzipped = accepts_encoding(accept_encoding, "gzip")
+    etag = rendered.gzip_etag if gzipped else rendered.version.etag
+
+    headers = validator_headers(etag, rendered.version.last_modified)
+    headers["Vary"] = "Accept-Encoding"
+    if is_not_modified(
+        etag, rendered.version.last_modified, if_none_match, if_modified_since
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if not gzipped:
+        return Response(rendered.body, media_type="application/json", headers=headers)
+
+    headers["Content-Encoding"] = "gzip"
+    return Response(rendered.gzip_body, media_type="application/json", headers=headers)
 
 
 @router_v0.get(
@@ -107,31 +321,53 @@ def get_product_id_map(
     response_model=list[ProductVariantPublic],
     status_code=status.HTTP_200_OK,
 )
-def get_variants_for_product(
+async def get_variants_for_product(
     product_id: UUID,
-    service: ProductService = Depends(get_product_service),
-) -> list[ProductVariantPublic]:
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+    service: AsyncProductService = Depends(get_product_read_service),
+) -> list[ProductVariantPublic] | Response:
     """
     Retrieves a list of ProductVariantPublic objects for a given product ID.
 
+    The variants share the validators of their product, whose modification
+    time changes when variants are added.
+
     Args:
         product_id (UUID): The ID of the product to retrieve variants for.
 
     Returns:
         list[ProductVariantPublic]: A list of ProductVariantPublic objects for the given product ID.
     """
-    return service.get_variants_for_product(product_id=product_id)
+    product = await service.get_product(product_id=product_id)
+
+    if product is not None:
+        headers = validator_headers(product.etag, product.modified)
+        if is_not_modified(
+            product.etag, product.modified, if_none_match, if_modified_since
+        ):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return await service.get_variants_for_product(product_id=product_id)
 
 
 @router_v0.post(
     "/products/{product_id}/variants",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Product not found",
+        },
+    },
     response_model=list[ProductVariantPublic],
     status_code=status.HTTP_201_CREATED,
 )
-def add_available_variants(
+async def add_available_variants(
     product_id: UUID,
     variants: list[ProductVariantCreate],
-    service: ProductService = Depends(get_product_service),
+    service: AsyncProductService = Depends(get_product_service),
 ) -> list[ProductVariantPublic]:
     """
     Adds a list of ProductVariantCreate objects as available variants for a given product ID.
@@ -143,4 +379,12 @@ def add_available_variants(
     Returns:
         list[ProductVariantPublic]: A list of ProductVariantPublic objects for the given product ID.
     """
-    return service.add_available_variants(product_id=product_id, variants=variants)
+    try:
+        return await service.add_available_variants(
+            product_id=product_id, variants=variants
+        )
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
@@ -1,5 +1,7 @@
 from app.user.adapters.sql import UserSqlAdapter
+from app.user.adapters.sql_async import UserAsyncSqlAdapter
 
 __all__ = [
     "UserSqlAdapter",
+    "UserAsyncSqlAdapter",
 ]
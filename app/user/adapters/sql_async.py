@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.user.adapters.sql import UserSqlAdapter
+from app.user.domain.models import UserCreate, UserPublic
+from app.user.domain.port import AsyncUserPort
+
+
+@dataclass
+class UserAsyncSqlAdapter(AsyncUserPort):
+    """
+    asyncio adapter for users that runs the UserSqlAdapter logic
+    through `AsyncSession.run_sync`
+    """
+
+    db: AsyncSession
+
+    async def user_with_email_exists(self, email: str) -> bool:
+        return await self.db.run_sync(
+            lambda db: UserSqlAdapter(db).user_with_email_exists(email)
+        )
+
+    async def fetch_all(self) -> list[UserPublic]:
+        def fetch(db: Session) -> list[UserPublic]:
+            return [
+                UserPublic.model_validate(user)
+                for user in UserSqlAdapter(db).fetch_all()
+            ]
+
+        return await self.db.run_sync(fetch)
+
+    async def fetch_one(self, user_id: UUID) -> UserPublic | None:
+        def fetch(db: Session) -> UserPublic | None:
+            user = UserSqlAdapter(db).fetch_one(user_id=user_id)
+            return UserPublic.model_validate(user) if user else None
+
+        return await self.db.run_sync(fetch)
+
+    async def find_by_email(self, email: str) -> UserPublic | None:
+        def fetch(db: Session) -> UserPublic | None:
+            user = UserSqlAdapter(db).find_by_email(email)
+            return UserPublic.model_validate(user) if user else None
+
+        return await self.db.run_sync(fetch)
+
+    async def add_user(self, new_user: UserCreate) -> UserPublic:
+        return await self.db.run_sync(
+            lambda db: UserSqlAdapter(db).add_user(new_user=new_user)
+        )
@@ -43,3 +43,41 @@ class UserPort(Protocol):
 
     # User credentials related methods
     # TODO: Add methods here
+
+
+class AsyncUserPort(Protocol):
+    """
+    asyncio counterpart of the UserPort
+    """
+
+    async def user_with_email_exists(self, email: str) -> bool:
+        """
+        Checks if a user with this email address exists in the system
+        """
+        ...
+
+    async def fetch_all(self) -> list[UserPublic]:
+        """
+        Fetch all the users registered in the system
+        """
+        ...
+
+    async def fetch_one(self, user_id: UUID) -> UserPublic | None:
+        """
+        Fetches a single user with the provided user ID.
+
+        returns None if user does not exist.
+        """
+        ...
+
+    async def find_by_email(self, email: str) -> UserPublic | None:
+        """
+        Finds a user by email address
+        """
+        ...
+
+    async def add_user(self, new_user: UserCreate) -> UserPublic:
+        """
+        Creates a new user entry in the system
+        """
+        ...
@@ -3,7 +3,7 @@ from uuid import UUID
 
 from app.core.exceptions import ConflictError, EntityNotFoundError
 from app.user.domain.models import UserCreate, UserPublic
-from app.user.domain.port import UserPort
+from app.user.domain.port import AsyncUserPort, UserPort
 
 
 @dataclass(frozen=True)
@@ -59,3 +59,56 @@ class UserService:
         created_user = self.port.add_user(new_user=new_user)
 
         return created_user
+
+
+@dataclass(frozen=True)
+class AsyncUserService:
+    """
+    asyncio service layer to interact with user-based operations
+    """
+
+    port: AsyncUserPort
+
+    @classmethod
+    def instance(cls, port: AsyncUserPort) -> "AsyncUserService":
+        """
+        Construct a new instance of the AsyncUserService from
+        an object that satisfies the AsyncUserPort protocol
+        """
+        return cls(port)
+
+    async def get_all_users(self) -> list[UserPublic]:
+        """
+        Gets all the users registered in the system
+        """
+        return await self.port.fetch_all()
+
+    async def get_user(self, user_id: UUID) -> UserPublic:
+        """
+        Get a user using the user_id
+        """
+
+        user = await self.port.fetch_one(user_id=user_id)
+
+        if not user:
+            raise EntityNotFoundError.from_id("User", user_id)
+
+        return user
+
+    async def find_user_by_email(self, email: str) -> UserPublic:
+        user = await self.port.find_by_email(email)
+
+        if not user:
+            raise EntityNotFoundError(f"User with email '{email}' was not found")
+
+        return user
+
+    async def setup_new_user(self, new_user: UserCreate) -> UserPublic:
+        """
+        Sets up a new user in the system
+        """
+
+        if await self.port.user_with_email_exists(new_user.email):
+            raise ConflictError(f"User with email {new_user.email} already exists")
+
+        return await self.port.add_user(new_user=new_user)
@@ -1,39 +1,86 @@
-from typing import Iterator
+from typing import AsyncIterator, Iterator, cast
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, status
 from fastapi.exceptions import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config import config
 from app.core.exceptions import ConflictError, EntityNotFoundError
-from app.db import get_db
-from app.user.adapters import UserSqlAdapter
+from app.core.service import ThreadedService
+from app.db import get_async_db, get_async_read_db, get_db, get_read_db
+from app.user.adapters import UserAsyncSqlAdapter, UserSqlAdapter
 from app.user.domain.models import UserCreate, UserPublic
-from app.user.service import UserService
+from app.user.service import AsyncUserService, UserService
 
 router_v0 = APIRouter(prefix="/v0")
 
 
-def get_user_service(db: Session = Depends(get_db)) -> Iterator[UserService]:
+def get_sync_user_service(
+    db: Session = Depends(get_db),
+) -> Iterator[AsyncUserService]:
     """
-    Gets an instance of the UserService with the Sql-backed user adapter
+    Gets an instance of the UserService with the Sql-backed user adapter,
+    whose methods run in the threadpool
     """
-    yield UserService.instance(UserSqlAdapter(db=db))
+    service = UserService.instance(UserSqlAdapter(db=db))
+    yield cast(AsyncUserService, ThreadedService(service))
+
+
+def get_sync_user_read_service(
+    db: Session = Depends(get_read_db),
+) -> Iterator[AsyncUserService]:
+    """
+    Gets an instance of the UserService for read-only operations, bound to a
+    read replica session when replicas are configured, whose methods run in
+    the threadpool
+    """
+    service = UserService.instance(UserSqlAdapter(db=db))
+    yield cast(AsyncUserService, ThreadedService(service))
+
+
+async def get_async_user_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncIterator[AsyncUserService]:
+    """
+    Gets an instance of the AsyncUserService with the asyncio Sql-backed user adapter
+    """
+    yield AsyncUserService.instance(UserAsyncSqlAdapter(db=db))
+
+
+async def get_async_user_read_service(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncIterator[AsyncUserService]:
+    """
+    Gets an instance of the AsyncUserService for read-only operations
+    """
+    yield AsyncUserService.instance(UserAsyncSqlAdapter(db=db))
+
+
+# the routes only see the asyncio interface; with DB_ASYNC disabled it is the
+# blocking service run in the threadpool
+if config.DB_ASYNC:
+    get_user_service = get_async_user_service
+    get_user_read_service = get_async_user_read_service
+else:
+    get_user_service = get_sync_user_service
+    get_user_read_service = get_sync_user_read_service
 
 
 @router_v0.get("/users")
-def get_users(
+async def get_users(
     email: str | None = None,
-    service: UserService = Depends(get_user_service),
+    service: AsyncUserService = Depends(get_user_read_service),
 ) -> list[UserPublic]:
     """
     Get all the users registered in the database
     """
     if not email:
-        return service.get_all_users()
+        return await service.get_all_users()
     else:
         try:
-            result = service.find_user_by_email(
+            result = await service.find_user_by_email(
                 email=email,
             )
         except EntityNotFoundError as e:
@@ -45,16 +92,16 @@ def get_users(
 
 
 @router_v0.get("/users/{user_id}")
-def get_user_by_id(
+async def get_user_by_id(
     user_id: UUID,
-    service: UserService = Depends(get_user_service),
+    service: AsyncUserService = Depends(get_user_read_service),
 ) -> UserPublic:
     """
     Gets a user from the database if one exists,
     raises a 404 HTTPException otherwise.
     """
     try:
-        result = service.get_user(
+        result = await service.get_user(
             user_id=user_id,
         )
     except EntityNotFoundError as e:
@@ -70,15 +117,15 @@ def get_user_by_id(
     "/users",
     status_code=status.HTTP_201_CREATED,
 )
-def create_new_user(
+async def create_new_user(
     request: UserCreate,
-    service: UserService = Depends(get_user_service),
+    service: AsyncUserService = Depends(get_user_service),
 ) -> UserPublic:
     """
     Creates a set of new users in the database
     """
     try:
-        result = service.setup_new_user(
+        result = await service.setup_new_user(
             new_user=request,
         )
     except ConflictError as e:
@@ -2,11 +2,12 @@ from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine
+from sqlalchemy import StaticPool, create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.db import Base, get_db
+from app.db import Base, get_db, get_read_db
 from app.main import app
+from app.product.catalog import product_catalog
 
 # Use a completely isolated in-memory database
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -17,6 +18,19 @@ test_engine = create_engine(
     poolclass=StaticPool,
 )
 
+
+# let SQLAlchemy emit BEGIN itself, so pysqlite does not break the savepoints
+# that isolate each test's commits and rollbacks
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine, "begin")
+def _begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
 TestingSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -32,6 +46,14 @@ def setup_test_database():
     Base.metadata.drop_all(bind=test_engine)
 
 
+# every test starts from an empty database, so none may see a cached catalog
+@pytest.fixture(autouse=True)
+def reset_product_catalog():
+    product_catalog.invalidate()
+    yield
+    product_catalog.invalidate()
+
+
 @pytest.fixture()
 def db_session() -> Generator[Session]:
     """
@@ -40,7 +62,10 @@ def db_session() -> Generator[Session]:
     """
     connection = test_engine.connect()
     transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    # commits and rollbacks inside the test only release or roll back savepoints
+    session = TestingSessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
 
     try:
         yield session
@@ -58,7 +83,11 @@ def test_app(db_session: Session) -> TestClient:
         try:
             yield db_session
         finally:
-            pass
+            # end the transaction a read left open, as closing the session of
+            # a request would; the outer test transaction is still rolled back
+            if db_session.in_transaction():
+                db_session.commit()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     return TestClient(app)
@@ -0,0 +1,145 @@
+from datetime import date, datetime, timedelta, timezone
+from json import dumps, loads
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.analytics.adapters.sql import (
+    DailyCustomerSales,
+    DailyVariantSales,
+    rebuild_sales_rollups,
+)
+
+from .utils import create_order, create_user, create_variants
+
+
+def _rollups(db_session: Session) -> tuple[list, list]:
+    """
+    Reads the rollup rows, leaving out rows whose counters went back to zero
+    """
+    variants = db_session.execute(
+        select(
+            DailyVariantSales.product_variant_id,
+            DailyVariantSales.day,
+            DailyVariantSales.order_count,
+            DailyVariantSales.units,
+        )
+        .where(DailyVariantSales.order_count != 0)
+        .order_by(DailyVariantSales.product_variant_id, DailyVariantSales.day)
+    ).all()
+    customers = db_session.execute(
+        select(
+            DailyCustomerSales.user_id,
+            DailyCustomerSales.day,
+            DailyCustomerSales.order_count,
+            DailyCustomerSales.units,
+            DailyCustomerSales.billed_amount,
+            DailyCustomerSales.paid_amount,
+        ).order_by(DailyCustomerSales.user_id, DailyCustomerSales.day)
+    ).all()
+    db_session.commit()
+    return variants, customers
+
+
+def test_sales_rollups_follow_order_writes(test_app: TestClient, db_session: Session):
+    """
+    Order, bill and payment writes keep the daily rollups current, and the
+    sales report compares the period with the one before it
+    """
+    user_id = create_user(test_app, "max.v@redbull.com", "Max Verstappen")
+    small, large = create_variants(test_app)
+
+    today = datetime.now(timezone.utc)
+    yesterday = today - timedelta(days=1)
+
+    earlier = create_order(test_app, user_id, {small: 1}, created=yesterday)
+    order = create_order(test_app, user_id, {small: 2, large: 1}, created=today)
+
+    # large is dropped, small goes from 2 to 4
+    response = test_app.put(
+        f"/v0/orders/{order['id']}/items",
+        content=dumps(
+            {"id": order["id"], "items": [{"product_variant_id": small, "quantity": 4}]}
+        ),
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # amounts in other currencies than SALES_CURRENCY are left out
+    response = test_app.post(
+        "/v0/bills/",
+        content=dumps({"amount": 5.0, "currency": "USD", "order_id": earlier["id"]}),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = test_app.post(
+        "/v0/payments",
+        content=dumps(
+            {"amount": 5.0, "bill_id": loads(response.content)["id"], "method": "upi"}
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = test_app.post(
+        "/v0/bills/", content=dumps({"amount": 40.0, "order_id": order["id"]})
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = test_app.post(
+        "/v0/payments",
+        content=dumps(
+            {"amount": 25.0, "bill_id": loads(response.content)["id"], "method": "upi"}
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    # the report counts placed orders, so cancelling one leaves it in
+    response = test_app.post(
+        f"/v0/orders/{order['id']}/status", content=dumps({"status": "cancelled"})
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = test_app.get(
+        "/v0/analytics/sales",
+        params={
+            "start": today.date().isoformat(),
+            "end": today.date().isoformat(),
+            "window": 2,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    report = loads(response.content)
+    assert report["totals"] == {
+        "order_count": 1,
+        "units": 4,
+        "billed_amount": 40.0,
+        "paid_amount": 25.0,
+    }
+    assert report["previous_totals"]["units"] == 1
+    assert report["change"]["units"] == 3.0
+    assert report["change"]["billed_amount"] is None
+    assert report["days"][0]["units_moving_average"] == 2.5
+
+    response = test_app.get(
+        "/v0/analytics/sales",
+        params={
+            "start": (today.date() - timedelta(days=1)).isoformat(),
+            "end": today.date().isoformat(),
+            "product_variant_id": large,
+        },
+    )
+    report = loads(response.content)
+    assert [day["units"] for day in report["days"]] == [0, 0]
+    assert report["totals"]["billed_amount"] is None
+
+    # rebuilding from the raw tables gives the same rollups
+    maintained = _rollups(db_session)
+    rebuild_sales_rollups(db_session)
+    assert _rollups(db_session) == maintained
+
+
+def test_sales_query_rejects_reversed_periods(test_app: TestClient):
+    response = test_app.get(
+        "/v0/analytics/sales",
+        params={"start": date(2026, 2, 1).isoformat(), "end": "2026-01-01"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from json import dumps, loads
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.archive import SegmentStore
+from app.main import app
+from app.order import archive as archive_module
+from app.order.adapters import OrderArchiveAdapter, OrderSqlAdapter
+from app.order.archive import archive_old_orders, archive_orders, get_order_archive
+
+from .utils import create_order, create_user, create_variants
+
+
+def test_closed_orders_move_to_the_archive(
+    test_app: TestClient,
+    db_session: Session,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Old closed orders are moved to archive segments with their bills and
+    payments, and are still served by GET /v0/orders/{order_id}
+    """
+    archive = OrderArchiveAdapter(SegmentStore(tmp_path, prefix="orders"))
+    assert archive.store.is_empty()
+    monkeypatch.setitem(app.dependency_overrides, get_order_archive, lambda: archive)
+
+    user_id = create_user(test_app, "carlos.s@williams.com", "Carlos Sainz")
+    (variant,) = create_variants(
+        test_app, variants=[{"size": 1, "unit": "L", "kind": "can"}]
+    )
+
+    old = datetime.now(timezone.utc) - timedelta(days=400)
+    order_ids = [
+        create_order(test_app, user_id, {variant: 2}, created=old)["id"]
+        for _ in range(3)
+    ]
+    fulfilled, cancelled, pending = order_ids
+
+    response = test_app.post(
+        "/v0/bills/", content=dumps({"amount": 50.0, "order_id": fulfilled})
+    )
+    bill_id = loads(response.content)["id"]
+    test_app.post(
+        "/v0/payments",
+        content=dumps({"amount": 50.0, "bill_id": bill_id, "method": "cash"}),
+    )
+    test_app.post(
+        f"/v0/orders/{fulfilled}/status", content=dumps({"status": "fulfilled"})
+    )
+    test_app.post(
+        f"/v0/orders/{cancelled}/status", content=dumps({"status": "cancelled"})
+    )
+
+    before = test_app.get(f"/v0/orders/{fulfilled}")
+
+    archived = archive_orders(
+        db_session,
+        archive.store,
+        created_before=datetime.now(timezone.utc) - timedelta(days=365),
+        batch_size=1,
+    )
+    assert archived == 2
+    assert len(list(tmp_path.glob("orders-*.idx"))) == 2
+    assert not archive.store.is_empty()
+
+    # the orders are gone from the database, and served from the archive
+    assert OrderSqlAdapter(db_session).get_order_by_id(UUID(fulfilled)) is None
+
+    after = test_app.get(f"/v0/orders/{fulfilled}")
+    assert after.status_code == status.HTTP_200_OK
+    assert loads(after.content) == loads(before.content)
+    assert after.headers["ETag"] == before.headers["ETag"]
+
+    assert [
+        payment.amount
+        for payment in archive.get_archived_order(UUID(fulfilled)).payments
+    ] == [50.0]
+    assert archive.get_order_by_id(UUID(pending)) is None
+
+    response = test_app.get(f"/v0/orders/{cancelled}")
+    assert loads(response.content)["status"] == "cancelled"
+
+
+def test_archival_runs_one_at_a_time(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Scheduled runs are skipped while another process archives into the same
+    directory
+    """
+    store = SegmentStore(tmp_path, prefix="orders")
+    monkeypatch.setattr(archive_module, "order_archive", store)
+
+    with SegmentStore(tmp_path, prefix="orders").exclusive() as locked:
+        assert locked
+        with store.exclusive() as other:
+            assert not other
+        assert archive_old_orders() == 0
+
+    with store.exclusive() as locked:
+        assert locked
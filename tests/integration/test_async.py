@@ -0,0 +1,148 @@
+from json import dumps, loads
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.bill import views as bill_views
+from app.db import Base, get_async_db, get_async_read_db
+from app.order import views as order_views
+from app.product import views as product_views
+from app.user import views as user_views
+
+
+@pytest.fixture()
+def async_app(tmp_path: Path) -> Iterator[TestClient]:
+    """
+    Serves the asyncio routers against an aiosqlite database file
+    """
+    database = tmp_path / "orders.db"
+
+    sync_engine = create_engine(f"sqlite:///{database}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+    session_factory = async_sessionmaker(autoflush=False, bind=async_engine)
+
+    async def override_get_async_db() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    for views in (bill_views, order_views, product_views, user_views):
+        app.include_router(views.router_v0)
+    # the services DB_ASYNC would select
+    app.dependency_overrides.update(
+        {
+            bill_views.get_bill_service: bill_views.get_async_bill_service,
+            order_views.get_order_service: order_views.get_async_order_service,
+            order_views.get_order_read_service: order_views.get_async_order_read_service,
+            product_views.get_product_service: product_views.get_async_product_service,
+            product_views.get_product_read_service: product_views.get_async_product_read_service,
+            user_views.get_user_service: user_views.get_async_user_service,
+            user_views.get_user_read_service: user_views.get_async_user_read_service,
+        }
+    )
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+    with TestClient(app) as client:
+        yield client
+        # release the pooled aiosqlite connections on the client's event loop
+        client.portal.call(async_engine.dispose)
+
+
+def test_async_order_flow(async_app: TestClient):
+    """
+    Creates a user, product and order through the asyncio request path
+    """
+    response = async_app.post(
+        "/v0/users",
+        content=dumps(
+            {"name": "Oscar Piastri", "email": "oscar.p@mclaren.com", "kind": "client"}
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    user_id = loads(response.content)["id"]
+
+    response = async_app.post(
+        "/v0/products",
+        content=dumps(
+            [
+                {
+                    "name": "Eucalyptus",
+                    "available_variants": [{"size": 1, "unit": "L", "kind": "can"}],
+                }
+            ]
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    product_id = loads(response.content)[0]["id"]
+
+    response = async_app.get(f"/v0/products/{product_id}/variants")
+    assert response.status_code == status.HTTP_200_OK
+    (variant,) = loads(response.content)
+
+    response = async_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [{"product_variant_id": variant["id"], "quantity": 4}],
+            }
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    order_id = loads(response.content)["id"]
+
+    response = async_app.get(f"/v0/orders/{order_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert loads(response.content)["items"] == [
+        {"product_variant_id": variant["id"], "quantity": 4}
+    ]
+
+    response = async_app.get(f"/v0/orders/user/{user_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert [order["id"] for order in loads(response.content)["items"]] == [order_id]
+
+    response = async_app.get(f"/v0/users/{user_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert loads(response.content)["email"] == "oscar.p@mclaren.com"
+
+    response = async_app.get("/v0/orders:export", params={"format": "ndjson"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (row["order_id"], row["quantity"]) for row in map(loads, response.iter_lines())
+    ] == [(order_id, 4)]
+
+    response = async_app.post(
+        f"/v0/orders/{order_id}/reorder",
+        content=dumps(
+            {"overrides": [{"product_variant_id": variant["id"], "quantity": 2}]}
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert loads(response.content)["items"] == [
+        {"product_variant_id": variant["id"], "quantity": 2}
+    ]
+
+    response = async_app.get(f"/v0/orders/{order_id}")
+    response = async_app.get(
+        f"/v0/orders/{order_id}", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = async_app.get("/v0/productIdMap")
+    response = async_app.get(
+        "/v0/productIdMap", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = async_app.get("/v0/catalog")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert [product["id"] for product in loads(response.content)] == [product_id]
@@ -0,0 +1,304 @@
+from pathlib import Path
+from typing import Iterator
+from uuid import uuid4
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.config import config
+from app.db import Base, pool
+from app.db.instrumentation import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    NPlusOneError,
+    track_queries,
+)
+from app.db.pool import (
+    PoolMetrics,
+    instrument_engine,
+    instrumented_pool_class,
+    pool_status,
+)
+from app.db.routing import (
+    LAST_WRITE_COOKIE,
+    ReadRouter,
+    ReadYourWritesMiddleware,
+    mark_write_session,
+)
+from app.db.schema import ensure_schema, schema_fingerprint, stored_fingerprint
+from app.db.slow_query import SlowQueryLog, explain
+from app.db.sqlite import configure_sqlite_engine, run_sqlite_maintenance
+from app.user.adapters.sql import UserSqlAdapter
+
+
+@pytest.fixture
+def pool_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Keeps the pools instrumented by a test out of the process-wide registry
+    read by /admin/db/pool
+    """
+    monkeypatch.setattr(pool, "POOL_METRICS", {})
+    monkeypatch.setattr(pool, "_instrumented_engines", {})
+
+
+def test_pool_metrics_track_checkouts_and_timeouts(tmp_path: Path, pool_registry):
+    """
+    Pool events and the instrumented pool feed the connection pool telemetry
+    """
+    metrics = PoolMetrics(name="test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_engine(engine, metrics)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert metrics.checked_out == 1
+
+        # the only connection is checked out, so the next checkout times out
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["peak_checked_out"] == 1
+    assert snapshot["connections_opened"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait"]["count"] == 1
+    assert sum(snapshot["wait"]["histogram"].values()) == 1
+    assert snapshot["size"] == 1
+    assert pool_status()["test"] == snapshot
+
+    engine.dispose()
+
+
+def test_read_router_spreads_reads_and_honors_recent_writes(tmp_path: Path):
+    """
+    Reads rotate across sqlite files standing in for replicas, while a client
+    that just committed a write reads from the primary
+    """
+    factories = {}
+    for name in ("primary", "replica-a", "replica-b"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE role (name TEXT)"))
+            connection.execute(text("INSERT INTO role VALUES (:name)"), {"name": name})
+        factories[name] = sessionmaker(bind=engine)
+
+    router = ReadRouter(
+        primary=factories["primary"],
+        replicas=[factories["replica-a"], factories["replica-b"]],
+        window_seconds=30,
+    )
+
+    def get_routed_db(request: Request) -> Iterator[Session]:
+        with router.factory_for(request)() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=30)
+
+    @app.get("/role")
+    def read_role(db: Session = Depends(get_routed_db)) -> str:
+        return db.scalar(text("SELECT name FROM role"))
+
+    @app.post("/write")
+    def write() -> None:
+        with factories["primary"]() as db:
+            mark_write_session(db)
+            db.execute(text("UPDATE role SET name = name"))
+            db.commit()
+
+    @app.post("/bookkeeping")
+    def bookkeeping() -> None:
+        with factories["primary"]() as db:
+            db.execute(text("UPDATE role SET name = name"))
+            db.commit()
+
+    client = TestClient(app)
+    assert [client.get("/role").json() for _ in range(4)] == [
+        "replica-a",
+        "replica-b",
+        "replica-a",
+        "replica-b",
+    ]
+
+    # commits of sessions not flagged as write sessions leave the client alone
+    response = client.post("/bookkeeping")
+    assert LAST_WRITE_COOKIE not in response.cookies
+
+    response = client.post("/write")
+    assert LAST_WRITE_COOKIE in response.cookies
+
+    # the client now carries the last-write cookie and reads its own writes
+    assert client.get("/role").json() == "primary"
+
+    client.cookies.clear()
+    assert client.get("/role").json() == "replica-a"
+
+
+def test_sqlite_profile_applies_pragmas_on_connect(tmp_path: Path):
+    """
+    Every new sqlite connection runs with the tuning profile
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    configure_sqlite_engine(engine)
+
+    with engine.connect() as connection:
+
+        def pragma(name: str):
+            return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+        assert pragma("journal_mode") == config.SQLITE_JOURNAL_MODE.lower()
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("cache_size") == config.SQLITE_CACHE_SIZE
+        assert pragma("busy_timeout") == config.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("foreign_keys") == 1
+
+    run_sqlite_maintenance(engine)
+    engine.dispose()
+
+
+def test_ensure_schema_skips_matching_fingerprint(tmp_path: Path):
+    """
+    The schema is only applied when its fingerprint changes, including
+    indexes and columns added to tables that already exist
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    metadata = MetaData()
+    widgets = Table(
+        "widgets",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String),
+    )
+
+    assert ensure_schema(engine, metadata)
+    assert not ensure_schema(engine, metadata)
+
+    Index("ix_widgets_name", widgets.c.name)
+    assert ensure_schema(engine, metadata)
+    assert not ensure_schema(engine, metadata)
+
+    with engine.begin() as connection:
+        connection.execute(widgets.insert().values(id=1, name="first"))
+
+    widgets.append_column(
+        Column("version", Integer, nullable=False, server_default="1")
+    )
+    assert ensure_schema(engine, metadata)
+
+    with engine.connect() as connection:
+        assert connection.execute(select(widgets.c.version)).scalar_one() == 1
+
+    with engine.connect() as connection:
+        assert stored_fingerprint(connection) == schema_fingerprint(
+            metadata, engine.dialect
+        )
+        assert [
+            index["name"] for index in inspect(connection).get_indexes("widgets")
+        ] == ["ix_widgets_name"]
+
+    engine.dispose()
+
+
+def test_query_tracking_counts_and_detects_repeats():
+    """
+    Statements are counted per tracking scope, and strict mode reports a
+    statement shape that repeats more often than allowed
+    """
+    engine = create_engine("sqlite:///:memory:")
+
+    with engine.connect() as connection:
+        with track_queries() as stats:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT :a IN (1, 2)"), {"a": 1})
+
+        assert stats.count == 2
+        assert stats.total_ms >= 0
+
+        with track_queries(strict_mode="raise", repeat_threshold=3):
+            with pytest.raises(NPlusOneError):
+                for value in range(5):
+                    connection.execute(text("SELECT :value"), {"value": value})
+
+
+def test_query_stats_headers(test_app: TestClient):
+    """
+    Every response reports its statement count in dev
+    """
+    response = test_app.get("/v0/users")
+    assert response.headers[QUERY_COUNT_HEADER] == "1"
+    assert float(response.headers[QUERY_TIME_HEADER]) >= 0
+
+
+def test_slow_query_log_records_caller_and_plan(tmp_path: Path):
+    """
+    Slow statements are recorded with their parameter types, the adapter
+    method that issued them and their query plan
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    log = SlowQueryLog(threshold_ms=0, capacity=2)
+    log.install(engine)
+
+    with Session(engine) as session:
+        adapter = UserSqlAdapter(session)
+        assert adapter.find_by_email("someone@example.com") is None
+        assert adapter.fetch_one(uuid4()) is None
+
+    entries = log.recent()
+    assert len(entries) == 2
+
+    newest = entries[0]
+    assert newest.caller == "UserSqlAdapter.fetch_one"
+    assert "FROM users" in newest.statement
+    assert "someone@example.com" not in str(newest.to_dict())
+    assert newest.plan and any("users" in line for line in newest.plan)
+
+    assert log.recent(limit=1) == [newest]
+
+    # the plans are captured in a savepoint of the caller's transaction, and
+    # neither the EXPLAIN nor the savepoint is logged
+    log.clear()
+    with Session(engine) as session, session.begin():
+        adapter = UserSqlAdapter(session)
+        for _ in range(2):
+            assert adapter.fetch_one(uuid4()) is None
+        assert session.in_transaction()
+
+    statements = [entry.statement for entry in log.recent()]
+    assert len(statements) == 2
+    assert not any("EXPLAIN" in s or "SAVEPOINT" in s for s in statements)
+
+    # a failed EXPLAIN leaves the rest of the transaction in place
+    with engine.connect() as connection, connection.begin():
+        connection.execute(text("CREATE TABLE notes (body TEXT)"))
+        connection.execute(text("INSERT INTO notes VALUES ('kept')"))
+        plan = explain(connection, "SELECT * FROM missing", ())
+        assert plan and plan[0].startswith("EXPLAIN failed")
+        assert connection.execute(text("SELECT body FROM notes")).scalar() == "kept"
+
+    engine.dispose()
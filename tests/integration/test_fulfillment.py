@@ -0,0 +1,58 @@
+from json import dumps, loads
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.db.instrumentation import QUERY_COUNT_HEADER
+
+from .utils import create_order, create_user, create_variants
+
+
+def test_picklist_totals_pending_orders(test_app: TestClient):
+    """
+    The pick list totals every variant across pending orders in one query,
+    with volumes converted to milliliters
+    """
+    small, large = create_variants(
+        test_app,
+        variants=[
+            {"size": 250, "unit": "mL", "kind": "bottle"},
+            {"size": 2, "unit": "L", "kind": "can"},
+        ],
+    )
+
+    first = create_user(test_app, "oscar.p@mclaren.com", "Oscar Piastri")
+    second = create_user(test_app, "zak.b@mclaren.com", "Zak Brown")
+
+    create_order(test_app, first, {small: 2, large: 1})
+    create_order(test_app, second, {small: 3})
+    cancelled = create_order(test_app, second, {large: 5})["id"]
+    test_app.post(
+        f"/v0/orders/{cancelled}/status", content=dumps({"status": "cancelled"})
+    )
+
+    response = test_app.get("/v0/fulfillment/picklist")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers[QUERY_COUNT_HEADER] == "1"
+
+    picklist = loads(response.content)
+    assert [
+        (line["product_variant_id"], line["quantity"], line["order_count"])
+        for line in picklist["lines"]
+    ] == [(small, 5, 2), (large, 1, 1)]
+    assert picklist["lines"][0]["volume_ml"] == 1250
+    assert picklist["lines"][1]["volume_ml"] == 2000
+    assert picklist["total_quantity"] == 6
+    assert picklist["total_volume_ml"] == 3250
+
+    response = test_app.get("/v0/fulfillment/picklist", params={"user_id": second})
+    assert [
+        (line["product_variant_id"], line["quantity"])
+        for line in loads(response.content)["lines"]
+    ] == [(small, 3)]
+
+    response = test_app.get(
+        "/v0/fulfillment/picklist",
+        params={"created_after": "2999-01-01T00:00:00Z"},
+    )
+    assert loads(response.content)["lines"] == []
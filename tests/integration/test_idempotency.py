@@ -0,0 +1,145 @@
+from json import dumps, loads
+from pathlib import Path
+
+import anyio
+import pytest
+from anyio import to_thread
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.idempotency import IDEMPOTENCY_KEY_HEADER, IdempotencyRecord, IdempotencyStore
+from app.idempotency.middleware import IDEMPOTENT_REPLAYED_HEADER
+from app.idempotency.store import IdempotencyInFlightError
+from app.main import idempotency_store
+
+
+@pytest.fixture
+def session_factory(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'idempotency.db'}")
+    IdempotencyRecord.__table__.create(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_retried_creation_is_replayed(
+    test_app: TestClient, session_factory, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    A creation retried with the same Idempotency-Key runs once and replays
+    the stored response, while a different body with that key is rejected
+    """
+    monkeypatch.setattr(idempotency_store, "session_factory", session_factory)
+    idempotency_store.clear_cache()
+
+    body = dumps([{"name": "Rosemary", "description": "Oil"}])
+    headers = {IDEMPOTENCY_KEY_HEADER: "retry-1"}
+
+    first = test_app.post("/v0/products", content=body, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED
+    assert IDEMPOTENT_REPLAYED_HEADER not in first.headers
+
+    # replayed from the table once the in-memory cache is gone
+    idempotency_store.clear_cache()
+
+    second = test_app.post("/v0/products", content=body, headers=headers)
+    assert second.status_code == status.HTTP_201_CREATED
+    assert second.headers[IDEMPOTENT_REPLAYED_HEADER] == "true"
+    assert loads(second.content) == loads(first.content)
+
+    response = test_app.post(
+        "/v0/products",
+        content=dumps([{"name": "Thyme", "description": "Oil"}]),
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    # failed requests do not keep their key
+    response = test_app.post(
+        "/v0/payments",
+        content=dumps(
+            {"amount": 10, "bill_id": first.json()[0]["id"], "method": "upi"}
+        ),
+        headers={IDEMPOTENCY_KEY_HEADER: "payment-1"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    with session_factory() as db:
+        assert db.get(IdempotencyRecord, "POST /v0/payments payment-1") is None
+
+
+def test_duplicates_wait_for_the_in_flight_request(session_factory):
+    """
+    A duplicate waits for the in-flight request, within the process and
+    across workers sharing the table, and then gets its response, without
+    holding a worker thread while it waits
+    """
+    store = IdempotencyStore(session_factory, ttl_seconds=60, wait_seconds=5)
+    # another worker: its own cache and in-flight events, the same table
+    other_worker = IdempotencyStore(
+        session_factory, ttl_seconds=60, wait_seconds=5, poll_interval=0.01
+    )
+
+    polls = 0
+    reserve_row = other_worker._reserve_row
+
+    def counting_reserve_row(key: str, request_hash: str):
+        nonlocal polls
+        polls += 1
+        return reserve_row(key, request_hash)
+
+    other_worker._reserve_row = counting_reserve_row
+
+    async def main() -> dict:
+        assert await store.reserve("key", "hash") is None
+
+        replayed = {}
+
+        async def duplicate(name: str, target: IdempotencyStore) -> None:
+            replayed[name] = await target.reserve("key", "hash")
+
+        async with anyio.create_task_group() as waiters:
+            waiters.start_soon(duplicate, "local", store)
+            waiters.start_soon(duplicate, "remote", other_worker)
+
+            await anyio.sleep(0.2)
+            # both are still waiting, the remote one polling the table
+            assert replayed == {}
+            assert polls > 1
+            assert to_thread.current_default_thread_limiter().borrowed_tokens == 0
+
+            replayed["response"] = store.response_for(
+                "hash", 201, "application/json", b"{}"
+            )
+            await store.complete("key", replayed["response"])
+
+        return replayed
+
+    replayed = anyio.run(main)
+    assert replayed["local"] == replayed["response"]
+    assert replayed["remote"].body == b"{}"
+
+    async def impatient() -> None:
+        store = IdempotencyStore(session_factory, ttl_seconds=60, wait_seconds=0.05)
+        assert await store.reserve("slow", "hash") is None
+        with pytest.raises(IdempotencyInFlightError):
+            await store.reserve("slow", "hash")
+        with pytest.raises(IdempotencyInFlightError):
+            other_worker.wait_seconds = 0.05
+            await other_worker.reserve("slow", "hash")
+
+    anyio.run(impatient)
+
+
+def test_expired_keys_are_swept(session_factory):
+    """
+    Keys are deleted once their response expired
+    """
+    store = IdempotencyStore(session_factory, ttl_seconds=-1)
+
+    assert anyio.run(store.reserve, "key", "hash") is None
+    anyio.run(store.complete, "key", store.response_for("hash", 201, None, b""))
+
+    assert store.sweep() == 1
+    # the key can be used again
+    assert anyio.run(store.reserve, "key", "other hash") is None
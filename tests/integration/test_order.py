@@ -0,0 +1,615 @@
+import csv
+from datetime import datetime
+from json import dumps, loads
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.bill.adapters.sql import Bill
+from app.bill.domain.models import BillPublic
+from app.config import config
+from app.db.instrumentation import QUERY_COUNT_HEADER, track_queries
+from app.order.adapters import OrderSqlAdapter
+from app.order.domain.models import OrderUpdateItems
+
+from .utils import create_user, create_variants, is_valid_uuid
+
+
+def test_create_order_merges_duplicate_variants(test_app: TestClient):
+    """
+    Duplicate variants in a single order are merged into one line item
+    """
+    user_id = create_user(test_app)
+    first, second = create_variants(test_app)
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [
+                    {"product_variant_id": first, "quantity": 2},
+                    {"product_variant_id": second, "quantity": 1},
+                    {"product_variant_id": first, "quantity": 3},
+                ],
+            }
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    created = loads(response.content)
+    assert is_valid_uuid(created["id"])
+    assert sorted(
+        (item["product_variant_id"], item["quantity"]) for item in created["items"]
+    ) == sorted([(first, 5), (second, 1)])
+
+    response = test_app.get(f"/v0/orders/{created['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(
+        (item["product_variant_id"], item["quantity"])
+        for item in loads(response.content)["items"]
+    ) == sorted([(first, 5), (second, 1)])
+
+
+def test_create_order_reports_all_missing_variants(test_app: TestClient):
+    """
+    Every missing variant is reported in a single error
+    """
+    user_id = create_user(test_app)
+    (existing,) = create_variants(test_app, count=1)
+    missing = [str(uuid4()), str(uuid4())]
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [
+                    {"product_variant_id": existing, "quantity": 1},
+                    {"product_variant_id": missing[0], "quantity": 1},
+                    {"product_variant_id": missing[1], "quantity": 1},
+                ],
+            }
+        ),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    detail = loads(response.content)["detail"]
+    assert all(variant_id in detail for variant_id in missing)
+    assert existing not in detail
+
+    response = test_app.get(f"/v0/orders/user/{user_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert loads(response.content) == {"items": [], "next_cursor": None}
+
+
+def test_order_reads_use_a_fixed_number_of_queries(
+    test_app: TestClient, db_session: Session
+):
+    """
+    Orders are read with their items and bills in three statements, however
+    many orders the user has
+    """
+    user_id = create_user(test_app)
+    variants = create_variants(test_app, count=3)
+
+    order_ids = []
+    for count in range(1, 4):
+        response = test_app.post(
+            "/v0/orders",
+            content=dumps(
+                {
+                    "user_id": user_id,
+                    "items": [
+                        {"product_variant_id": variant, "quantity": 1}
+                        for variant in variants[:count]
+                    ],
+                }
+            ),
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        order_ids.append(loads(response.content)["id"])
+
+    for order_id in order_ids[:2]:
+        bill = BillPublic(amount=100.0, order_id=UUID(order_id))
+        db_session.add(Bill(**bill.model_dump()))
+    db_session.commit()
+
+    response = test_app.get(f"/v0/orders/user/{user_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers[QUERY_COUNT_HEADER] == "3"
+
+    orders = {order["id"]: order for order in loads(response.content)["items"]}
+    assert [len(orders[id]["items"]) for id in order_ids] == [1, 2, 3]
+    assert [orders[id]["bill"] is not None for id in order_ids] == [True, True, False]
+
+    response = test_app.get(f"/v0/orders/{order_ids[0]}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers[QUERY_COUNT_HEADER] == "3"
+    assert loads(response.content)["bill"]["amount"] == 100.0
+
+
+def test_orders_for_user_are_paginated_newest_first(test_app: TestClient):
+    """
+    A user's orders are listed newest first in pages linked by cursors, and
+    can be filtered by status and creation time
+    """
+    user_id = create_user(test_app)
+    (variant,) = create_variants(test_app, count=1)
+
+    order_ids = []
+    for day in range(1, 6):
+        response = test_app.post(
+            "/v0/orders",
+            content=dumps(
+                {
+                    "user_id": user_id,
+                    "created": f"2025-01-0{day}T12:00:00Z",
+                    "status": "fulfilled" if day % 2 else "pending",
+                    "items": [{"product_variant_id": variant, "quantity": day}],
+                }
+            ),
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        order_ids.append(loads(response.content)["id"])
+
+    newest_first = order_ids[::-1]
+
+    pages, cursor = [], None
+    while True:
+        response = test_app.get(
+            f"/v0/orders/user/{user_id}",
+            params={"limit": 2} | ({"cursor": cursor} if cursor else {}),
+        )
+        assert response.status_code == status.HTTP_200_OK
+        page = loads(response.content)
+        pages.append([order["id"] for order in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == [newest_first[0:2], newest_first[2:4], newest_first[4:]]
+
+    response = test_app.get(
+        f"/v0/orders/user/{user_id}",
+        params={
+            "status": "fulfilled",
+            "created_after": "2025-01-02T00:00:00Z",
+            "created_before": "2025-01-05T00:00:00Z",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [order["id"] for order in loads(response.content)["items"]] == [order_ids[2]]
+
+    response = test_app.get(
+        f"/v0/orders/user/{user_id}", params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_bulk_import_streams_a_result_per_line(
+    test_app: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    NDJSON orders are imported in batches, reporting the outcome of every
+    line without failing the valid ones
+    """
+    monkeypatch.setattr(config, "ORDER_BULK_BATCH_SIZE", 2)
+    user_id = create_user(test_app)
+    first, second = create_variants(test_app)
+    missing = str(uuid4())
+
+    lines = [
+        {"user_id": user_id, "items": [{"product_variant_id": first, "quantity": 1}]},
+        {"user_id": user_id, "items": [{"product_variant_id": missing, "quantity": 1}]},
+        {"user_id": str(uuid4()), "items": []},
+        {"user_id": user_id, "items": [{"product_variant_id": first, "quantity": 0}]},
+        {
+            "user_id": user_id,
+            "items": [
+                {"product_variant_id": first, "quantity": 1},
+                {"product_variant_id": second, "quantity": 2},
+                {"product_variant_id": first, "quantity": 3},
+            ],
+        },
+    ]
+    body = "\n".join(dumps(line) for line in lines[:3]) + "\n\n{not json\n"
+    body += "\n".join(dumps(line) for line in lines[3:]) + "\n"
+
+    response = test_app.post(
+        "/v0/orders:bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    results = [loads(line) for line in response.text.splitlines()]
+    assert [(result["line"], result["status"]) for result in results] == [
+        (1, "created"),
+        (2, "failed"),
+        (3, "failed"),
+        (5, "failed"),
+        (6, "failed"),
+        (7, "created"),
+    ]
+    assert missing in results[1]["error"]
+    assert "User" in results[2]["error"]
+
+    response = test_app.get(f"/v0/orders/user/{user_id}")
+    orders = {order["id"]: order for order in loads(response.content)["items"]}
+    assert set(orders) == {results[0]["id"], results[-1]["id"]}
+    assert sorted(
+        (item["product_variant_id"], item["quantity"])
+        for item in orders[results[-1]["id"]]["items"]
+    ) == sorted([(first, 4), (second, 2)])
+
+
+def test_update_order_items_writes_only_the_difference(
+    test_app: TestClient, db_session: Session
+):
+    """
+    Updating an order's items inserts, updates and deletes only the items
+    that changed, and bumps the order's modified timestamp
+    """
+    user_id = create_user(test_app)
+    kept, changed, dropped, added = create_variants(test_app, count=4)
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [
+                    {"product_variant_id": kept, "quantity": 1},
+                    {"product_variant_id": changed, "quantity": 1},
+                    {"product_variant_id": dropped, "quantity": 1},
+                ],
+            }
+        ),
+    )
+    order = loads(response.content)
+
+    request = OrderUpdateItems(
+        id=order["id"],
+        items=[
+            {"product_variant_id": kept, "quantity": 1},
+            {"product_variant_id": changed, "quantity": 5},
+            {"product_variant_id": added, "quantity": 2},
+        ],
+    )
+
+    with track_queries() as stats:
+        updated = OrderSqlAdapter(db_session).update_order_items(request)
+
+    # one statement per kind of change, touching only the changed rows
+    statements = [
+        shape.split()[0] for shape in stats.shapes.elements() if "order_items" in shape
+    ]
+    assert sorted(statements) == ["DELETE", "INSERT", "SELECT", "SELECT", "UPDATE"]
+
+    assert sorted(
+        (str(item.product_variant_id), item.quantity) for item in updated.items
+    ) == sorted([(kept, 1), (changed, 5), (added, 2)])
+    assert updated.modified > datetime.fromisoformat(order["modified"])
+
+    response = test_app.put(f"/v0/orders/{uuid4()}/items", content=dumps({"items": []}))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # the order in the path is updated, never another one named in the body
+    response = test_app.put(
+        f"/v0/orders/{order['id']}/items",
+        content=OrderUpdateItems(id=uuid4(), items=[]).model_dump_json(),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_order_updates_honor_if_match(test_app: TestClient):
+    """
+    An order's version is exposed as its ETag, and an update based on a
+    stale version is rejected instead of overwriting the newer change
+    """
+    user_id = create_user(test_app)
+    (variant,) = create_variants(test_app, count=1)
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [{"product_variant_id": variant, "quantity": 1}],
+            }
+        ),
+    )
+    order_id = loads(response.content)["id"]
+
+    response = test_app.get(f"/v0/orders/{order_id}")
+    etag = response.headers["ETag"]
+    assert etag == '"1"'
+
+    def update(quantity: int, if_match: str):
+        return test_app.put(
+            f"/v0/orders/{order_id}/items",
+            content=dumps(
+                {
+                    "id": order_id,
+                    "items": [{"product_variant_id": variant, "quantity": quantity}],
+                }
+            ),
+            headers={"If-Match": if_match},
+        )
+
+    response = update(2, etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == '"2"'
+    assert loads(response.content)["version"] == 2
+
+    response = update(3, etag)
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    response = test_app.get(f"/v0/orders/{order_id}")
+    assert response.headers["ETag"] == '"2"'
+    assert loads(response.content)["items"][0]["quantity"] == 2
+
+    assert update(4, "*").status_code == status.HTTP_200_OK
+
+
+def test_order_status_transitions(test_app: TestClient):
+    """
+    Orders move between statuses singly or in bulk, and orders that cannot
+    make the transition are reported as skipped
+    """
+    user_id = create_user(test_app)
+    (variant,) = create_variants(test_app, count=1)
+
+    order_ids = []
+    for _ in range(3):
+        response = test_app.post(
+            "/v0/orders",
+            content=dumps(
+                {
+                    "user_id": user_id,
+                    "items": [{"product_variant_id": variant, "quantity": 1}],
+                }
+            ),
+        )
+        order_ids.append(loads(response.content)["id"])
+
+    response = test_app.post(
+        f"/v0/orders/{order_ids[0]}/status", content=dumps({"status": "cancelled"})
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert loads(response.content)["status"] == "cancelled"
+    assert response.headers["ETag"] == '"2"'
+
+    response = test_app.post(
+        f"/v0/orders/{order_ids[0]}/status", content=dumps({"status": "fulfilled"})
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = test_app.post(
+        f"/v0/orders/{uuid4()}/status", content=dumps({"status": "fulfilled"})
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    missing = str(uuid4())
+    response = test_app.post(
+        "/v0/orders:transition",
+        content=dumps({"status": "fulfilled", "order_ids": order_ids + [missing]}),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = loads(response.content)
+    assert sorted(order["id"] for order in result["transitioned"]) == sorted(
+        order_ids[1:]
+    )
+    assert {order["version"] for order in result["transitioned"]} == {2}
+    assert {
+        (order["id"], order["reason"], order["current_status"])
+        for order in result["skipped"]
+    } == {
+        (order_ids[0], "invalid_transition", "cancelled"),
+        (missing, "not_found", None),
+    }
+
+    response = test_app.post(
+        "/v0/orders:transition",
+        content=dumps({"status": "fulfilled", "order_ids": order_ids[1:2]}),
+    )
+    assert loads(response.content)["skipped"][0]["reason"] == "already_in_status"
+
+    response = test_app.get(f"/v0/orders/{order_ids[1]}")
+    assert loads(response.content)["status"] == "fulfilled"
+
+
+def test_order_reads_support_conditional_requests(test_app: TestClient):
+    """
+    Revalidating an unchanged order returns 304 Not Modified after a single
+    query, and billing or paying the order changes its ETag
+    """
+    user_id = create_user(test_app)
+    (variant,) = create_variants(test_app, count=1)
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [{"product_variant_id": variant, "quantity": 1}],
+            }
+        ),
+    )
+    order_id = loads(response.content)["id"]
+
+    response = test_app.get(f"/v0/orders/{order_id}")
+    assert response.headers["ETag"] == '"1"'
+    last_modified = response.headers["Last-Modified"]
+
+    response = test_app.get(f"/v0/orders/{order_id}", headers={"If-None-Match": '"1"'})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers[QUERY_COUNT_HEADER] == "1"
+
+    response = test_app.get(
+        f"/v0/orders/{order_id}", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = test_app.post(
+        "/v0/bills/", content=dumps({"amount": 10.0, "order_id": order_id})
+    )
+    bill_id = loads(response.content)["id"]
+
+    response = test_app.get(f"/v0/orders/{order_id}", headers={"If-None-Match": '"1"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == '"2"'
+    assert loads(response.content)["bill"]["id"] == bill_id
+
+    test_app.post(
+        "/v0/payments",
+        content=dumps({"amount": 10.0, "bill_id": bill_id, "method": "cash"}),
+    )
+    response = test_app.get(f"/v0/orders/{order_id}", headers={"If-None-Match": '"2"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert loads(response.content)["bill"]["paid"] is True
+
+    response = test_app.get(f"/v0/orders/{uuid4()}", headers={"If-None-Match": "*"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_reorder_copies_items_with_overrides(test_app: TestClient):
+    """
+    Reordering places a new pending order with the previous order's items,
+    applying quantity overrides, in a fixed number of queries
+    """
+    user_id = create_user(test_app)
+    kept, changed, dropped = create_variants(test_app, count=3)
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [
+                    {"product_variant_id": kept, "quantity": 1},
+                    {"product_variant_id": changed, "quantity": 2},
+                    {"product_variant_id": dropped, "quantity": 3},
+                ],
+            }
+        ),
+    )
+    order_id = loads(response.content)["id"]
+    test_app.post(
+        f"/v0/orders/{order_id}/status", content=dumps({"status": "fulfilled"})
+    )
+
+    response = test_app.post(
+        f"/v0/orders/{order_id}/reorder",
+        content=dumps(
+            {
+                "overrides": [
+                    {"product_variant_id": changed, "quantity": 5},
+                    {"product_variant_id": dropped, "quantity": 0},
+                    {"product_variant_id": str(uuid4()), "quantity": 7},
+                ]
+            }
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.headers[QUERY_COUNT_HEADER] == "6"
+    order = loads(response.content)
+    assert order["id"] != order_id
+    assert order["user_id"] == user_id
+    assert order["status"] == "pending"
+    assert sorted(
+        (item["product_variant_id"], item["quantity"]) for item in order["items"]
+    ) == sorted([(kept, 1), (changed, 5)])
+
+    response = test_app.get(f"/v0/orders/{order['id']}")
+    assert loads(response.content)["items"] == order["items"]
+
+    # without overrides the items are copied as they were, and the new order
+    # is timestamped by the server
+    response = test_app.post(
+        f"/v0/orders/{order_id}/reorder",
+        content=dumps({"created": "2001-01-01T00:00:00Z"}),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    copy = loads(response.content)
+    assert len(copy["items"]) == 3
+    assert datetime.fromisoformat(copy["created"]) > datetime.fromisoformat(
+        order["created"]
+    )
+
+    response = test_app.post(f"/v0/orders/{order_id}/reorder")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = test_app.post(
+        f"/v0/orders/{order_id}/reorder",
+        content=dumps(
+            {
+                "overrides": [
+                    {"product_variant_id": variant, "quantity": 0}
+                    for variant in (kept, changed, dropped)
+                ]
+            }
+        ),
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = test_app.post(f"/v0/orders/{uuid4()}/reorder")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_orders_export_streams_line_items(test_app: TestClient, db_session: Session):
+    """
+    The export has one row per line item with the order's bill, in CSV or
+    NDJSON, and filters orders by creation time
+    """
+    user_id = create_user(test_app)
+    first, second = create_variants(test_app)
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps(
+            {
+                "user_id": user_id,
+                "items": [
+                    {"product_variant_id": first, "quantity": 2},
+                    {"product_variant_id": second, "quantity": 1},
+                ],
+            }
+        ),
+    )
+    billed = loads(response.content)["id"]
+    test_app.post("/v0/bills/", content=dumps({"amount": 30.0, "order_id": billed}))
+
+    response = test_app.post(
+        "/v0/orders",
+        content=dumps({"user_id": user_id, "created": "2001-01-01T00:00:00Z"}),
+    )
+    empty = loads(response.content)["id"]
+
+    response = test_app.get("/v0/orders:export")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(response.text.splitlines()))
+    # oldest order first, then the line items of each order
+    assert [(row["order_id"], row["quantity"]) for row in rows[:1]] == [(empty, "")]
+    assert sorted(
+        (
+            row["order_id"],
+            row["product_variant_id"],
+            row["quantity"],
+            row["bill_amount"],
+        )
+        for row in rows[1:]
+    ) == sorted([(billed, first, "2", "30.0"), (billed, second, "1", "30.0")])
+
+    response = test_app.get(
+        "/v0/orders:export",
+        params={"format": "ndjson", "created_after": "2020-01-01T00:00:00Z"},
+    )
+    rows = [loads(line) for line in response.iter_lines()]
+    assert sorted(
+        (row["product_variant_id"], row["quantity"]) for row in rows
+    ) == sorted([(first, 2), (second, 1)])
+    assert {row["bill_paid"] for row in rows} == {False}
@@ -0,0 +1,389 @@
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps, loads
+from time import sleep
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ConflictError
+from app.db.instrumentation import QUERY_COUNT_HEADER
+from app.product.adapters import CachedProductAdapter, ProductSqlAdapter
+from app.product.catalog import CatalogSnapshot, ProductCatalog
+from app.product.domain.models import ProductCreate, ProductPublic
+from app.product.search import ProductSearchIndex
+
+
+def test_catalog_reads_are_served_from_the_snapshot(test_app: TestClient):
+    """
+    Product reads query the database only to load the catalog snapshot, and
+    registering products or variants drops it for the next read to load
+    """
+    response = test_app.post(
+        "/v0/products",
+        content=dumps(
+            [
+                {
+                    "name": "Rosemary",
+                    "description": "Oil",
+                    "available_variants": [{"size": 5, "unit": "mL", "kind": "bottle"}],
+                }
+            ]
+        ),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    product = loads(response.content)[0]
+    # the write leaves the catalog to the next read: products and variants
+    assert test_app.get("/v0/productIdMap").headers[QUERY_COUNT_HEADER] == "2"
+
+    for path in (
+        f"/v0/products/{product['id']}",
+        f"/v0/products/{product['id']}/variants",
+        "/v0/productIdMap",
+    ):
+        response = test_app.get(path)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers[QUERY_COUNT_HEADER] == "0"
+
+    assert loads(test_app.get(f"/v0/products/{product['id']}").content) == product
+    assert loads(test_app.get("/v0/productIdMap").content) == {
+        product["id"]: "Rosemary"
+    }
+
+    response = test_app.post(
+        f"/v0/products/{product['id']}/variants",
+        content=dumps([{"size": 1, "unit": "L", "kind": "can"}]),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    # the product's modification time and one multi-row insert
+    assert response.headers[QUERY_COUNT_HEADER] == "2"
+    (_,) = loads(response.content)
+
+    response = test_app.get(f"/v0/products/{product['id']}/variants")
+    assert response.headers[QUERY_COUNT_HEADER] == "2"
+    assert [v["kind"] for v in loads(response.content)] == ["bottle", "can"]
+    assert (
+        len(
+            loads(test_app.get(f"/v0/products/{product['id']}").content)[
+                "available_variants"
+            ]
+        )
+        == 2
+    )
+
+    assert test_app.get(f"/v0/products/{uuid4()}").status_code == (
+        status.HTTP_404_NOT_FOUND
+    )
+    assert loads(test_app.get(f"/v0/products/{uuid4()}/variants").content) == []
+    response = test_app.post(
+        f"/v0/products/{uuid4()}/variants",
+        content=dumps([{"size": 1, "unit": "L", "kind": "can"}]),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_catalog_snapshot_expires_and_ignores_stale_loads(db_session: Session):
+    """
+    Snapshots expire after the TTL, and a load racing an invalidation is not
+    cached
+    """
+    catalog = ProductCatalog(ttl_seconds=0)
+    adapter = CachedProductAdapter(ProductSqlAdapter(db_session), catalog)
+    assert adapter.fetch_id_map() == {}
+    assert catalog.current() is None
+
+    catalog.ttl_seconds = 60
+    first = adapter.snapshot()
+    assert catalog.current() is first
+
+    def racing_load():
+        catalog.invalidate()
+        return ProductSqlAdapter(db_session).fetch_catalog()
+
+    stale = catalog.refresh(racing_load)
+    assert stale.version == first.version
+    assert catalog.current() is None
+    assert adapter.snapshot().version == first.version + 1
+
+
+def test_cached_bulk_registration_forwards_partial(db_session: Session):
+    """
+    The cached adapter registers nothing of a conflicting batch when asked
+    to, as the SQL adapter it wraps does
+    """
+    adapter = CachedProductAdapter(ProductSqlAdapter(db_session), ProductCatalog(60))
+    adapter.add_products([ProductCreate(name="Vetiver")])
+
+    results = adapter.add_products_bulk(
+        [ProductCreate(name="Patchouli"), ProductCreate(name="Vetiver")],
+        partial=False,
+    )
+    assert [type(result) for result in results] == [ProductPublic, ConflictError]
+    assert sorted(adapter.fetch_id_map().values()) == ["Vetiver"]
+
+
+def test_catalog_snapshots_are_cached_indexed(
+    db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Refreshed snapshots come with their search index, and a snapshot indexed
+    by concurrent first uses is indexed once
+    """
+    catalog = ProductCatalog(ttl_seconds=60)
+    snapshot = catalog.refresh(ProductSqlAdapter(db_session).fetch_catalog)
+    assert snapshot.has_search_index()
+
+    bare = CatalogSnapshot.build(snapshot.version, [], [])
+    builds = 0
+    build = ProductSearchIndex.build
+
+    def slow_build(documents):
+        nonlocal builds
+        builds += 1
+        sleep(0.05)
+        return build(documents)
+
+    monkeypatch.setattr(ProductSearchIndex, "build", slow_build)
+    with ThreadPoolExecutor(4) as pool:
+        indexes = set(pool.map(lambda _: id(bare.search_index), range(4)))
+
+    assert builds == 1
+    assert len(indexes) == 1
+
+
+def test_catalog_reads_support_conditional_requests(test_app: TestClient):
+    """
+    Product and productIdMap reads carry ETag and Last-Modified validators,
+    and revalidations of an unchanged resource get 304 Not Modified
+    """
+    response = test_app.post(
+        "/v0/products", content=dumps([{"name": "Thyme", "description": "Oil"}])
+    )
+    product_id = loads(response.content)[0]["id"]
+
+    for path in (
+        "/v0/productIdMap",
+        f"/v0/products/{product_id}",
+        f"/v0/products/{product_id}/variants",
+    ):
+        response = test_app.get(path)
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = test_app.get(path, headers={"If-None-Match": f'W/{etag}, "x"'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        response = test_app.get(path, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # If-None-Match takes precedence over If-Modified-Since
+        response = test_app.get(
+            path, headers={"If-None-Match": '"x"', "If-Modified-Since": last_modified}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    response = test_app.get("/v0/productIdMap")
+    map_etag = response.headers["ETag"]
+    response = test_app.get(f"/v0/products/{product_id}")
+    product_etag = response.headers["ETag"]
+
+    test_app.post(
+        f"/v0/products/{product_id}/variants",
+        content=dumps([{"size": 5, "unit": "mL", "kind": "bottle"}]),
+    )
+
+    for path, etag in (
+        ("/v0/productIdMap", map_etag),
+        (f"/v0/products/{product_id}", product_etag),
+        (f"/v0/products/{product_id}/variants", product_etag),
+    ):
+        response = test_app.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+
+def test_bulk_registration_reports_name_conflicts(test_app: TestClient):
+    """
+    Bulk registration checks the names of the whole batch at once, reports
+    the conflicting products and registers the others with their variants
+    """
+    test_app.post("/v0/products", content=dumps([{"name": "Basil"}]))
+
+    products = [
+        {
+            "name": f"Supplier oil {i}",
+            "available_variants": [
+                {"size": 10, "unit": "mL", "kind": "bottle"},
+                {"size": 1, "unit": "L", "kind": "can"},
+            ],
+        }
+        for i in range(300)
+    ]
+    products[10]["name"] = "Basil"
+    products[20]["name"] = products[0]["name"]
+
+    response = test_app.post("/v0/products:bulk", content=dumps(products))
+    assert response.status_code == status.HTTP_200_OK
+    # one name lookup and one insert per table, the catalog is left to the
+    # next read
+    assert response.headers[QUERY_COUNT_HEADER] == "3"
+
+    results = loads(response.content)
+    assert [result["index"] for result in results] == list(range(300))
+    assert [
+        result["index"] for result in results if result["status"] == "conflict"
+    ] == [10, 20]
+    assert "Basil" in results[10]["error"]
+
+    response = test_app.get(f"/v0/products/{results[0]['id']}/variants")
+    assert [variant["kind"] for variant in loads(response.content)] == [
+        "bottle",
+        "can",
+    ]
+    assert len(loads(test_app.get("/v0/productIdMap").content)) == 299
+
+    response = test_app.post(
+        "/v0/products", content=dumps([{"name": "Sage"}, {"name": "Basil"}])
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert len(loads(test_app.get("/v0/productIdMap").content)) == 299
+
+
+def test_product_search_ranks_prefix_and_fuzzy_matches(test_app: TestClient):
+    """
+    GET /v0/products/search matches words by prefix or as misspellings, ranks
+    name matches first, paginates, and follows registrations
+    """
+    test_app.post(
+        "/v0/products",
+        content=dumps(
+            [
+                {"name": "Lavender", "description": "Calming oil"},
+                {"name": "Lemon", "description": "Lavender scented cleaner"},
+                {"name": "Lemongrass", "description": "Oil"},
+                {"name": "Eucalyptus", "description": "Oil"},
+            ]
+        ),
+    )
+
+    def search(**params) -> dict:
+        response = test_app.get("/v0/products/search", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return loads(response.content)
+
+    page = search(q="lav")
+    assert [hit["product"]["name"] for hit in page["items"]] == ["Lavender", "Lemon"]
+    assert page["items"][0]["score"] > page["items"][1]["score"]
+    assert page["next_offset"] is None
+
+    # every word must match, and misspellings are found through trigrams
+    assert [hit["product"]["name"] for hit in search(q="lemon oil")["items"]] == [
+        "Lemongrass"
+    ]
+    assert [hit["product"]["name"] for hit in search(q="eucalyptos")["items"]] == [
+        "Eucalyptus"
+    ]
+    assert search(q="zzz")["items"] == []
+
+    first = search(q="oil", limit=2)
+    assert len(first["items"]) == 2
+    assert first["next_offset"] == 2
+    rest = search(q="oil", limit=2, offset=first["next_offset"])
+    assert rest["next_offset"] is None
+    assert {hit["product"]["name"] for hit in first["items"] + rest["items"]} == {
+        "Lavender",
+        "Lemongrass",
+        "Eucalyptus",
+    }
+
+    response = test_app.get("/v0/products/search", params={"q": "oil"})
+    assert response.headers[QUERY_COUNT_HEADER] == "0"
+
+    # the index is updated with new products and variant kinds
+    response = test_app.post("/v0/products", content=dumps([{"name": "Peppermint"}]))
+    product_id = loads(response.content)[0]["id"]
+    assert [hit["product"]["id"] for hit in search(q="pepper")["items"]] == [product_id]
+    assert search(q="roller")["items"] == []
+
+    test_app.post(
+        f"/v0/products/{product_id}/variants",
+        content=dumps([{"size": 10, "unit": "mL", "kind": "roller"}]),
+    )
+    (hit,) = search(q="roller")["items"]
+    assert hit["product"]["available_variants"][0]["kind"] == "roller"
+
+    response = test_app.get("/v0/products/search", params={"q": ""})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_catalog_is_served_pre_serialized(test_app: TestClient, db_session: Session):
+    """
+    GET /v0/catalog sends the catalog serialized once per change, gzip
+    encoded when accepted, with validators of its own per encoding
+    """
+    response = test_app.post(
+        "/v0/products",
+        content=dumps(
+            [
+                {
+                    "name": "Clove",
+                    "available_variants": [{"size": 5, "unit": "mL", "kind": "bottle"}],
+                },
+                {"name": "Cedarwood", "description": "Oil"},
+            ]
+        ),
+    )
+    ids = [product["id"] for product in loads(response.content)]
+
+    plain = test_app.get("/v0/catalog", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == status.HTTP_200_OK
+    # the first read after the write loads the catalog
+    assert plain.headers[QUERY_COUNT_HEADER] == "2"
+    assert plain.headers["Content-Type"] == "application/json"
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+    # the same JSON as the product reads serialized through the response model
+    assert plain.content == b"[%s]" % b",".join(
+        test_app.get(f"/v0/products/{id}").content for id in ids
+    )
+
+    compressed = test_app.get("/v0/catalog", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.content == plain.content
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    for response in (plain, compressed):
+        revalidated = test_app.get(
+            "/v0/catalog",
+            headers={
+                "Accept-Encoding": response.headers.get("Content-Encoding", "identity"),
+                "If-None-Match": response.headers["ETag"],
+            },
+        )
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+    test_app.post(
+        f"/v0/products/{ids[1]}/variants",
+        content=dumps([{"size": 1, "unit": "L", "kind": "can"}]),
+    )
+    response = test_app.get(
+        "/v0/catalog", headers={"If-None-Match": compressed.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        len(product["available_variants"]) for product in loads(response.content)
+    ] == [1, 1]
+
+    # a snapshot of the unchanged catalog, e.g. after expiring, reuses the bytes
+    catalog = ProductCatalog(ttl_seconds=60)
+    adapter = CachedProductAdapter(ProductSqlAdapter(db_session), catalog)
+    rendered = adapter.fetch_rendered_catalog()
+    assert gzip.decompress(rendered.gzip_body) == rendered.body
+
+    catalog.invalidate()
+    assert adapter.fetch_rendered_catalog() is rendered
@@ -1,5 +1,9 @@
 from datetime import datetime
-from uuid import UUID
+from json import dumps, loads
+from uuid import UUID, uuid4
+
+from fastapi import status
+from fastapi.testclient import TestClient
 
 
 def is_valid_uuid(subject: str) -> bool:
@@ -25,3 +29,70 @@ def is_valid_time_string(date_string):
         return False
 
     return True
+
+
+def create_user(
+    test_app: TestClient,
+    email: str = "lando.n@mclaren.com",
+    name: str = "Lando Norris",
+) -> str:
+    """
+    Registers a client and returns its id
+    """
+    response = test_app.post(
+        "/v0/users",
+        content=dumps({"name": name, "email": email, "kind": "client"}),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return loads(response.content)["id"]
+
+
+def create_variants(
+    test_app: TestClient, count: int = 2, variants: list[dict] | None = None
+) -> list[str]:
+    """
+    Registers a product with `variants`, or with `count` bottles of 10 mL,
+    20 mL and so on, and returns the variant ids
+    """
+    response = test_app.post(
+        "/v0/products",
+        content=dumps([{"name": f"Lavender {uuid4()}", "description": "Oil"}]),
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    product_id = loads(response.content)[0]["id"]
+
+    if variants is None:
+        variants = [
+            {"size": 10 * (i + 1), "unit": "mL", "kind": "bottle"} for i in range(count)
+        ]
+
+    response = test_app.post(
+        f"/v0/products/{product_id}/variants", content=dumps(variants)
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return [variant["id"] for variant in loads(response.content)]
+
+
+def create_order(
+    test_app: TestClient,
+    user_id: str,
+    items: dict[str, int],
+    created: datetime | None = None,
+) -> dict:
+    """
+    Places an order for quantities of variants, optionally backdated, and
+    returns it
+    """
+    order: dict = {
+        "user_id": user_id,
+        "items": [
+            {"product_variant_id": variant, "quantity": quantity}
+            for variant, quantity in items.items()
+        ],
+    }
+    if created is not None:
+        order["created"] = order["modified"] = created.isoformat()
+
+    response = test_app.post("/v0/orders", content=dumps(order))
+    assert response.status_code == status.HTTP_201_CREATED
+    return loads(response.content)